@@ -0,0 +1,81 @@
+"""add_news_search_vector
+
+Revision ID: 3f1c9a7e2b41
+Revises: dca34ce141fc
+Create Date: 2026-10-17 09:12:33.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import jieba
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7e2b41'
+down_revision: Union[str, None] = 'dca34ce141fc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows segmented and written per round trip during backfill
+BACKFILL_BATCH_SIZE = 500
+
+# Frozen copies of app.core.search as of this revision, so the backfill
+# does not change when the application's segmentation does
+MAX_CONTENT_CHARS = 20000
+
+
+def segment(text):
+    """Space-separated, lowercased jieba search-mode tokens"""
+    if not text:
+        return ''
+    jieba.setLogLevel(60)
+    tokens = (token.strip().lower() for token in jieba.cut_for_search(text))
+    return ' '.join(token for token in tokens if token)
+
+
+def upgrade() -> None:
+    op.add_column('news', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    # Backfill existing rows in batches (segmentation happens in Python)
+    conn = op.get_bind()
+    update_stmt = sa.text(
+        "UPDATE news SET search_vector = "
+        "setweight(to_tsvector('simple', :title), 'A') || "
+        "setweight(to_tsvector('simple', :summary), 'B') || "
+        "setweight(to_tsvector('simple', :content), 'C') "
+        "WHERE id = :id"
+    )
+
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text(
+                "SELECT id, title, summary, content FROM news "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {'last_id': last_id, 'limit': BACKFILL_BATCH_SIZE}
+        ).fetchall()
+
+        if not rows:
+            break
+
+        conn.execute(update_stmt, [
+            {
+                'id': row.id,
+                'title': segment(row.title),
+                'summary': segment(row.summary),
+                'content': segment((row.content or '')[:MAX_CONTENT_CHARS]),
+            }
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+    # Build the GIN index after backfill so it is created in one pass
+    op.create_index('ix_news_search_vector', 'news', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_news_search_vector', table_name='news', postgresql_using='gin')
+    op.drop_column('news', 'search_vector')
@@ -0,0 +1,40 @@
+"""add_news_feed_keyset_indexes
+
+Revision ID: 8b2e4d6f1a93
+Revises: 3f1c9a7e2b41
+Create Date: 2026-10-17 10:41:05.877310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4d6f1a93'
+down_revision: Union[str, None] = '3f1c9a7e2b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, leading filter column) for each keyset pagination index
+FEED_INDEXES = [
+    ('ix_news_feed', None),
+    ('ix_news_category_feed', 'category'),
+    ('ix_news_publisher_feed', 'publisher'),
+    ('ix_news_department_feed', 'department'),
+    ('ix_news_source_name_feed', 'source_name'),
+]
+
+
+def upgrade() -> None:
+    for index_name, filter_column in FEED_INDEXES:
+        columns = [sa.text('is_published'), sa.text('published_at DESC'), sa.text('id DESC')]
+        if filter_column:
+            columns.insert(0, sa.text(filter_column))
+        op.create_index(index_name, 'news', columns, unique=False)
+
+
+def downgrade() -> None:
+    for index_name, _ in reversed(FEED_INDEXES):
+        op.drop_index(index_name, table_name='news')
@@ -0,0 +1,48 @@
+"""add_news_facets
+
+Revision ID: c4a7d2e9f615
+Revises: 8b2e4d6f1a93
+Create Date: 2026-10-17 14:12:37.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7d2e9f615'
+down_revision: Union[str, None] = '8b2e4d6f1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FACETS = ['category', 'publisher', 'department', 'source_name']
+
+
+def upgrade() -> None:
+    op.create_table(
+        'news_facets',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('facet', sa.String(length=50), nullable=False),
+        sa.Column('value', sa.String(length=200), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_seen', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('facet', 'value', name='uq_news_facets_facet_value')
+    )
+    op.create_index(op.f('ix_news_facets_id'), 'news_facets', ['id'], unique=False)
+
+    # Backfill counts from the existing published news
+    for facet in FACETS:
+        op.execute(
+            f"INSERT INTO news_facets (facet, value, count, last_seen) "
+            f"SELECT '{facet}', {facet}, count(*), max(created_at) FROM news "
+            f"WHERE is_published AND {facet} IS NOT NULL AND {facet} <> '' "
+            f"GROUP BY {facet}"
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_news_facets_id'), table_name='news_facets')
+    op.drop_table('news_facets')
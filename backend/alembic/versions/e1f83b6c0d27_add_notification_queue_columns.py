@@ -0,0 +1,30 @@
+"""add_notification_queue_columns
+
+Revision ID: e1f83b6c0d27
+Revises: c4a7d2e9f615
+Create Date: 2026-10-17 16:03:52.118764
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f83b6c0d27'
+down_revision: Union[str, None] = 'c4a7d2e9f615'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('notification_history', sa.Column('attempt_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('notification_history', sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_notification_history_queue', 'notification_history', ['email_status', 'next_attempt_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notification_history_queue', table_name='notification_history')
+    op.drop_column('notification_history', 'next_attempt_at')
+    op.drop_column('notification_history', 'attempt_count')
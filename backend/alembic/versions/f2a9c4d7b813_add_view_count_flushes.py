@@ -0,0 +1,31 @@
+"""add_view_count_flushes
+
+Revision ID: f2a9c4d7b813
+Revises: e1f83b6c0d27
+Create Date: 2026-10-17 18:21:09.530417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a9c4d7b813'
+down_revision: Union[str, None] = 'e1f83b6c0d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'view_count_flushes',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('applied_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('view_count_flushes')
@@ -1,15 +1,121 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, or_
+from sqlalchemy import desc, func
 from typing import Optional
+import json
 from app.core.database import get_db
+from app.core.search import segment_query, build_search_query
+from app.core.pagination import InvalidCursorError, apply_cursor, encode_cursor, feed_ordering
+from app.core.counting import CountMode, count_news
+from app.core.cache import get_or_set, invalidate_tags
+from app.core.view_counter import record_view, pending_views
+from app.core.facets import FACET_COLUMNS, facet_counts, scoped_facet_counts
+from app.core.ingest import bulk_upsert_news
 from app.models.news import News
-from app.schemas.news import NewsResponse, NewsList, NewsCreate, NewsUpdate
+from app.models.facet import NewsFacet
+from app.schemas.news import (
+    NewsResponse, NewsListItem, NewsView, NewsList, NewsFacets, NewsCreate, NewsUpdate,
+    IngestStatus, IngestResult, NewsBulkResponse
+)
 
 router = APIRouter(prefix="/api/news")
 
+# Columns loaded for NewsListItem; article bodies and media JSON are never read
+LIST_COLUMNS = [getattr(News, field) for field in NewsListItem.model_fields]
+
+# Largest batch accepted by POST /bulk
+MAX_BULK_ITEMS = 500
+
+# Cache TTLs (seconds) per route; mutations invalidate entries earlier via tags
+CACHE_TTLS = {
+    "news_list": 600,
+    "news_detail": 1800,
+    "facet_list": 3600,
+}
+
+
+def _build_news_list(
+    db: Session,
+    filters: dict,
+    page: int,
+    page_size: int,
+    cursor: Optional[str],
+    count_mode: CountMode,
+    view: NewsView,
+    include_facets: bool = False
+) -> NewsList:
+    """
+    Run the filtered news list query (uncached)
+    """
+    query = db.query(News).filter(News.is_published == True)
+
+    if filters["category"]:
+        query = query.filter(News.category == filters["category"])
+
+    if filters["publisher"]:
+        query = query.filter(News.publisher == filters["publisher"])
+
+    if filters["department"]:
+        query = query.filter(News.department == filters["department"])
+
+    if filters["source_name"]:
+        query = query.filter(News.source_name == filters["source_name"])
+
+    if filters["featured_only"]:
+        query = query.filter(News.is_featured == True)
+
+    # Full-text search over the GIN-indexed search_vector, ranked by ts_rank
+    search = filters["search"]
+    ts_query = None
+    if search and segment_query(search):
+        ts_query = build_search_query(search)
+        query = query.filter(News.search_vector.op("@@")(ts_query))
+
+    if view == NewsView.LIST:
+        query = query.with_entities(*LIST_COLUMNS)
+
+    total, total_is_estimate = count_news(db, query, filters, count_mode)
+
+    facets = NewsFacets(**scoped_facet_counts(query)) if include_facets else None
+
+    if cursor:
+        try:
+            query = apply_cursor(query, cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        if ts_query is not None:
+            query = query.order_by(desc(func.ts_rank(News.search_vector, ts_query)))
+        query = query.offset((page - 1) * page_size)
+
+    # Fetch one extra row to know whether a following page exists
+    items = query.order_by(*feed_ordering()).limit(page_size + 1).all()
+
+    has_more = len(items) > page_size
+    items = items[:page_size]
+
+    # Rank-ordered search pages have no feed position to continue from
+    next_cursor = None
+    if has_more and (cursor or ts_query is None):
+        next_cursor = encode_cursor(items[-1].published_at, items[-1].id)
+
+    item_schema = NewsListItem if view == NewsView.LIST else NewsResponse
+    items = [item_schema.model_validate(item) for item in items]
+
+    return NewsList(
+        total=total,
+        total_is_estimate=total_is_estimate,
+        items=items,
+        page=page,
+        page_size=page_size,
+        next_cursor=next_cursor,
+        facets=facets
+    )
+
+
 @router.get("/", response_model=NewsList)
-async def get_news_list(
+def get_news_list(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     category: Optional[str] = None,
@@ -18,69 +124,97 @@ async def get_news_list(
     source_name: Optional[str] = None,
     search: Optional[str] = None,
     featured_only: bool = False,
+    cursor: Optional[str] = None,
+    count_mode: CountMode = CountMode.EXACT,
+    view: NewsView = NewsView.LIST,
+    include_facets: bool = False,
     db: Session = Depends(get_db)
 ):
     """
     Get paginated list of news items
-    """
-    query = db.query(News).filter(News.is_published == True)
-
-    if category:
-        query = query.filter(News.category == category)
 
-    if publisher:
-        query = query.filter(News.publisher == publisher)
+    Supports two pagination modes:
+    - page mode (default): ?page=N, used by the numbered frontend pagination
+    - cursor mode: ?cursor=<next_cursor>, constant cost however deep the page.
+      Cursor pages always follow the (published_at, id) feed order, so search
+      results are not rank-ordered in this mode.
 
-    if department:
-        query = query.filter(News.department == department)
+    count_mode controls how `total` is computed: exact (cached), estimated
+    (planner statistics) or none (total is null, e.g. for infinite scroll).
 
-    if source_name:
-        query = query.filter(News.source_name == source_name)
+    view=list (default) returns slim NewsListItem cards selected column by
+    column; view=full returns complete articles including content.
 
-    if featured_only:
-        query = query.filter(News.is_featured == True)
-
-    if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            or_(
-                News.title.ilike(search_filter),
-                News.content.ilike(search_filter),
-                News.summary.ilike(search_filter)
-            )
-        )
-
-    total = query.count()
+    include_facets=true adds per-facet value counts scoped to the filters.
+    """
+    filters = {
+        "category": category,
+        "publisher": publisher,
+        "department": department,
+        "source_name": source_name,
+        "search": search,
+        "featured_only": featured_only,
+    }
+    params = dict(filters, page=page, page_size=page_size, cursor=cursor,
+                  count_mode=count_mode.value, view=view.value, include_facets=include_facets)
+
+    body = get_or_set(
+        "news_list", params, ["news"], CACHE_TTLS["news_list"],
+        lambda: _build_news_list(
+            db, filters, page, page_size, cursor, count_mode, view, include_facets
+        ).model_dump_json()
+    )
+    return Response(content=body, media_type="application/json")
 
-    items = query.order_by(desc(News.published_at)).offset(
-        (page - 1) * page_size
-    ).limit(page_size).all()
 
-    return NewsList(
-        total=total,
-        items=items,
-        page=page,
-        page_size=page_size
+@router.get("/facets", response_model=NewsFacets)
+def get_facets(db: Session = Depends(get_db)):
+    """
+    Get all filter facets (category, publisher, department, source) with
+    article counts in one round trip, read from the maintained facet index
+    """
+    body = get_or_set(
+        "facets", {}, ["news"], CACHE_TTLS["facet_list"],
+        lambda: NewsFacets(**{facet: facet_counts(db, facet) for facet in FACET_COLUMNS}).model_dump_json()
     )
+    return Response(content=body, media_type="application/json")
+
 
 @router.get("/{news_id}", response_model=NewsResponse)
-async def get_news_by_id(
+def get_news_by_id(
     news_id: int,
     db: Session = Depends(get_db)
 ):
     """
-    Get single news item by ID and increment view count
+    Get single news item by ID and count the view
+
+    Views are buffered in Redis and flushed to the database periodically
+    (see app.core.view_counter); the returned view_count includes them.
     """
-    news = db.query(News).filter(News.id == news_id).first()
+    def build() -> str:
+        news = db.query(News).filter(News.id == news_id).first()
 
-    if not news:
-        raise HTTPException(status_code=404, detail="News not found")
+        if not news:
+            raise HTTPException(status_code=404, detail="News not found")
 
-    # Increment view count
-    news.view_count += 1
-    db.commit()
+        return NewsResponse.model_validate(news).model_dump_json()
 
-    return news
+    body = get_or_set(
+        "news_detail", {"id": news_id}, [f"news:{news_id}"], CACHE_TTLS["news_detail"], build
+    )
+
+    # Buffer the view in Redis; write through only if Redis is unavailable
+    if not record_view(news_id):
+        db.query(News).filter(News.id == news_id).update(
+            {News.view_count: News.view_count + 1}, synchronize_session=False
+        )
+        db.commit()
+
+    # Report persisted + not-yet-flushed views
+    data = json.loads(body)
+    data["view_count"] += pending_views(news_id, db)
+
+    return Response(content=json.dumps(data, ensure_ascii=False), media_type="application/json")
 
 @router.post("/", response_model=NewsResponse, status_code=201)
 async def create_news(
@@ -100,8 +234,65 @@ async def create_news(
     db.commit()
     db.refresh(news)
 
+    invalidate_tags("news")
+
     return news
 
+@router.post("/bulk", response_model=NewsBulkResponse)
+async def create_news_bulk(
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    Create or refresh a batch of news items (called by the spider pipeline)
+
+    The body is either a JSON array of NewsCreate objects or NDJSON
+    (Content-Type: application/x-ndjson, one object per line). Each item
+    gets an outcome: created (with id), duplicate (same content_hash),
+    updated (known source_url with new content) or invalid.
+    """
+    body = await request.body()
+
+    try:
+        if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+            payload = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            payload = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array or NDJSON body")
+
+    if len(payload) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_ITEMS} items per batch")
+
+    items = {}
+    results = []
+    for index, raw in enumerate(payload):
+        try:
+            items[index] = NewsCreate.model_validate(raw)
+        except ValidationError as e:
+            results.append(IngestResult(
+                index=index, status=IngestStatus.INVALID, detail=str(e.errors()[0]["msg"])
+            ))
+
+    results.extend(bulk_upsert_news(db, items))
+    results.sort(key=lambda result: result.index)
+
+    created = [r.id for r in results if r.status == IngestStatus.CREATED]
+    updated = [r.id for r in results if r.status == IngestStatus.UPDATED]
+    if created or updated:
+        invalidate_tags("news", *(f"news:{news_id}" for news_id in updated))
+
+    return NewsBulkResponse(
+        created=len(created),
+        duplicates=sum(1 for r in results if r.status == IngestStatus.DUPLICATE),
+        updated=len(updated),
+        invalid=sum(1 for r in results if r.status == IngestStatus.INVALID),
+        results=results
+    )
+
 @router.patch("/{news_id}", response_model=NewsResponse)
 async def update_news(
     news_id: int,
@@ -122,6 +313,8 @@ async def update_news(
     db.commit()
     db.refresh(news)
 
+    invalidate_tags("news", f"news:{news_id}")
+
     return news
 
 @router.delete("/{news_id}", status_code=204)
@@ -140,53 +333,49 @@ async def delete_news(
     db.delete(news)
     db.commit()
 
+    invalidate_tags("news", f"news:{news_id}")
+
     return None
 
+def _distinct_values_response(db: Session, route: str, facet: str, response_key: str) -> Response:
+    """
+    Cached list of the values of one facet that occur in published news
+    """
+    def build() -> str:
+        values = db.query(NewsFacet.value).filter(
+            NewsFacet.facet == facet,
+            NewsFacet.count > 0
+        ).order_by(NewsFacet.value).all()
+        return json.dumps({response_key: [value[0] for value in values]}, ensure_ascii=False)
+
+    body = get_or_set(route, {}, ["news"], CACHE_TTLS["facet_list"], build)
+    return Response(content=body, media_type="application/json")
+
 @router.get("/categories/list")
-async def get_categories(db: Session = Depends(get_db)):
+def get_categories(db: Session = Depends(get_db)):
     """
     Get list of all unique categories
     """
-    categories = db.query(News.category).distinct().filter(
-        News.category.isnot(None),
-        News.is_published == True
-    ).all()
-
-    return {"categories": [cat[0] for cat in categories]}
+    return _distinct_values_response(db, "categories", "category", "categories")
 
 @router.get("/publishers/list")
-async def get_publishers(db: Session = Depends(get_db)):
+def get_publishers(db: Session = Depends(get_db)):
     """
     Get list of all unique publishers
     """
-    publishers = db.query(News.publisher).distinct().filter(
-        News.publisher.isnot(None),
-        News.is_published == True
-    ).all()
-
-    return {"publishers": [pub[0] for pub in publishers]}
+    return _distinct_values_response(db, "publishers", "publisher", "publishers")
 
 @router.get("/departments/list")
-async def get_departments(db: Session = Depends(get_db)):
+def get_departments(db: Session = Depends(get_db)):
     """
     Get list of all unique departments
     """
-    departments = db.query(News.department).distinct().filter(
-        News.department.isnot(None),
-        News.is_published == True
-    ).all()
-
-    return {"departments": [dept[0] for dept in departments]}
+    return _distinct_values_response(db, "departments", "department", "departments")
 
 
 @router.get("/sources/list")
-async def get_sources(db: Session = Depends(get_db)):
+def get_sources(db: Session = Depends(get_db)):
     """
     Get list of all unique news sources
     """
-    sources = db.query(News.source_name).distinct().filter(
-        News.source_name.isnot(None),
-        News.is_published == True
-    ).all()
-
-    return {"sources": [src[0] for src in sources]}
+    return _distinct_values_response(db, "sources", "source_name", "sources")
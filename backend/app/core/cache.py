@@ -0,0 +1,161 @@
+"""
+Redis-backed response cache for public read endpoints
+
+Cached bodies are stored as serialized JSON under keys derived from the
+route, its normalized parameters and the current version of every tag the
+entry depends on. Invalidating a tag just increments its version, so all
+entries built against the old version stop being addressed and expire on
+their own TTL; no key scanning is needed.
+
+Concurrent misses on the same key are collapsed with a short Redis lock
+(single-flight): one request rebuilds the entry while the others wait
+briefly for it instead of all hitting PostgreSQL at once. A builder that
+raises a 404 is cached too, as a short-lived negative entry, so waiters
+and repeated lookups of a missing id do not rebuild it every time.
+"""
+import hashlib
+import json
+import logging
+import time
+import uuid
+from typing import Callable, Iterable, List
+import redis
+from fastapi import HTTPException
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+TAG_VERSION_PREFIX = "cache:tag:"
+LOCK_TTL = 10           # seconds a rebuild may hold the single-flight lock
+LOCK_WAIT = 2.0         # seconds a waiting request polls before building itself
+LOCK_POLL_INTERVAL = 0.05
+NEGATIVE_TTL = 30       # seconds a 404 from the builder is cached
+
+# Prefix of cached 404s; JSON bodies never start with it
+_NOT_FOUND_MARKER = "!404:"
+
+# Release the lock only if we still own it
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def tag_versions(tags: Iterable[str]) -> List[str]:
+    """
+    Current version of each tag (one round trip)
+    """
+    tags = list(tags)
+    if not tags:
+        return []
+    versions = redis_client.mget([f"{TAG_VERSION_PREFIX}{tag}" for tag in tags])
+    return [version or "0" for version in versions]
+
+
+def make_key(route: str, params: dict, tags: Iterable[str]) -> str:
+    """
+    Cache key for a route call: normalized params plus dependent tag versions
+    """
+    tags = sorted(tags)
+    normalized = {
+        key: value for key, value in params.items()
+        if value not in (None, "", False)
+    }
+    raw = json.dumps(
+        [normalized, dict(zip(tags, tag_versions(tags)))],
+        sort_keys=True, ensure_ascii=False, default=str
+    )
+    return f"cache:{route}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+
+def _cached_body(cached: str) -> str:
+    """Return a cached body, or re-raise a cached 404"""
+    if cached.startswith(_NOT_FOUND_MARKER):
+        raise HTTPException(status_code=404, detail=cached[len(_NOT_FOUND_MARKER):])
+    return cached
+
+
+def get_or_set(route: str, params: dict, tags: Iterable[str], ttl: int, builder: Callable[[], str]) -> str:
+    """
+    Return the cached JSON body for a route call, building it on a miss
+
+    Args:
+        route: Logical route name (part of the key)
+        params: Request parameters the response depends on
+        tags: Invalidation tags the response depends on
+        ttl: Time to live in seconds
+        builder: Callable producing the JSON body on a miss (a 404
+            HTTPException it raises is cached for NEGATIVE_TTL)
+
+    Returns:
+        Serialized JSON body
+    """
+    try:
+        key = make_key(route, params, tags)
+        cached = redis_client.get(key)
+    except redis.RedisError as e:
+        logger.warning(f"Response cache unavailable: {e}")
+        return builder()
+
+    if cached is not None:
+        return _cached_body(cached)
+
+    lock_key = f"{key}:lock"
+    token = uuid.uuid4().hex
+
+    # Take the lock, or wait for its holder's entry; when the holder
+    # finishes without one, the next poll takes the lock and builds
+    deadline = time.monotonic() + LOCK_WAIT
+    while True:
+        try:
+            if redis_client.set(lock_key, token, nx=True, ex=LOCK_TTL):
+                break
+        except redis.RedisError:
+            return builder()
+
+        if time.monotonic() >= deadline:
+            return builder()
+        time.sleep(LOCK_POLL_INTERVAL)
+
+        try:
+            cached = redis_client.get(key)
+        except redis.RedisError:
+            return builder()
+        if cached is not None:
+            return _cached_body(cached)
+
+    try:
+        try:
+            body = builder()
+        except HTTPException as e:
+            if e.status_code == 404:
+                try:
+                    redis_client.set(key, f"{_NOT_FOUND_MARKER}{e.detail}", ex=min(ttl, NEGATIVE_TTL))
+                except redis.RedisError as cache_error:
+                    logger.warning(f"Failed to cache not-found response: {cache_error}")
+            raise
+        try:
+            redis_client.set(key, body, ex=ttl)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to cache response: {e}")
+        return body
+    finally:
+        try:
+            redis_client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        except redis.RedisError:
+            pass
+
+
+def invalidate_tags(*tags: str) -> None:
+    """
+    Invalidate every cached entry depending on any of the given tags
+    """
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(f"{TAG_VERSION_PREFIX}{tag}")
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Failed to invalidate cache tags {tags}: {e}")
@@ -24,6 +24,9 @@ class Settings(BaseSettings):
     MEDIA_DIR: str = "/app/media"
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
 
+    # Email templates
+    TEMPLATES_AUTO_RELOAD: bool = False  # Re-check template files on every render (template development)
+
     class Config:
         env_file = ".env"
         case_sensitive = True
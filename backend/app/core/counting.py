@@ -0,0 +1,107 @@
+"""
+Total-count strategies for filtered news listings
+
+- exact: COUNT(*) cached in Redis per normalized filter set; entries depend
+  on the "news" cache tag, so they are invalidated on ingest
+- estimated: the PostgreSQL planner's row estimate (EXPLAIN) for the actual
+  query, including is_published and every filter, falling back to an exact
+  count when the estimate is small enough to be cheap and inaccurate
+- none: skip counting entirely (infinite scroll)
+"""
+import enum
+import json
+import logging
+from typing import Optional, Tuple
+import redis
+from sqlalchemy.orm import Session, Query
+from app.core.cache import make_key
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+COUNT_CACHE_TTL = 600  # seconds
+
+# Below this many estimated rows an exact count is cheap enough to run
+ESTIMATE_EXACT_THRESHOLD = 1000
+
+
+class CountMode(str, enum.Enum):
+    """How the news list computes its total"""
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
+def exact_count(query: Query, filters: dict) -> int:
+    """
+    COUNT(*) of the filtered query, served from Redis when possible
+    """
+    try:
+        key = make_key("news_count", filters, ["news"])
+        cached = redis_client.get(key)
+        if cached is not None:
+            return int(cached)
+    except redis.RedisError as e:
+        logger.warning(f"Count cache unavailable: {e}")
+        return query.count()
+
+    total = query.count()
+
+    try:
+        redis_client.set(key, total, ex=COUNT_CACHE_TTL)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to cache count: {e}")
+
+    return total
+
+
+def _planner_estimate(db: Session, query: Query) -> Optional[int]:
+    """
+    Planner row estimate of the query, or None if unavailable
+
+    pg_class.reltuples would be cheaper for the unfiltered feed, but it
+    counts unpublished rows too; EXPLAIN estimates the query as it runs.
+    """
+    compiled = query.statement.compile(dialect=db.get_bind().dialect)
+    plan = db.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+
+
+def estimated_count(db: Session, query: Query, filters: dict) -> Tuple[int, bool]:
+    """
+    Planner-estimated total for the filtered query
+
+    Returns:
+        Tuple of (total, is_estimate)
+    """
+    estimate = _planner_estimate(db, query)
+
+    if estimate is None or estimate < ESTIMATE_EXACT_THRESHOLD:
+        return exact_count(query, filters), False
+
+    return estimate, True
+
+
+def count_news(db: Session, query: Query, filters: dict, mode: CountMode) -> Tuple[Optional[int], bool]:
+    """
+    Count the filtered news query using the requested strategy
+
+    Returns:
+        Tuple of (total or None, is_estimate)
+    """
+    if mode == CountMode.NONE:
+        return None, False
+
+    if mode == CountMode.ESTIMATED:
+        return estimated_count(db, query, filters)
+
+    return exact_count(query, filters), False
+
@@ -0,0 +1,219 @@
+"""
+Daily and weekly keyword digests
+
+A digest run makes one pass over the articles ingested during the window,
+matching each against every subscription of the digest frequency with the
+shared keyword automaton. The (subscription, article) matches are then
+grouped per user in memory, so the cost is one scan of the window plus a
+handful of IN queries, independent of the number of digest users. Messages
+are rendered from the cached templates and sent in chunks over the pooled
+SMTP transport, taking a token from the notification queue's rate limiter
+per message so digests and instant notifications share one send budget.
+"""
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+import redis
+from sqlalchemy.orm import Session
+from app.core.email import email_service
+from app.core.email_queue import rate_limiter
+from app.core.keyword_matcher import get_matcher
+from app.core.redis import redis_client
+from app.models.news import News
+from app.models.subscription import KeywordSubscription, NotificationFrequency
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+DIGEST_WINDOWS = {
+    NotificationFrequency.DAILY: timedelta(days=1),
+    NotificationFrequency.WEEKLY: timedelta(days=7),
+}
+
+# Articles streamed from the database per round trip
+SCAN_BATCH_SIZE = 500
+
+# Messages rendered and handed to send_many at a time
+SEND_CHUNK_SIZE = 500
+
+# Articles listed per keyword in one digest
+MAX_ARTICLES_PER_KEYWORD = 20
+
+# Upper bound on one run; digests share the EMAIL_RATE_PER_SECOND budget,
+# so a large one can take a while
+DIGEST_LOCK_TTL = 2 * 3600
+
+
+def _article(row) -> dict:
+    return {
+        'id': row.id,
+        'title': row.title,
+        'summary': row.summary or (row.content or '')[:200],
+        'category': row.category,
+        'published_at': row.published_at.strftime('%Y-%m-%d') if row.published_at else '',
+    }
+
+
+def match_window(db: Session, frequency: NotificationFrequency, start: datetime, end: datetime):
+    """
+    Match every article ingested in [start, end) against the frequency's subscriptions
+
+    Returns:
+        Tuple of (subscription id -> matched article ids, article id -> email item)
+    """
+    matcher = get_matcher(db)
+    matches: Dict[int, List[int]] = defaultdict(list)
+    articles: Dict[int, dict] = {}
+
+    rows = db.query(
+        News.id, News.title, News.summary, News.content, News.category, News.published_at
+    ).filter(
+        News.is_published == True,
+        News.created_at >= start,
+        News.created_at < end
+    ).order_by(News.id).yield_per(SCAN_BATCH_SIZE)
+
+    for row in rows:
+        keyword_matches = matcher.match(row.title, row.summary, row.content, frequency=frequency)
+        if not keyword_matches:
+            continue
+        articles[row.id] = _article(row)
+        for ids in keyword_matches.values():
+            for sub_id in ids:
+                matches[sub_id].append(row.id)
+
+    return matches, articles
+
+
+def build_digests(db: Session, frequency: NotificationFrequency, end: Optional[datetime] = None) -> Dict[int, dict]:
+    """
+    Compute every user's digest for the window ending at `end`
+
+    Returns:
+        user id -> {keyword: [email items]}
+    """
+    end = end or datetime.now(timezone.utc)
+    start = end - DIGEST_WINDOWS[frequency]
+
+    matches, articles = match_window(db, frequency, start, end)
+    if not matches:
+        return {}
+
+    subscriptions = db.query(
+        KeywordSubscription.id, KeywordSubscription.user_id, KeywordSubscription.keyword
+    ).filter(KeywordSubscription.id.in_(list(matches))).all()
+
+    digests: Dict[int, dict] = defaultdict(dict)
+    for sub_id, user_id, keyword in subscriptions:
+        article_ids = matches[sub_id][-MAX_ARTICLES_PER_KEYWORD:]
+        digests[user_id][keyword] = [articles[news_id] for news_id in reversed(article_ids)]
+
+    return digests
+
+
+def _digest_keys(frequency: NotificationFrequency, end: datetime) -> Dict[str, str]:
+    run = f"{frequency.value}:{end.date().isoformat()}"
+    return {
+        'done': f"digest:done:{run}",
+        'lock': f"digest:running:{run}",
+        'sent': f"digest:sent:{run}",
+    }
+
+
+def send_digests(db: Session, frequency: NotificationFrequency, end: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Build and send the digests of one frequency
+
+    Progress is recorded per window end date in Redis: the ids of users
+    already mailed, and a done marker once every digest went out. Running
+    again for the same date (a retry, a duplicated beat trigger, or a
+    manual rerun after a failure) only mails the users not reached yet,
+    and concurrent runs are kept out by a lock.
+
+    Returns:
+        Counts of users with a digest, emails sent and failures
+    """
+    end = end or datetime.now(timezone.utc)
+    keys = _digest_keys(frequency, end)
+    ttl = int(DIGEST_WINDOWS[frequency].total_seconds())
+    empty = {'users': 0, 'sent': 0, 'failed': 0}
+
+    tracked = True
+    lock_token = None
+    already_sent = set()
+    try:
+        if redis_client.exists(keys['done']):
+            logger.info(f"{frequency.value} digest for {end.date()} already sent")
+            return empty
+        token = uuid.uuid4().hex
+        if not redis_client.set(keys['lock'], token, nx=True, ex=DIGEST_LOCK_TTL):
+            logger.info(f"{frequency.value} digest for {end.date()} is being sent by another run")
+            return empty
+        lock_token = token
+        already_sent = {int(user_id) for user_id in redis_client.smembers(keys['sent'])}
+    except redis.RedisError as e:
+        logger.warning(f"Digest progress unavailable, sending without it: {e}")
+        tracked = False
+
+    try:
+        digests = build_digests(db, frequency, end)
+        counts = {'users': len(digests), 'sent': 0, 'failed': 0}
+
+        user_ids = [user_id for user_id in digests if user_id not in already_sent]
+        if already_sent:
+            logger.info(f"Resuming {frequency.value} digest: {len(digests) - len(user_ids)} users already mailed")
+
+        for offset in range(0, len(user_ids), SEND_CHUNK_SIZE):
+            chunk = user_ids[offset:offset + SEND_CHUNK_SIZE]
+            users = [
+                user for user in db.query(User.id, User.email, User.username, User.full_name).filter(
+                    User.id.in_(chunk),
+                    User.is_active == True
+                ).all()
+                if user.email
+            ]
+
+            messages = [
+                email_service.render_digest(
+                    to_email=user.email,
+                    user_name=user.full_name or user.username,
+                    keyword_matches=digests[user.id],
+                    frequency=frequency
+                )
+                for user in users
+            ]
+
+            mailed = []
+            for user, (success, message) in zip(users, email_service.send_many(messages, rate_limiter=rate_limiter)):
+                if success:
+                    counts['sent'] += 1
+                    mailed.append(user.id)
+                else:
+                    counts['failed'] += 1
+                    logger.error(f"Failed to send {frequency.value} digest: {message}")
+
+            if tracked and mailed:
+                try:
+                    pipe = redis_client.pipeline()
+                    pipe.sadd(keys['sent'], *mailed)
+                    pipe.expire(keys['sent'], ttl)
+                    pipe.execute()
+                except redis.RedisError as e:
+                    logger.warning(f"Could not record digest progress: {e}")
+
+        if tracked and not counts['failed']:
+            try:
+                redis_client.set(keys['done'], 1, ex=ttl)
+            except redis.RedisError as e:
+                logger.warning(f"Could not mark {frequency.value} digest as sent: {e}")
+
+        return counts
+    finally:
+        if lock_token:
+            try:
+                if redis_client.get(keys['lock']) == lock_token:
+                    redis_client.delete(keys['lock'])
+            except redis.RedisError:
+                pass
@@ -1,11 +1,158 @@
-from typing import List
+from typing import List, Optional
 import smtplib
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.utils import formataddr
 import os
-from pathlib import Path
-from jinja2 import Template
+from app.core.templates import render_email
+
+logger = logging.getLogger(__name__)
+
+# Refusals of a single message; smtplib sends RSET before raising them, so
+# the session can carry on with the next message
+_MESSAGE_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPDataError,
+)
+
+
+class _PooledConnection:
+    """An authenticated SMTP session plus its usage counters"""
+
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """
+    Pool of persistent, authenticated SMTP connections
+
+    A connection is opened (connect, STARTTLS, LOGIN) once and reused for up
+    to max_messages_per_connection messages. Idle connections older than
+    idle_timeout are closed on checkout, since most servers drop them anyway.
+    A send that fails because the server closed the session is retried once
+    on a fresh connection.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str = "",
+        password: str = "",
+        use_tls: bool = True,
+        max_size: int = 4,
+        max_messages_per_connection: int = 100,
+        idle_timeout: float = 60.0,
+        timeout: float = 30.0
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_tls = use_tls
+        self.max_size = max_size
+        self.max_messages_per_connection = max_messages_per_connection
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+
+        self._idle: "queue.LifoQueue[_PooledConnection]" = queue.LifoQueue()
+        # Bounds the number of open connections (idle + checked out)
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    def _connect(self) -> _PooledConnection:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                smtp.starttls()
+            if self.user and self.password:
+                smtp.login(self.user, self.password)
+        except Exception:
+            self._close(smtp)
+            raise
+        return _PooledConnection(smtp)
+
+    @staticmethod
+    def _close(smtp: smtplib.SMTP) -> None:
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
+
+    def _checkout(self) -> _PooledConnection:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - conn.last_used < self.idle_timeout:
+                return conn
+            self._close(conn.smtp)
+
+    def _checkin(self, conn: _PooledConnection) -> None:
+        conn.last_used = time.monotonic()
+        if conn.messages_sent >= self.max_messages_per_connection:
+            self._close(conn.smtp)
+        else:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """
+        Check out a connection
+
+        It is returned to the pool when the block succeeds or raises one of
+        the per-message refusals, and closed on any other error (or a 421,
+        the server closing the session).
+        """
+        self._slots.acquire()
+        try:
+            conn = self._checkout()
+            try:
+                yield conn
+            except _MESSAGE_ERRORS as e:
+                if getattr(e, "smtp_code", None) == 421:
+                    self._close(conn.smtp)
+                else:
+                    self._checkin(conn)
+                raise
+            except Exception:
+                self._close(conn.smtp)
+                raise
+            self._checkin(conn)
+        finally:
+            self._slots.release()
+
+    def send(self, msg) -> None:
+        """Send one message over a pooled connection, reconnecting once if the server hung up"""
+        for attempt in range(2):
+            try:
+                with self.connection() as conn:
+                    conn.smtp.send_message(msg)
+                    conn.messages_sent += 1
+                return
+            except smtplib.SMTPServerDisconnected:
+                if attempt:
+                    raise
+                logger.info("SMTP connection closed by server, reconnecting")
+
+    def close(self) -> None:
+        """Close all idle connections"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(conn.smtp)
 
 
 class EmailService:
@@ -23,6 +170,39 @@ class EmailService:
         # Base URL for links in emails
         self.base_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
 
+        # Persistent SMTP sessions shared by all sends
+        self.pool = SMTPConnectionPool(
+            host=self.smtp_host,
+            port=self.smtp_port,
+            user=self.smtp_user,
+            password=self.smtp_password,
+            use_tls=os.getenv("SMTP_USE_TLS", "true").lower() == "true",
+            max_size=int(os.getenv("SMTP_POOL_SIZE", "4")),
+            max_messages_per_connection=int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+        )
+
+    def _build_message(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None
+    ) -> MIMEMultipart:
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = formataddr((self.from_name, self.from_email))
+        msg['To'] = to_email
+
+        # Add text and HTML parts
+        if text_content:
+            part1 = MIMEText(text_content, 'plain', 'utf-8')
+            msg.attach(part1)
+
+        part2 = MIMEText(html_content, 'html', 'utf-8')
+        msg.attach(part2)
+
+        return msg
+
     def send_email(
         self,
         to_email: str,
@@ -43,26 +223,10 @@ class EmailService:
             Tuple of (success: bool, message: str)
         """
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = formataddr((self.from_name, self.from_email))
-            msg['To'] = to_email
-
-            # Add text and HTML parts
-            if text_content:
-                part1 = MIMEText(text_content, 'plain', 'utf-8')
-                msg.attach(part1)
-
-            part2 = MIMEText(html_content, 'html', 'utf-8')
-            msg.attach(part2)
-
-            # Send email
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                if self.smtp_user and self.smtp_password:
-                    server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
+            msg = self._build_message(to_email, subject, html_content, text_content)
+
+            # Send email over a pooled, already authenticated connection
+            self.pool.send(msg)
 
             return True, "Email sent successfully"
 
@@ -71,6 +235,31 @@ class EmailService:
             print(error_msg)
             return False, error_msg
 
+    def send_many(self, messages: List[dict], rate_limiter=None) -> List[tuple[bool, str]]:
+        """
+        Send many emails concurrently over the pooled connections
+
+        Args:
+            messages: List of dicts with the send_email arguments
+                (to_email, subject, html_content, text_content)
+            rate_limiter: Optional TokenBucket; one token is taken before each message
+
+        Returns:
+            One (success, message) tuple per input message, in order
+        """
+        if not messages:
+            return []
+
+        def send(message: dict) -> tuple[bool, str]:
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            return self.send_email(**message)
+
+        # One worker per pooled connection; each reuses its session for many messages
+        workers = min(self.pool.max_size, len(messages))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(send, messages))
+
     def send_keyword_match_notification(
         self,
         to_email: str,
@@ -92,20 +281,8 @@ class EmailService:
         Returns:
             Tuple of (success: bool, message: str)
         """
-        # Load HTML template
-        template_path = Path(__file__).parent.parent / "templates" / "keyword_notification.html"
-
-        if template_path.exists():
-            with open(template_path, 'r', encoding='utf-8') as f:
-                template_str = f.read()
-        else:
-            # Fallback inline template
-            template_str = self._get_default_notification_template()
-
-        template = Template(template_str)
-
-        # Render template
-        html_content = template.render(
+        html_content, text_content = render_email(
+            "keyword_notification",
             user_name=user_name,
             keyword=keyword,
             news_items=news_items,
@@ -114,23 +291,88 @@ class EmailService:
             subscription_id=subscription_id
         )
 
-        # Create plain text version
-        text_content = f"""
-您好 {user_name}，
+        subject = f"[CMS-WHUT] 关键词提醒：{keyword} ({len(news_items)}条新消息)"
+
+        return self.send_email(to_email, subject, html_content, text_content)
+
+    def render_keyword_matches_notification(
+        self,
+        to_email: str,
+        user_name: str,
+        news_items: List[dict]
+    ) -> dict:
+        """
+        Render one notification covering every article that matched any of
+        the user's keywords
 
-您订阅的关键词 "{keyword}" 有 {len(news_items)} 条新闻更新：
+        Args:
+            to_email: User's email address
+            user_name: User's name
+            news_items: List of news items (dict with id, title, summary, category,
+                published_at and the matched keywords)
 
-"""
+        Returns:
+            send_email keyword arguments (usable with send_many)
+        """
+        keywords = []
         for news in news_items:
-            text_content += f"\n【{news['category']}】{news['title']}\n"
-            text_content += f"{news['summary'][:100]}...\n"
-            text_content += f"查看详情: {self.base_url}/news/{news['id']}\n"
+            keywords.extend(k for k in news['keywords'] if k not in keywords)
 
-        text_content += f"\n\n取消订阅: {self.base_url}/subscriptions/{subscription_id}/unsubscribe"
+        html_content, text_content = render_email(
+            "keyword_matches",
+            user_name=user_name,
+            keywords=keywords,
+            news_items=news_items,
+            news_count=len(news_items),
+            base_url=self.base_url
+        )
 
-        subject = f"[CMS-WHUT] 关键词提醒：{keyword} ({len(news_items)}条新消息)"
+        subject = f"[CMS-WHUT] 关键词提醒：{'、'.join(keywords[:3])}{'等' if len(keywords) > 3 else ''} ({len(news_items)}条新消息)"
 
-        return self.send_email(to_email, subject, html_content, text_content)
+        return {
+            'to_email': to_email,
+            'subject': subject,
+            'html_content': html_content,
+            'text_content': text_content,
+        }
+
+    def render_digest(
+        self,
+        to_email: str,
+        user_name: str,
+        keyword_matches: dict,
+        frequency: str = "daily"
+    ) -> dict:
+        """
+        Render a daily or weekly digest of all matched keywords
+
+        Args:
+            to_email: User's email address
+            user_name: User's name
+            keyword_matches: Dict of {keyword: [news_items]}
+            frequency: "daily" or "weekly"
+
+        Returns:
+            send_email keyword arguments (usable with send_many)
+        """
+        total_count = len({news['id'] for items in keyword_matches.values() for news in items})
+        period = "每周" if frequency == "weekly" else "每日"
+
+        html_content, text_content = render_email(
+            "digest",
+            user_name=user_name,
+            period=period,
+            keyword_matches=keyword_matches,
+            news_count=total_count,
+            base_url=self.base_url
+        )
+
+        return {
+            'to_email': to_email,
+            'subject': f"[CMS-WHUT] {period}摘要 ({total_count}条新消息)",
+            'html_content': html_content,
+            'text_content': text_content,
+        }
 
     def send_daily_digest(
         self,
@@ -149,73 +391,10 @@ class EmailService:
         Returns:
             Tuple of (success: bool, message: str)
         """
-        total_count = sum(len(items) for items in keyword_matches.values())
-
-        if total_count == 0:
+        if not any(keyword_matches.values()):
             return True, "No news to send"
 
-        # Similar implementation as keyword notification but with multiple keywords
-        # For brevity, using simplified version
-        subject = f"[CMS-WHUT] 每日摘要 ({total_count}条新消息)"
-
-        html_content = f"<h2>您好 {user_name}，</h2><p>今日共有 {total_count} 条新闻匹配您的订阅。</p>"
-
-        return self.send_email(to_email, subject, html_content)
-
-    def _get_default_notification_template(self) -> str:
-        """Get default HTML email template"""
-        return """
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <style>
-        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; line-height: 1.6; color: #333; }
-        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
-        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; border-radius: 10px 10px 0 0; }
-        .content { background: #f9fafb; padding: 30px; }
-        .news-item { background: white; padding: 20px; margin: 15px 0; border-radius: 8px; border-left: 4px solid #667eea; }
-        .news-title { font-size: 18px; font-weight: bold; color: #1f2937; margin-bottom: 10px; }
-        .news-meta { font-size: 12px; color: #6b7280; margin-bottom: 10px; }
-        .news-summary { color: #4b5563; margin-bottom: 15px; }
-        .btn { display: inline-block; background: #667eea; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; }
-        .footer { background: #f3f4f6; padding: 20px; text-align: center; font-size: 12px; color: #6b7280; border-radius: 0 0 10px 10px; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1 style="margin: 0;">🔔 关键词提醒</h1>
-            <p style="margin: 10px 0 0 0; opacity: 0.9;">您订阅的关键词有新内容更新</p>
-        </div>
-
-        <div class="content">
-            <p>您好 <strong>{{ user_name }}</strong>，</p>
-            <p>您订阅的关键词 <strong>"{{ keyword }}"</strong> 有 <strong>{{ news_count }}</strong> 条新闻更新：</p>
-
-            {% for news in news_items %}
-            <div class="news-item">
-                <div class="news-title">{{ news.title }}</div>
-                <div class="news-meta">
-                    <span>📁 {{ news.category }}</span> |
-                    <span>📅 {{ news.published_at }}</span>
-                </div>
-                <div class="news-summary">{{ news.summary[:150] }}...</div>
-                <a href="{{ base_url }}/news/{{ news.id }}" class="btn">查看详情 →</a>
-            </div>
-            {% endfor %}
-        </div>
-
-        <div class="footer">
-            <p>这是一封自动发送的邮件，请勿回复。</p>
-            <p><a href="{{ base_url }}/subscriptions" style="color: #667eea;">管理订阅</a> | <a href="{{ base_url }}/subscriptions/{{ subscription_id }}/unsubscribe" style="color: #ef4444;">取消此关键词订阅</a></p>
-            <p style="margin-top: 15px;">© 2025 CMS-WHUT | 武汉理工大学新闻管理系统</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+        return self.send_email(**self.render_digest(to_email, user_name, keyword_matches))
 
 
 # Create global email service instance
@@ -0,0 +1,142 @@
+"""
+Notification email queue
+
+Keyword matching only records NotificationHistory rows as PENDING. This
+module drains them: due rows are claimed with FOR UPDATE SKIP LOCKED (so
+several workers can drain concurrently), regrouped into one message per
+user, and sent over the pooled SMTP transport with bounded concurrency and
+a Redis token bucket shared by all workers.
+
+A failed send is retried with exponential backoff via next_attempt_at;
+after EMAIL_MAX_ATTEMPTS the rows are marked FAILED.
+"""
+import logging
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, joinedload
+from app.core.email import email_service
+from app.core.notifications import UserNotification
+from app.core.rate_limit import TokenBucket
+from app.models.subscription import NotificationHistory, EmailStatus
+
+logger = logging.getLogger(__name__)
+
+EMAIL_RATE_PER_SECOND = float(os.getenv("EMAIL_RATE_PER_SECOND", "5"))
+EMAIL_BURST = int(os.getenv("EMAIL_BURST", "10"))
+EMAIL_MAX_CONCURRENCY = int(os.getenv("EMAIL_MAX_CONCURRENCY", "4"))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+EMAIL_RETRY_BASE_SECONDS = int(os.getenv("EMAIL_RETRY_BASE_SECONDS", "60"))
+
+# Rows claimed per drain run
+DISPATCH_BATCH_SIZE = 500
+
+rate_limiter = TokenBucket("email", EMAIL_RATE_PER_SECOND, EMAIL_BURST)
+
+
+def retry_delay(attempt_count: int) -> timedelta:
+    """Backoff before the next attempt: base, 2x base, 4x base, ..."""
+    return timedelta(seconds=EMAIL_RETRY_BASE_SECONDS * 2 ** (attempt_count - 1))
+
+
+def _claim_due_rows(db: Session, limit: int) -> List[NotificationHistory]:
+    now = datetime.now(timezone.utc)
+    return db.query(NotificationHistory).options(
+        joinedload(NotificationHistory.user),
+        joinedload(NotificationHistory.subscription),
+        joinedload(NotificationHistory.news)
+    ).filter(
+        NotificationHistory.email_status == EmailStatus.PENDING,
+        or_(NotificationHistory.next_attempt_at.is_(None), NotificationHistory.next_attempt_at <= now)
+    ).order_by(NotificationHistory.id).limit(limit).with_for_update(
+        skip_locked=True, of=NotificationHistory
+    ).all()
+
+
+def _mark_sent(rows: List[NotificationHistory]) -> None:
+    now = datetime.now(timezone.utc)
+    for row in rows:
+        row.email_status = EmailStatus.SENT
+        row.sent_at = now
+        row.error_message = None
+        row.next_attempt_at = None
+        row.attempt_count += 1
+
+
+def _mark_failed_attempt(rows: List[NotificationHistory], error: str) -> bool:
+    """Schedule a retry, or give up after EMAIL_MAX_ATTEMPTS; returns True if given up"""
+    now = datetime.now(timezone.utc)
+    gave_up = False
+    for row in rows:
+        row.attempt_count += 1
+        row.error_message = error
+        if row.attempt_count >= EMAIL_MAX_ATTEMPTS:
+            row.email_status = EmailStatus.FAILED
+            row.next_attempt_at = None
+            gave_up = True
+        else:
+            row.next_attempt_at = now + retry_delay(row.attempt_count)
+    return gave_up
+
+
+def _send(message: dict) -> tuple[bool, str]:
+    rate_limiter.acquire()
+    return email_service.send_email(**message)
+
+
+def dispatch_pending_notifications(db: Session, limit: int = DISPATCH_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Send one batch of due PENDING notifications
+
+    Returns:
+        Counts of claimed rows, sent/retried/failed messages, and whether
+        more due rows may remain (claimed == limit)
+    """
+    rows = _claim_due_rows(db, limit)
+    if not rows:
+        db.commit()
+        return {'claimed': 0, 'sent': 0, 'retrying': 0, 'failed': 0, 'more': False}
+
+    # Regroup into one message per user
+    rows_by_user: Dict[int, List[NotificationHistory]] = defaultdict(list)
+    plans: Dict[int, UserNotification] = {}
+    for row in rows:
+        if row.user_id not in plans:
+            plans[row.user_id] = UserNotification(row.user)
+        plans[row.user_id].add(row.subscription, row.news)
+        rows_by_user[row.user_id].append(row)
+
+    counts = {'claimed': len(rows), 'sent': 0, 'retrying': 0, 'failed': 0, 'more': len(rows) >= limit}
+
+    messages = {}
+    for user_id, plan in plans.items():
+        user = plan.user
+        if not user.email:
+            _mark_failed_attempt(rows_by_user[user_id], "User has no email address")
+            counts['failed'] += 1
+            continue
+        messages[user_id] = email_service.render_keyword_matches_notification(
+            to_email=user.email,
+            user_name=user.full_name or user.username,
+            news_items=plan.email_items()
+        )
+
+    # Bounded concurrency; each worker takes a rate limiter token per message
+    with ThreadPoolExecutor(max_workers=EMAIL_MAX_CONCURRENCY) as executor:
+        results = dict(zip(messages, executor.map(_send, messages.values())))
+
+    for user_id, (success, message) in results.items():
+        if success:
+            _mark_sent(rows_by_user[user_id])
+            counts['sent'] += 1
+        elif _mark_failed_attempt(rows_by_user[user_id], message):
+            logger.error(f"Giving up on notification email to user {user_id}: {message}")
+            counts['failed'] += 1
+        else:
+            counts['retrying'] += 1
+
+    db.commit()
+    return counts
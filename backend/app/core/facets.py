@@ -0,0 +1,143 @@
+"""
+Facet index for the news filters (category, publisher, department, source)
+
+news_facets holds one row per (facet, value) with the number of published
+articles carrying that value. It is maintained incrementally: every insert,
+update or delete of a news row applies +1/-1 deltas in a single upsert, so
+the filter lists never have to run SELECT DISTINCT over the news table.
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional
+from sqlalchemy import func, case, event
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Query
+from sqlalchemy.orm.attributes import get_history
+from app.models.facet import NewsFacet
+from app.models.news import News
+
+# Facet name -> news column
+FACET_COLUMNS = {
+    "category": News.category,
+    "publisher": News.publisher,
+    "department": News.department,
+    "source_name": News.source_name,
+}
+
+# Columns whose changes can move a row between facet values
+TRACKED_FIELDS = ("is_published", *FACET_COLUMNS)
+
+
+def facet_values(row: Mapping) -> Dict[str, str]:
+    """
+    Facet values contributed by a news row (nothing if it is unpublished)
+
+    Args:
+        row: Mapping with is_published and the facet column values
+    """
+    # Rows inserted without is_published get the column default (True)
+    if row.get("is_published") is False:
+        return {}
+
+    return {
+        facet: row[facet]
+        for facet in FACET_COLUMNS
+        if row.get(facet)
+    }
+
+
+def apply_facet_changes(connection, removed: Iterable[Mapping] = (), added: Iterable[Mapping] = ()) -> None:
+    """
+    Apply facet count deltas for removed and added news rows in one upsert
+
+    Args:
+        connection: SQLAlchemy connection (inside the caller's transaction)
+        removed: Rows (or previous row states) no longer counted
+        added: Rows (or new row states) to count
+    """
+    deltas = Counter()
+    for row in removed:
+        for facet, value in facet_values(row).items():
+            deltas[(facet, value)] -= 1
+    for row in added:
+        for facet, value in facet_values(row).items():
+            deltas[(facet, value)] += 1
+
+    changes = [
+        {"facet": facet, "value": value, "count": delta}
+        for (facet, value), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not changes:
+        return
+
+    stmt = insert(NewsFacet).values(changes)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[NewsFacet.facet, NewsFacet.value],
+        set_={
+            "count": NewsFacet.count + stmt.excluded.count,
+            "last_seen": case(
+                (stmt.excluded.count > 0, func.now()),
+                else_=NewsFacet.last_seen
+            ),
+        }
+    )
+    connection.execute(stmt)
+
+
+def facet_counts(db, facet: str) -> List[dict]:
+    """
+    Values of one facet with their article counts, most frequent first
+    """
+    rows = db.query(NewsFacet.value, NewsFacet.count).filter(
+        NewsFacet.facet == facet,
+        NewsFacet.count > 0
+    ).order_by(NewsFacet.count.desc(), NewsFacet.value).all()
+
+    return [{"value": value, "count": count} for value, count in rows]
+
+
+def scoped_facet_counts(query: Query, facets: Optional[Iterable[str]] = None) -> Dict[str, List[dict]]:
+    """
+    Facet counts restricted to an already-filtered news query
+
+    Runs one GROUP BY per facet over the filtered rows (not the index table),
+    so counts reflect the current filter set.
+    """
+    result = {}
+    for facet in facets or FACET_COLUMNS:
+        column = FACET_COLUMNS[facet]
+        count = func.count()
+        rows = query.with_entities(column, count).filter(
+            column.isnot(None)
+        ).group_by(column).order_by(count.desc(), column).all()
+        result[facet] = [{"value": value, "count": n} for value, n in rows]
+
+    return result
+
+
+def _current_state(target: News) -> dict:
+    return {field: getattr(target, field) for field in TRACKED_FIELDS}
+
+
+def _previous_state(target: News) -> dict:
+    state = {}
+    for field in TRACKED_FIELDS:
+        history = get_history(target, field)
+        state[field] = history.deleted[0] if history.deleted else getattr(target, field)
+    return state
+
+
+@event.listens_for(News, "after_insert")
+def _count_inserted_news(mapper, connection, target):
+    apply_facet_changes(connection, added=[_current_state(target)])
+
+
+@event.listens_for(News, "after_update")
+def _recount_updated_news(mapper, connection, target):
+    if any(get_history(target, field).has_changes() for field in TRACKED_FIELDS):
+        apply_facet_changes(connection, removed=[_previous_state(target)], added=[_current_state(target)])
+
+
+@event.listens_for(News, "after_delete")
+def _uncount_deleted_news(mapper, connection, target):
+    apply_facet_changes(connection, removed=[_current_state(target)])
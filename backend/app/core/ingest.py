@@ -0,0 +1,129 @@
+"""
+Bulk ingestion of spider output
+
+A batch of articles is written with at most two statements instead of a
+SELECT + INSERT + refresh per article:
+
+- new articles: INSERT ... ON CONFLICT DO NOTHING RETURNING id
+- articles whose source_url is known but whose content changed:
+  INSERT ... ON CONFLICT (source_url) DO UPDATE RETURNING id
+
+Articles whose content_hash already exists are reported as duplicates.
+Both statements bypass the ORM unit of work, so the search vector and the
+facet index are maintained here explicitly.
+"""
+from typing import Dict, List
+from sqlalchemy import func, literal_column, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.core.facets import TRACKED_FIELDS, apply_facet_changes
+from app.core.search import build_search_vector
+from app.models.news import News
+from app.schemas.news import NewsCreate, IngestStatus, IngestResult
+
+# Columns replaced when a known source_url is re-crawled with new content
+REFRESHED_FIELDS = (
+    "title", "content", "summary", "source_name", "published_at", "author",
+    "publisher", "images", "attachments", "category", "department", "tags",
+    "content_hash", "search_vector",
+)
+
+
+def _row(item: NewsCreate) -> dict:
+    row = item.model_dump()
+    row["search_vector"] = build_search_vector(item.title, item.summary, item.content)
+    return row
+
+
+def bulk_upsert_news(db: Session, items: Dict[int, NewsCreate]) -> List[IngestResult]:
+    """
+    Insert or refresh a batch of articles
+
+    Args:
+        db: Database session (committed on success)
+        items: Validated articles keyed by their index in the batch
+
+    Returns:
+        One IngestResult per article, in index order
+    """
+    results: Dict[int, IngestResult] = {}
+    if not items:
+        return []
+
+    # One lookup for everything the batch could collide with
+    hashes = {item.content_hash for item in items.values()}
+    urls = {item.source_url for item in items.values()}
+    existing = db.query(
+        News.id, News.source_url, News.content_hash, *(getattr(News, f) for f in TRACKED_FIELDS)
+    ).filter(or_(News.content_hash.in_(hashes), News.source_url.in_(urls))).all()
+
+    by_hash = {row.content_hash: row for row in existing}
+    by_url = {row.source_url: row for row in existing}
+
+    new_items: Dict[str, int] = {}      # content_hash -> index
+    changed_items: Dict[str, int] = {}  # source_url -> index
+    seen_urls = set()
+
+    for index, item in sorted(items.items()):
+        if item.content_hash in by_hash:
+            results[index] = IngestResult(
+                index=index, status=IngestStatus.DUPLICATE, id=by_hash[item.content_hash].id
+            )
+        elif item.content_hash in new_items or item.source_url in seen_urls:
+            # Repeated within the batch; the first occurrence wins
+            results[index] = IngestResult(index=index, status=IngestStatus.DUPLICATE)
+        elif item.source_url in by_url:
+            changed_items[item.source_url] = index
+        else:
+            new_items[item.content_hash] = index
+        seen_urls.add(item.source_url)
+
+    created_states = []
+
+    if new_items:
+        stmt = insert(News).values(
+            [_row(items[index]) for index in new_items.values()]
+        ).on_conflict_do_nothing().returning(News.id, News.content_hash)
+
+        for news_id, content_hash in db.execute(stmt):
+            index = new_items.pop(content_hash)
+            results[index] = IngestResult(index=index, status=IngestStatus.CREATED, id=news_id)
+            created_states.append(items[index].model_dump())
+
+        # Lost a race with a concurrent writer of the same article
+        for index in new_items.values():
+            results[index] = IngestResult(index=index, status=IngestStatus.DUPLICATE)
+
+    removed_states, updated_states = [], []
+
+    if changed_items:
+        stmt = insert(News).values(
+            [_row(items[index]) for index in changed_items.values()]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[News.source_url],
+            set_=dict(
+                {field: stmt.excluded[field] for field in REFRESHED_FIELDS},
+                updated_at=func.now()
+            )
+        ).returning(News.id, News.source_url, literal_column("xmax = 0").label("inserted"))
+
+        for news_id, source_url, inserted in db.execute(stmt):
+            index = changed_items[source_url]
+            state = items[index].model_dump()
+            if inserted:
+                # The row disappeared between the lookup and the upsert
+                results[index] = IngestResult(index=index, status=IngestStatus.CREATED, id=news_id)
+                created_states.append(state)
+            else:
+                previous = by_url[source_url]
+                results[index] = IngestResult(index=index, status=IngestStatus.UPDATED, id=news_id)
+                removed_states.append(previous._asdict())
+                updated_states.append(dict(state, is_published=previous.is_published))
+
+    apply_facet_changes(
+        db.connection(), removed=removed_states, added=created_states + updated_states
+    )
+    db.commit()
+
+    return [results[index] for index in sorted(results)]
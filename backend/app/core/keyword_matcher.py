@@ -0,0 +1,205 @@
+"""
+Keyword subscription matching
+
+All distinct active subscription keywords are compiled into one Aho-Corasick
+automaton, so an article is scanned once however many subscriptions exist,
+instead of once per subscription.
+
+The compiled matcher is cached per process and keyed by a cheap fingerprint
+of the subscriptions table (row count, max id, max updated_at). When the
+fingerprint changes, the subscription rows are reloaded; the automaton is
+extended in place when keywords were only added and rebuilt from scratch
+only when keywords disappeared. Changes that do not alter the keyword set
+(a second user subscribing to an existing keyword, a frequency change)
+only refresh the keyword -> subscription mapping.
+"""
+import logging
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.subscription import KeywordSubscription, NotificationFrequency
+
+logger = logging.getLogger(__name__)
+
+# Joins the scanned fields; never part of a keyword, so no match spans two fields
+FIELD_SEPARATOR = "\x00"
+
+
+class AhoCorasick:
+    """
+    Multi-pattern substring matcher
+
+    Patterns can be added after construction; failure links are recomputed
+    lazily before the next search.
+    """
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._terminal: List[Set[str]] = [set()]  # Patterns ending at each state
+        self._output: List[Set[str]] = [set()]    # Terminal plus those reachable via failure links
+        self._patterns: Set[str] = set()
+        self._dirty = False
+        for pattern in patterns:
+            self.add(pattern)
+
+    def __contains__(self, pattern: str) -> bool:
+        return pattern in self._patterns
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    @property
+    def patterns(self) -> Set[str]:
+        return set(self._patterns)
+
+    def add(self, pattern: str) -> None:
+        """Insert a pattern into the trie"""
+        if not pattern or pattern in self._patterns:
+            return
+
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._terminal.append(set())
+                self._goto[state][char] = next_state
+            state = next_state
+
+        self._terminal[state].add(pattern)
+        self._patterns.add(pattern)
+        self._dirty = True
+
+    def _build_failure_links(self) -> None:
+        """Breadth-first computation of failure links and merged outputs"""
+        self._fail = [0] * len(self._goto)
+        self._output = [set(terminal) for terminal in self._terminal]
+
+        queue = deque()
+        for next_state in self._goto[0].values():
+            self._fail[next_state] = 0
+            queue.append(next_state)
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+        self._dirty = False
+
+    def find(self, text: str) -> Set[str]:
+        """Return the set of patterns occurring anywhere in text"""
+        if self._dirty:
+            self._build_failure_links()
+
+        goto, fail, output = self._goto, self._fail, self._output
+        found: Set[str] = set()
+        state = 0
+
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+
+        return found
+
+
+class _Subscription(NamedTuple):
+    id: int
+    keyword: str
+    frequency: NotificationFrequency
+
+
+class SubscriptionMatcher:
+    """Compiled active subscriptions: keyword automaton plus keyword -> subscriptions"""
+
+    def __init__(self):
+        self.automaton = AhoCorasick()
+        self.fingerprint: Optional[Tuple] = None
+        self._subscriptions: Dict[str, List[_Subscription]] = {}
+
+    def load(self, subscriptions: Iterable[_Subscription], fingerprint: Tuple) -> None:
+        by_keyword = defaultdict(list)
+        for sub in subscriptions:
+            keyword = sub.keyword.strip().lower()
+            if keyword:
+                by_keyword[keyword].append(sub)
+
+        keywords = set(by_keyword)
+        current = self.automaton.patterns
+
+        if not current <= keywords:
+            logger.info(f"Rebuilding keyword automaton ({len(keywords)} keywords)")
+            self.automaton = AhoCorasick(keywords)
+        else:
+            for keyword in keywords - current:
+                self.automaton.add(keyword)
+
+        self._subscriptions = dict(by_keyword)
+        self.fingerprint = fingerprint
+
+    def match(self, *fields: Optional[str], frequency: Optional[NotificationFrequency] = None) -> Dict[str, List[int]]:
+        """
+        Match article fields against all active subscriptions in one pass
+
+        Args:
+            fields: Text fields to scan (e.g. title, summary, content)
+            frequency: Only return subscriptions with this notification frequency
+
+        Returns:
+            Matched keyword -> subscription ids
+        """
+        text = FIELD_SEPARATOR.join(field for field in fields if field).lower()
+
+        matches = {}
+        for keyword in self.automaton.find(text):
+            ids = [
+                sub.id for sub in self._subscriptions.get(keyword, [])
+                if frequency is None or sub.frequency == frequency
+            ]
+            if ids:
+                matches[keyword] = ids
+
+        return matches
+
+
+_matcher = SubscriptionMatcher()
+_matcher_lock = threading.Lock()
+
+
+def _fingerprint(db: Session) -> Tuple:
+    return tuple(db.query(
+        func.count(KeywordSubscription.id),
+        func.max(KeywordSubscription.id),
+        func.max(KeywordSubscription.updated_at)
+    ).one())
+
+
+def get_matcher(db: Session) -> SubscriptionMatcher:
+    """
+    Return the process-wide matcher, refreshed if subscriptions changed
+    """
+    fingerprint = _fingerprint(db)
+
+    with _matcher_lock:
+        if fingerprint != _matcher.fingerprint:
+            rows = db.query(
+                KeywordSubscription.id,
+                KeywordSubscription.keyword,
+                KeywordSubscription.frequency
+            ).filter(KeywordSubscription.is_active == True).all()
+            _matcher.load((_Subscription(*row) for row in rows), fingerprint)
+
+    return _matcher
@@ -0,0 +1,125 @@
+"""
+Keyword notification planning
+
+Matches found in one batch window are grouped per user, so a user receives
+a single message listing every matched article (with the keywords it
+matched) instead of one email per (keyword, article) pair. Articles a user
+has already been notified about are dropped, and every subscription the
+message covers is recorded in NotificationHistory as PENDING; the email
+queue (app.core.email_queue) regroups those rows and sends the message.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models.news import News
+from app.models.subscription import KeywordSubscription, NotificationHistory, EmailStatus
+from app.models.user import User
+
+
+class UserNotification:
+    """One aggregated message: a user and the articles that matched their keywords"""
+
+    def __init__(self, user: User):
+        self.user = user
+        self.articles: Dict[int, News] = {}
+        self.keywords: Dict[int, List[str]] = defaultdict(list)  # news id -> matched keywords
+        self.subscription_ids: Dict[int, List[int]] = defaultdict(list)  # news id -> covered subscriptions
+
+    def add(self, subscription: Optional[KeywordSubscription], news: News) -> None:
+        self.articles[news.id] = news
+        self.keywords.setdefault(news.id, [])  # No keyword if the subscription was deleted
+        if subscription is None:
+            return
+        if subscription.keyword not in self.keywords[news.id]:
+            self.keywords[news.id].append(subscription.keyword)
+        if subscription.id not in self.subscription_ids[news.id]:
+            self.subscription_ids[news.id].append(subscription.id)
+
+    def email_items(self) -> List[dict]:
+        """Articles as passed to EmailService.render_keyword_matches_notification"""
+        return [
+            {
+                'id': news.id,
+                'title': news.title,
+                'summary': news.summary or news.content[:200],
+                'category': news.category,
+                'published_at': news.published_at.strftime('%Y-%m-%d') if news.published_at else '',
+                'keywords': self.keywords[news_id],
+            }
+            for news_id, news in self.articles.items()
+        ]
+
+    def history_rows(self) -> List[dict]:
+        """PENDING NotificationHistory rows for every subscription covered by this message"""
+        return [
+            {
+                'user_id': self.user.id,
+                'subscription_id': subscription_id,
+                'news_id': news_id,
+                'email_status': EmailStatus.PENDING,
+            }
+            for news_id, subscription_ids in self.subscription_ids.items()
+            for subscription_id in subscription_ids
+        ]
+
+
+def _already_notified(db: Session, user_ids: Iterable[int], news_ids: Iterable[int]) -> set:
+    """(user_id, news_id) pairs that were already mailed (or are queued)"""
+    rows = db.query(NotificationHistory.user_id, NotificationHistory.news_id).filter(
+        NotificationHistory.user_id.in_(list(user_ids)),
+        NotificationHistory.news_id.in_(list(news_ids)),
+        NotificationHistory.email_status != EmailStatus.FAILED
+    ).distinct().all()
+    return {(user_id, news_id) for user_id, news_id in rows}
+
+
+def plan_notifications(db: Session, matches: Iterable[Tuple[int, News]]) -> List[UserNotification]:
+    """
+    Group keyword matches into one notification per user
+
+    Args:
+        db: Database session
+        matches: (subscription id, news item) pairs found in this window
+
+    Returns:
+        One UserNotification per user with at least one article not yet sent
+    """
+    matches = list(matches)
+    if not matches:
+        return []
+
+    subscription_ids = {sub_id for sub_id, _ in matches}
+    subscriptions = {
+        sub.id: sub for sub in db.query(KeywordSubscription).filter(
+            KeywordSubscription.id.in_(subscription_ids)
+        )
+    }
+
+    user_ids = {sub.user_id for sub in subscriptions.values()}
+    users = {
+        user.id: user for user in db.query(User).filter(User.id.in_(user_ids))
+    } if user_ids else {}
+
+    news_ids = {news.id for _, news in matches}
+    notified = _already_notified(db, user_ids, news_ids) if user_ids else set()
+
+    plans: Dict[int, UserNotification] = {}
+    for sub_id, news in matches:
+        subscription = subscriptions.get(sub_id)
+        user = users.get(subscription.user_id) if subscription else None
+
+        if not user or not user.email or (user.id, news.id) in notified:
+            continue
+
+        if user.id not in plans:
+            plans[user.id] = UserNotification(user)
+        plans[user.id].add(subscription, news)
+
+    return list(plans.values())
+
+
+def record_notifications(db: Session, rows: List[dict]) -> None:
+    """Write NotificationHistory rows with a single bulk insert (caller commits)"""
+    if rows:
+        db.execute(insert(NotificationHistory), rows)
@@ -0,0 +1,74 @@
+"""
+Keyset (cursor) pagination helpers for the news feed
+
+The feed is ordered by (published_at DESC, id DESC), which PostgreSQL sorts
+with NULL publication dates first. A cursor is the opaque, URL-safe encoding
+of the last row's (published_at, id) pair; the next page continues strictly
+after it so no rows are skipped or repeated, however deep the page.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from sqlalchemy import and_, or_, tuple_, desc
+from app.models.news import News
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor cannot be decoded"""
+
+
+def feed_ordering():
+    """ORDER BY clauses matching the ix_news_*_feed composite indexes"""
+    return desc(News.published_at), desc(News.id)
+
+
+def encode_cursor(published_at: Optional[datetime], news_id: int) -> str:
+    """
+    Encode a (published_at, id) position as an opaque cursor string
+    """
+    payload = {
+        "p": published_at.isoformat() if published_at else None,
+        "i": news_id,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        published_at = datetime.fromisoformat(payload["p"]) if payload["p"] else None
+        news_id = int(payload["i"])
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+
+    return published_at, news_id
+
+
+def apply_cursor(query, cursor: str):
+    """
+    Restrict a feed-ordered query to rows strictly after the cursor position
+    """
+    published_at, news_id = decode_cursor(cursor)
+
+    if published_at is None:
+        # Still inside the NULLS FIRST block: remaining NULL rows, then all dated rows
+        return query.filter(
+            or_(
+                and_(News.published_at.is_(None), News.id < news_id),
+                News.published_at.isnot(None)
+            )
+        )
+
+    # Row-value comparison lets PostgreSQL seek straight into the index
+    return query.filter(
+        tuple_(News.published_at, News.id) < tuple_(published_at, news_id)
+    )
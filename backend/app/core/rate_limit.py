@@ -0,0 +1,86 @@
+"""
+Redis-backed token bucket shared by all worker processes
+"""
+import logging
+import time
+from typing import Optional
+import redis
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Refill the bucket for the elapsed time, then take the tokens or report
+# how long the caller has to wait for them
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(wait)
+"""
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter stored in Redis
+
+    Args:
+        name: Bucket name (shared by every process using the same name)
+        rate: Tokens added per second
+        capacity: Maximum burst size
+    """
+
+    def __init__(self, name: str, rate: float, capacity: int, client=None):
+        self.key = f"ratelimit:{name}"
+        self.rate = rate
+        self.capacity = capacity
+        self.client = client or redis_client
+        self._script = self.client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    def try_acquire(self, tokens: int = 1) -> float:
+        """
+        Take tokens if available
+
+        Returns:
+            0 if the tokens were taken, otherwise the seconds to wait before retrying
+        """
+        try:
+            return float(self._script(
+                keys=[self.key], args=[self.rate, self.capacity, time.time(), tokens]
+            ))
+        except redis.RedisError as e:
+            # Fail open: a Redis outage should slow nothing down further
+            logger.warning(f"Rate limiter {self.key} unavailable: {e}")
+            return 0.0
+
+    def acquire(self, tokens: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Block until tokens are available
+
+        Returns:
+            False if they could not be taken within timeout seconds
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
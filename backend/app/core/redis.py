@@ -0,0 +1,16 @@
+"""
+Shared Redis client for caching and counters
+
+Redis is an optimization layer: callers must treat connection errors as a
+cache miss and fall back to the database.
+"""
+import redis
+from app.core.config import settings
+
+# Short timeouts so an unavailable Redis degrades requests instead of stalling them
+redis_client = redis.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    socket_connect_timeout=0.5,
+    socket_timeout=0.5
+)
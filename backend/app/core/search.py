@@ -0,0 +1,78 @@
+"""
+Full-text search helpers for news articles
+
+PostgreSQL has no built-in Chinese parser, so text is segmented with jieba
+in Python and the resulting space-separated tokens are fed to the 'simple'
+text search configuration. Title, summary and content are weighted A/B/C
+so that ts_rank favours title hits.
+"""
+from typing import Optional
+import jieba
+from sqlalchemy import func, literal
+
+# Text search configuration used for both documents and queries
+SEARCH_CONFIG = "simple"
+
+# Cap on content length fed to the segmenter (tsvector max is 1MB)
+MAX_CONTENT_CHARS = 20000
+
+jieba.setLogLevel(60)  # Silence jieba's dictionary loading messages
+
+
+def segment(text: Optional[str]) -> str:
+    """
+    Segment Chinese text into space-separated, lowercased tokens
+
+    Uses search-engine mode so both long words and their sub-words are
+    indexed (e.g. 武汉理工大学 -> 武汉 理工 大学 武汉理工大学).
+    """
+    if not text:
+        return ""
+
+    tokens = (token.strip().lower() for token in jieba.cut_for_search(text))
+    return " ".join(token for token in tokens if token)
+
+
+def segment_query(text: Optional[str]) -> str:
+    """
+    Segment a search string into its finest-grained tokens
+
+    Documents are indexed with both compounds and their sub-words, but the
+    compound a user types is not always the one jieba picked for the
+    document (理工大学 vs 武汉理工大学). Dropping tokens that contain another
+    token keeps only the sub-words, which both sides normally share.
+    """
+    tokens = list(dict.fromkeys(segment(text).split()))
+    minimal = [
+        token for token in tokens
+        if not any(other != token and other in token for other in tokens)
+    ]
+    return " ".join(minimal)
+
+
+def build_search_vector(title: Optional[str], summary: Optional[str], content: Optional[str]):
+    """
+    Build a weighted tsvector SQL expression for a news article
+    """
+    weighted = [
+        (title, "A"),
+        (summary, "B"),
+        ((content or "")[:MAX_CONTENT_CHARS], "C"),
+    ]
+
+    vector = None
+    for text, weight in weighted:
+        part = func.setweight(
+            func.to_tsvector(SEARCH_CONFIG, literal(segment(text))),
+            weight
+        )
+        vector = part if vector is None else vector.op("||")(part)
+
+    return vector
+
+
+def build_search_query(search: str):
+    """
+    Build a tsquery matching all segmented terms of a user search string
+    """
+    return func.plainto_tsquery(SEARCH_CONFIG, segment_query(search))
@@ -0,0 +1,61 @@
+"""
+Email template registry
+
+Templates under app/templates are loaded through one shared jinja2
+Environment, which keeps every compiled template in memory and persists
+the compiled bytecode on disk, so a template is parsed and compiled once
+per worker rather than once per message. auto_reload is off unless
+TEMPLATES_AUTO_RELOAD is set, so rendering does not even stat the template
+file.
+
+Each message has an HTML variant (<name>.html, autoescaped) and a plain
+text variant (<name>.txt).
+"""
+import logging
+from pathlib import Path
+from typing import Tuple
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "templates"
+
+env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=select_autoescape(["html"]),
+    bytecode_cache=FileSystemBytecodeCache(),
+    auto_reload=settings.TEMPLATES_AUTO_RELOAD,
+    cache_size=-1,  # Never evict compiled templates
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+
+
+def render(name: str, **context) -> str:
+    """Render a single template file"""
+    return env.get_template(name).render(**context)
+
+
+def render_email(name: str, **context) -> Tuple[str, str]:
+    """
+    Render the HTML and plain text variants of an email template
+
+    Returns:
+        Tuple of (html_content, text_content)
+    """
+    return render(f"{name}.html", **context), render(f"{name}.txt", **context)
+
+
+def precompile() -> int:
+    """
+    Compile every template up front (called at worker startup)
+
+    Returns:
+        Number of templates compiled
+    """
+    names = env.list_templates(extensions=["html", "txt"])
+    for name in names:
+        env.get_template(name)
+    logger.info(f"Precompiled {len(names)} email templates")
+    return len(names)
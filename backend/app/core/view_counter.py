@@ -0,0 +1,148 @@
+"""
+Buffered article view counting
+
+Views are incremented in a Redis hash instead of updating news.view_count
+on every read. A periodic Celery task flushes the accumulated deltas to
+PostgreSQL with batched UPDATE ... FROM (VALUES ...) statements, so reads
+of a hot article never contend on its row lock.
+
+The flush first RENAMEs the pending hash to a flushing hash, which is
+atomic: views recorded during the flush land in a fresh pending hash. The
+flushing hash is tagged with a generation id, and the UPDATEs insert that
+id into view_count_flushes in the same transaction. If a flush dies
+before its commit, the next run applies the flushing hash again; if it
+dies after the commit but before deleting the hash, the next run finds the
+generation already applied and only deletes it, so no delta is counted
+twice.
+"""
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import redis
+from sqlalchemy import Integer, column, update, values
+from sqlalchemy.orm import Session
+from app.core.cache import invalidate_tags
+from app.core.redis import redis_client
+from app.models.news import News, ViewCountFlush
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "news:views:pending"
+FLUSHING_KEY = "news:views:flushing"
+
+# Field of the flushing hash holding its generation id
+FLUSH_ID_FIELD = "flush_id"
+
+# Applied generations are kept this long; a flushing hash older than that
+# would be applied again
+FLUSH_RECORD_RETENTION = timedelta(days=7)
+
+# Rows per UPDATE statement during a flush
+FLUSH_BATCH_SIZE = 1000
+
+
+def record_view(news_id: int) -> bool:
+    """
+    Buffer one view of an article
+
+    Returns:
+        False if Redis is unavailable and the caller should write directly
+    """
+    try:
+        redis_client.hincrby(PENDING_KEY, news_id, 1)
+        return True
+    except redis.RedisError as e:
+        logger.warning(f"View counter unavailable: {e}")
+        return False
+
+
+def _is_applied(db: Session, flush_id: Optional[str]) -> bool:
+    return bool(flush_id) and db.get(ViewCountFlush, flush_id) is not None
+
+
+def pending_views(news_id: int, db: Session) -> int:
+    """
+    Views recorded for an article but not yet flushed to the database
+    """
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.hget(PENDING_KEY, news_id)
+        pipe.hget(FLUSHING_KEY, news_id)
+        pipe.hget(FLUSHING_KEY, FLUSH_ID_FIELD)
+        pending, flushing, flush_id = pipe.execute()
+    except redis.RedisError:
+        return 0
+
+    total = int(pending or 0)
+    # Between a flush's commit and its cleanup the flushing deltas are
+    # already part of view_count
+    if flushing and not _is_applied(db, flush_id):
+        total += int(flushing)
+    return total
+
+
+def _take_pending() -> Optional[dict]:
+    """
+    Atomically move the pending hash aside and return its deltas
+    """
+    if not redis_client.exists(FLUSHING_KEY):
+        try:
+            redis_client.rename(PENDING_KEY, FLUSHING_KEY)
+        except redis.ResponseError:
+            # No pending views since the last flush
+            return None
+
+    # Set once per generation, also when a previous run died right after the RENAME
+    redis_client.hsetnx(FLUSHING_KEY, FLUSH_ID_FIELD, uuid.uuid4().hex)
+    return redis_client.hgetall(FLUSHING_KEY)
+
+
+def flush_view_counts(db: Session) -> int:
+    """
+    Apply buffered view deltas to news.view_count in batched UPDATEs
+
+    Returns:
+        Number of articles updated
+    """
+    deltas = _take_pending()
+    if not deltas:
+        return 0
+
+    flush_id = deltas.pop(FLUSH_ID_FIELD)
+    if _is_applied(db, flush_id):
+        # Committed by a run that died before deleting the hash
+        redis_client.delete(FLUSHING_KEY)
+        return 0
+
+    rows = [(int(news_id), int(delta)) for news_id, delta in deltas.items() if int(delta)]
+
+    # Recorded first: a concurrent flush of the same generation blocks on
+    # this primary key and then fails instead of applying it twice
+    db.add(ViewCountFlush(id=flush_id))
+    db.flush()
+
+    for start in range(0, len(rows), FLUSH_BATCH_SIZE):
+        batch = values(
+            column("id", Integer), column("delta", Integer), name="v"
+        ).data(rows[start:start + FLUSH_BATCH_SIZE])
+
+        db.execute(
+            update(News)
+            .where(News.id == batch.c.id)
+            # Keep updated_at: a view is not an edit of the article
+            .values(view_count=News.view_count + batch.c.delta, updated_at=News.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    db.query(ViewCountFlush).filter(
+        ViewCountFlush.applied_at < datetime.now(timezone.utc) - FLUSH_RECORD_RETENTION
+    ).delete(synchronize_session=False)
+
+    db.commit()
+    redis_client.delete(FLUSHING_KEY)
+
+    # Cached article bodies embed the persisted count
+    invalidate_tags(*(f"news:{news_id}" for news_id, _ in rows))
+
+    return len(rows)
@@ -1,7 +1,11 @@
 # Database models package
-from app.models.news import News
+from app.models.news import News, ViewCountFlush
+from app.models.facet import NewsFacet
 from app.models.user import User, user_bookmarks
 from app.models.calendar import Semester, SemesterWeek
 from app.models.subscription import KeywordSubscription, NotificationHistory
 
-__all__ = ["News", "User", "user_bookmarks", "Semester", "SemesterWeek", "KeywordSubscription", "NotificationHistory"]
+__all__ = ["News", "ViewCountFlush", "NewsFacet", "User", "user_bookmarks", "Semester", "SemesterWeek", "KeywordSubscription", "NotificationHistory"]
+
+# Register the facet index maintenance hooks on News
+import app.core.facets  # noqa: E402,F401
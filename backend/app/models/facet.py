@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class NewsFacet(Base):
+    """Maintained value counts of published news per filter facet"""
+    __tablename__ = "news_facets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    facet = Column(String(50), nullable=False)  # category | publisher | department | source_name
+    value = Column(String(200), nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+    last_seen = Column(DateTime(timezone=True), server_default=func.now())  # Last time an article added this value
+
+    __table_args__ = (
+        UniqueConstraint("facet", "value", name="uq_news_facets_facet_value"),
+    )
+
+    def __repr__(self):
+        return f"<NewsFacet({self.facet}={self.value}, count={self.count})>"
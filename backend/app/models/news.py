@@ -1,7 +1,10 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, Index, event
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship
+from sqlalchemy.orm.attributes import get_history
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.search import build_search_vector
 
 class News(Base):
     __tablename__ = "news"
@@ -37,6 +40,9 @@ class News(Base):
     view_count = Column(Integer, default=0)
     content_hash = Column(String(64), unique=True, index=True)  # For deduplication
 
+    # Full-text search (jieba-segmented, weighted title/summary/content)
+    search_vector = Column(TSVECTOR, nullable=True)
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -44,5 +50,38 @@ class News(Base):
     # Relationships
     bookmarked_by = relationship("User", secondary="user_bookmarks", back_populates="bookmarks")
 
+    __table_args__ = (
+        Index("ix_news_search_vector", "search_vector", postgresql_using="gin"),
+        # Keyset pagination: one feed index plus one per filterable column
+        Index("ix_news_feed", is_published, published_at.desc(), id.desc()),
+        Index("ix_news_category_feed", category, is_published, published_at.desc(), id.desc()),
+        Index("ix_news_publisher_feed", publisher, is_published, published_at.desc(), id.desc()),
+        Index("ix_news_department_feed", department, is_published, published_at.desc(), id.desc()),
+        Index("ix_news_source_name_feed", source_name, is_published, published_at.desc(), id.desc()),
+    )
+
     def __repr__(self):
         return f"<News(id={self.id}, title={self.title[:50]})>"
+
+
+@event.listens_for(News, "before_insert")
+def _set_search_vector_on_insert(mapper, connection, target):
+    target.search_vector = build_search_vector(target.title, target.summary, target.content)
+
+
+@event.listens_for(News, "before_update")
+def _set_search_vector_on_update(mapper, connection, target):
+    # Only re-segment when one of the indexed fields actually changed
+    if any(get_history(target, field).has_changes() for field in ("title", "summary", "content")):
+        target.search_vector = build_search_vector(target.title, target.summary, target.content)
+
+
+class ViewCountFlush(Base):
+    """View count flush generation already applied to news.view_count (see app.core.view_counter)"""
+    __tablename__ = "view_count_flushes"
+
+    id = Column(String(32), primary_key=True)
+    applied_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<ViewCountFlush(id={self.id})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -49,6 +49,14 @@ class NotificationHistory(Base):
     sent_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Email queue bookkeeping (see app.core.email_queue)
+    attempt_count = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime(timezone=True), nullable=True)  # None = send as soon as possible
+
+    __table_args__ = (
+        Index("ix_notification_history_queue", email_status, next_attempt_at),
+    )
+
     # Relationships
     user = relationship("User", back_populates="notifications")
     subscription = relationship("KeywordSubscription", back_populates="notifications")
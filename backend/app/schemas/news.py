@@ -1,6 +1,7 @@
 from pydantic import BaseModel, HttpUrl
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Union
+import enum
 
 class NewsBase(BaseModel):
     title: str
@@ -40,8 +41,75 @@ class NewsResponse(NewsBase):
     class Config:
         from_attributes = True
 
+class NewsView(str, enum.Enum):
+    """Projection used for news list items"""
+    LIST = "list"  # Card fields only, no article bodies
+    FULL = "full"  # Complete NewsResponse objects
+
+
+class NewsListItem(BaseModel):
+    """Slim news card used by list endpoints (no content, images or attachments)"""
+    id: int
+    title: str
+    summary: Optional[str] = None
+    source_url: str
+    source_name: str
+    published_at: Optional[datetime] = None
+    author: Optional[str] = None
+    publisher: Optional[str] = None
+    category: Optional[str] = None
+    department: Optional[str] = None
+    tags: List[str] = []
+    is_featured: bool
+    view_count: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class NewsFacets(BaseModel):
+    """Facet values with article counts, keyed like the list filters"""
+    category: List[FacetCount] = []
+    publisher: List[FacetCount] = []
+    department: List[FacetCount] = []
+    source_name: List[FacetCount] = []
+
+
 class NewsList(BaseModel):
-    total: int
-    items: List[NewsResponse]
+    total: Optional[int] = None  # None when count_mode=none
+    total_is_estimate: bool = False
+    # NewsResponse first so full items are never narrowed to NewsListItem
+    items: List[Union[NewsResponse, NewsListItem]]
     page: int
     page_size: int
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to fetch the following page
+    facets: Optional[NewsFacets] = None  # Counts within the current filters (include_facets=true)
+
+
+class IngestStatus(str, enum.Enum):
+    """Outcome of one article in a bulk ingest"""
+    CREATED = "created"
+    DUPLICATE = "duplicate"  # Same content already stored
+    UPDATED = "updated"      # Known source_url, content changed
+    INVALID = "invalid"      # Failed validation, not written
+
+
+class IngestResult(BaseModel):
+    index: int  # Position of the article in the submitted batch
+    status: IngestStatus
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class NewsBulkResponse(BaseModel):
+    created: int
+    duplicates: int
+    updated: int
+    invalid: int
+    results: List[IngestResult]
@@ -0,0 +1,153 @@
+"""SMTPConnectionPool and EmailService.send_many against a local aiosmtpd server"""
+import smtplib
+import socket
+from email.message import EmailMessage
+from email.parser import BytesParser
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.core.email import EmailService, SMTPConnectionPool
+
+REFUSED = "refused@example.com"
+
+
+class RecordingHandler:
+    """Records (connection, subject) per accepted message and refuses REFUSED"""
+
+    def __init__(self):
+        self.messages = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address == REFUSED:
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        subject = BytesParser().parsebytes(envelope.content)["Subject"]
+        self.messages.append((session.peer, subject))
+        return "250 Message accepted for delivery"
+
+    @property
+    def connections(self):
+        return {peer for peer, _ in self.messages}
+
+    @property
+    def subjects(self):
+        return [subject for _, subject in self.messages]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Server:
+    """aiosmtpd controller that can be restarted on the same port"""
+
+    def __init__(self):
+        self.handler = RecordingHandler()
+        self.hostname = "127.0.0.1"
+        self.port = _free_port()
+        self.controller = None
+
+    def start(self):
+        self.controller = Controller(self.handler, hostname=self.hostname, port=self.port)
+        self.controller.start()
+
+    def stop(self):
+        self.controller.stop()
+        self.controller = None
+
+
+@pytest.fixture
+def server():
+    server = Server()
+    server.start()
+    yield server
+    if server.controller:
+        server.stop()
+
+
+def _pool(server, **kwargs):
+    return SMTPConnectionPool(server.hostname, server.port, use_tls=False, **kwargs)
+
+
+def _message(subject, to="user@example.com"):
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    msg["From"] = "cms@example.com"
+    msg["To"] = to
+    msg.set_content(subject)
+    return msg
+
+
+def test_connection_is_reused(server):
+    pool = _pool(server)
+    for i in range(5):
+        pool.send(_message(f"m{i}"))
+    pool.close()
+
+    assert server.handler.subjects == [f"m{i}" for i in range(5)]
+    assert len(server.handler.connections) == 1
+
+
+def test_connection_recycled_after_max_messages(server):
+    pool = _pool(server, max_messages_per_connection=2)
+    for i in range(5):
+        pool.send(_message(f"m{i}"))
+    pool.close()
+
+    peers = [peer for peer, _ in server.handler.messages]
+    assert peers[0] == peers[1] != peers[2] == peers[3] != peers[4]
+    assert len(server.handler.connections) == 3
+
+
+def test_reconnects_after_server_disconnect(server):
+    pool = _pool(server)
+    pool.send(_message("before"))
+
+    # Drops the pooled session; the next send sees SMTPServerDisconnected
+    server.stop()
+    server.start()
+    pool.send(_message("after"))
+    pool.close()
+
+    assert server.handler.subjects == ["before", "after"]
+    assert len(server.handler.connections) == 2
+
+
+def test_refused_recipient_keeps_connection(server):
+    pool = _pool(server)
+    pool.send(_message("first"))
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        pool.send(_message("refused", to=REFUSED))
+    pool.send(_message("second"))
+    pool.close()
+
+    assert server.handler.subjects == ["first", "second"]
+    assert len(server.handler.connections) == 1
+
+
+def test_send_many_keeps_message_order(server, monkeypatch):
+    monkeypatch.setenv("SMTP_HOST", server.hostname)
+    monkeypatch.setenv("SMTP_PORT", str(server.port))
+    monkeypatch.setenv("SMTP_USE_TLS", "false")
+    monkeypatch.setenv("SMTP_POOL_SIZE", "3")
+    monkeypatch.setenv("FROM_EMAIL", "cms@example.com")
+    service = EmailService()
+
+    recipients = [REFUSED if i % 7 == 3 else f"user{i}@example.com" for i in range(20)]
+    results = service.send_many([
+        {"to_email": to, "subject": f"m{i}", "html_content": f"<p>{i}</p>"}
+        for i, to in enumerate(recipients)
+    ])
+    service.pool.close()
+
+    assert [ok for ok, _ in results] == [to != REFUSED for to in recipients]
+    assert sorted(server.handler.subjects, key=lambda s: int(s[1:])) == [
+        f"m{i}" for i, to in enumerate(recipients) if to != REFUSED
+    ]
+    assert len(server.handler.connections) <= 3
@@ -6,12 +6,12 @@ import dayjs from 'dayjs'
 import 'dayjs/locale/zh-cn'
 import { useAuth } from '@/contexts/AuthContext'
 import { addBookmark, removeBookmark, getBookmarks } from '@/lib/api'
-import { NewsItem } from '@/lib/types'
+import { NewsListItem } from '@/lib/types'
 
 dayjs.locale('zh-cn')
 
 interface ClientNewsFeedProps {
-  items: NewsItem[]
+  items: NewsListItem[]
 }
 
 export default function ClientNewsFeed({ items }: ClientNewsFeedProps) {
@@ -4,12 +4,12 @@ import { useState } from 'react'
 import Link from 'next/link'
 import dayjs from 'dayjs'
 import 'dayjs/locale/zh-cn'
-import { NewsItem } from '@/lib/types'
+import { NewsListItem } from '@/lib/types'
 
 dayjs.locale('zh-cn')
 
 interface FeaturedNewsProps {
-  items: NewsItem[]
+  items: NewsListItem[]
 }
 
 export default function FeaturedNews({ items }: FeaturedNewsProps) {
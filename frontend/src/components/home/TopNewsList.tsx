@@ -1,10 +1,10 @@
 'use client'
 
 import Link from 'next/link'
-import { NewsItem } from '@/lib/types'
+import { NewsListItem } from '@/lib/types'
 
 interface TopNewsListProps {
-  items: NewsItem[]
+  items: NewsListItem[]
   loading?: boolean
 }
 
@@ -1,3 +1,5 @@
+import type { NewsFacets } from './types'
+
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
 
 interface NewsListParams {
@@ -9,6 +11,9 @@ interface NewsListParams {
   source_name?: string
   search?: string
   featured_only?: boolean
+  cursor?: string
+  count_mode?: 'exact' | 'estimated' | 'none'
+  include_facets?: boolean
 }
 
 export async function getNewsList(params: NewsListParams = {}) {
@@ -22,6 +27,9 @@ export async function getNewsList(params: NewsListParams = {}) {
   if (params.source_name) queryParams.append('source_name', params.source_name)
   if (params.search) queryParams.append('search', params.search)
   if (params.featured_only) queryParams.append('featured_only', 'true')
+  if (params.cursor) queryParams.append('cursor', params.cursor)
+  if (params.count_mode) queryParams.append('count_mode', params.count_mode)
+  if (params.include_facets) queryParams.append('include_facets', 'true')
 
   const response = await fetch(`${API_URL}/api/news/?${queryParams}`)
 
@@ -42,6 +50,16 @@ export async function getNewsById(id: number) {
   return response.json()
 }
 
+export async function getFacets(): Promise<NewsFacets> {
+  const response = await fetch(`${API_URL}/api/news/facets`)
+
+  if (!response.ok) {
+    throw new Error('Failed to fetch facets')
+  }
+
+  return response.json()
+}
+
 export async function getCategories() {
   const response = await fetch(`${API_URL}/api/news/categories/list`)
 
@@ -23,11 +23,32 @@ export interface NewsItem {
   updated_at?: string
 }
 
+// Slim card returned by the list endpoint (view=list); no article body or media
+export type NewsListItem = Omit<NewsItem, 'content' | 'images' | 'attachments' | 'is_published' | 'updated_at'> & {
+  publisher?: string
+  department?: string
+}
+
 export interface NewsListResponse {
-  total: number
-  items: NewsItem[]
+  total: number | null
+  total_is_estimate: boolean
+  items: NewsListItem[]
   page: number
   page_size: number
+  next_cursor?: string | null
+  facets?: NewsFacets | null
+}
+
+export interface FacetCount {
+  value: string
+  count: number
+}
+
+export interface NewsFacets {
+  category: FacetCount[]
+  publisher: FacetCount[]
+  department: FacetCount[]
+  source_name: FacetCount[]
 }
 
 export interface CategoryResponse {
@@ -0,0 +1 @@
+"""Offline parse benchmarks for the spiders"""
@@ -0,0 +1,445 @@
+"""
+Fixture corpus for the parse benchmarks
+
+The corpus is a directory of HTML pages plus a manifest.json that says how
+each page is replayed: spider, callback, URL and the request meta the list
+page would have passed along. Two sources fill it:
+
+- generate: deterministic synthetic pages shaped like each WHUT site
+  (homepage, category/list pages, article pages, OA Seeyon tables), so the
+  benchmark runs anywhere without network access
+- record: a live page saved as-is, for checking the parsers against the
+  real markup (needs campus network/VPN for the OA and youth sites)
+
+    python -m benchmarks.corpus generate
+    python -m benchmarks.corpus record whut_news parse_article http://i.whut.edu.cn/xxtg/.../t1.shtml
+
+Recorded pages are not committed; benchmarks/corpus/ is ignored by git.
+"""
+import json
+import os
+import random
+from urllib.parse import urlparse
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS_DIR = os.path.join(BENCHMARK_DIR, 'corpus')
+MANIFEST = 'manifest.json'
+
+_WORDS = (
+    '学校', '学院', '研究生院', '教务处', '科研', '实验室', '学术', '报告', '会议', '通知',
+    '工作', '开展', '组织', '学生', '教师', '团委', '志愿服务', '创新', '创业', '竞赛',
+    '材料', '交通', '航运', '汽车', '国家', '重点', '项目', '建设', '发展', '质量',
+)
+_DEPARTMENTS = ('研究生院', '教务处', '科学技术发展院', '材料学院', '交通与物流工程学院', '党委宣传部')
+
+
+class _Text:
+    """Deterministic filler text"""
+
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+
+    def words(self, count):
+        return ''.join(self.random.choice(_WORDS) for _ in range(count))
+
+    def title(self):
+        return self.words(self.random.randint(6, 12))
+
+    def paragraph(self):
+        return '，'.join(self.words(self.random.randint(4, 9)) for _ in range(self.random.randint(3, 8))) + '。'
+
+    def date(self, day):
+        return f'2025-{1 + day // 28 % 12:02d}-{1 + day % 28:02d}'
+
+    def department(self):
+        return self.random.choice(_DEPARTMENTS)
+
+
+def _page(title, body, scripts=''):
+    return (
+        '<!DOCTYPE html>\n<html><head><meta charset="utf-8">'
+        f'<title>{title}</title></head>\n<body>\n{body}\n{scripts}</body></html>\n'
+    )
+
+
+def _nav(text, links=40):
+    items = ''.join(
+        f'<li><a href="/nav{i}/index.shtml">{text.words(2)}</a></li>' for i in range(links)
+    )
+    return f'<div class="header"><ul class="menu">{items}</ul></div>'
+
+
+def _footer(text):
+    return f'<div class="footer"><p>{text.paragraph()}</p><p>Copyright 武汉理工大学</p></div>'
+
+
+def _article_body(text, paragraphs, images=3):
+    parts = []
+    for i in range(paragraphs):
+        parts.append(f'<p style="text-indent:2em">{text.paragraph()}<span>{text.paragraph()}</span></p>')
+        if i < images:
+            parts.append(f'<p style="text-align:center"><img src="/images/2025/{i}.jpg" alt="{text.words(3)}"></p>')
+    return ''.join(parts)
+
+
+# --- i.whut.edu.cn (whut_news) ---
+
+def _news_homepage(text):
+    headlines = ''.join(
+        f'<div class="swiper-slide"><div class="toutiao"><a href="/xxtg/202501/t2025010{i}_{1000 + i}.shtml">'
+        f'{text.title()}</a></div></div>' for i in range(5)
+    )
+    image_news = ''.join(
+        f'<div class="swiper-slide"><div class="news_box"><a class="news_img_box" href="/zhxw/202501/t20250111_{2000 + i}.shtml">'
+        f'<img src="/img/{i}.jpg"></a><div class="img_text2"><a href="/zhxw/202501/t20250111_{2000 + i}.shtml">'
+        f'<span class="title">{text.title()}</span><span class="date">{text.date(i)}</span></a></div></div></div>'
+        for i in range(6)
+    )
+    tabs = ''.join(
+        '<div class="tab_pane"><ul class="list_t2">' + ''.join(
+            f'<li><a href="/lgzx/202501/t20250112_{3000 + tab * 10 + i}.shtml"><span class="list_text">{text.title()}</span>'
+            f'<span class="date">{text.date(i)}</span></a></li>' for i in range(8)
+        ) + '</ul></div>' for tab in range(3)
+    )
+    notices = ''.join(
+        '<ul class="list_t">' + ''.join(
+            f'<li><a class="list_text" href="/{section}/202501/t20250113_{4000 + i}.shtml" title="{text.title()}">'
+            f'{text.words(4)}</a><span class="date">{text.date(i)}</span></li>' for i in range(10)
+        ) + '</ul>' for section in ('xxtg', 'bmxw', 'xytg', 'lgjz')
+    )
+    body = (
+        _nav(text) + f'<div class="toutiao_box"><div class="swiper-wrapper">{headlines}</div></div>'
+        f'<div class="swiper_box"><div class="swiper-wrapper">{image_news}</div></div>'
+        f'{tabs}{notices}' + _footer(text)
+    )
+    return _page('武汉理工大学', body)
+
+
+def _news_category(text, page=0):
+    side = ''.join(f'<li><a href="/xxtg/dept{i}/">{text.department()}</a></li>' for i in range(12))
+    items = ''.join(
+        f'<li><span class="list_tag"><a href="/xxtg/dept{i % 12}/">{text.department()}</a></span>'
+        f'<a class="list_text" href="./202501/t20250114_{5000 + page * 100 + i}.shtml" title="{text.title()}">'
+        f'{text.words(5)}</a><span class="date">{text.date(i)}</span></li>' for i in range(20)
+    )
+    body = _nav(text) + f'<ul class="side_menu_style3">{side}</ul><ul class="list_t">{items}</ul>' + _footer(text)
+    scripts = f'<script>var countPage = 8;var currentPage = {page};</script>'
+    return _page('学校通知公告', body, scripts)
+
+
+def _news_article(text, container='div.article_content'):
+    tag, cls = container.split('.')
+    title = text.title()
+    date = text.date(3)
+    hidden = (
+        f'<div style="display:none"><span id="NewsArticleTitle">{title}</span>'
+        f'<span id="NewsArticlePubDay">{date}</span><span id="NewsArticleAuthor">{text.words(1)}</span>'
+        f'<span id="NewsArticleSource">{text.department()}</span></div>'
+    )
+    attachments = ''.join(
+        f'<a href="/attach/2025/{i}.pdf">{text.words(3)}.pdf</a>' for i in range(2)
+    )
+    body = (
+        _nav(text) + hidden + f'<h2 class="article_title">{title}</h2>'
+        f'<div class="xl-tie"><p>发布时间：{date}</p><p>来源：{text.department()}</p></div>'
+        f'<span class="date">发布时间：{date}</span>'
+        f'<{tag} class="{cls}">{_article_body(text, 25)}</{tag}>'
+        f'<div class="attachments">{attachments}</div>' + _footer(text)
+    )
+    return _page(title, body)
+
+
+def _news_image_article(text):
+    title = text.title()
+    body = (
+        _nav(text) + f'<h2 class="article_title">{title}</h2><span class="date">{text.date(5)}</span>'
+        f'<div class="article_content"><p><img src="/images/notice.png" alt="{text.words(4)}"></p></div>'
+        + _footer(text)
+    )
+    return _page(title, body)
+
+
+# --- news.whut.edu.cn (whut_news_portal) ---
+
+def _portal_homepage(text):
+    featured = ''.join(
+        f'<li><a href="/zhxw/202501/t20250115_{6000 + i}.shtml">{text.title()}</a></li>' for i in range(20)
+    )
+    body = _nav(text) + f'<div class="bd"><ul>{featured}</ul></div>' + _footer(text)
+    return _page('武汉理工大学新闻经纬', body)
+
+
+def _list_page(text, href, count, page=0, list_class='news_list'):
+    items = ''.join(
+        f'<li><a href="{href.format(i=page * 100 + i)}" title="{text.title()}">{text.words(5)}</a>'
+        f'<span class="date">{text.date(i)}</span></li>' for i in range(count)
+    )
+    body = _nav(text) + f'<ul class="{list_class}">{items}</ul>' + _footer(text)
+    scripts = f'<script>createPageHTML(6, {page}, "index", "shtml");</script>'
+    return _page('列表', body, scripts)
+
+
+def _portal_article(text):
+    title = text.title()
+    body = (
+        _nav(text) + f'<h1>{title}</h1><div class="info"><span>{text.date(7)}</span>'
+        f'<span>作者：{text.words(1)}</span><span>来源：{text.department()}</span></div>'
+        f'<div class="v_news_content">{_article_body(text, 20)}</div>' + _footer(text)
+    )
+    return _page(f'{title}-武汉理工大学新闻经纬', body)
+
+
+# --- zd.whut.edu.cn (whut_regulations) ---
+
+def _regulations_homepage(text):
+    return _page('武汉理工大学规章制度库', _nav(text) + _footer(text))
+
+
+def _regulations_category(text, page=0):
+    rows = ''.join(
+        f'<tr><td>{i + 1}</td><td><a href="./202401/t20240110_{7000 + page * 100 + i}.shtml" '
+        f'title="{text.title()}（校办字〔2024〕{i + 1}号）">{text.words(5)}</a></td>'
+        f'<td>{text.department()}</td><td>{text.date(i)}</td></tr>' for i in range(20)
+    )
+    body = (
+        _nav(text) + f'<table class="list"><tr><th>序号</th><th>名称</th><th>发布单位</th><th>日期</th></tr>{rows}</table>'
+        + _footer(text)
+    )
+    scripts = f'<script>createPageHTML(4, {page}, "index", "shtml");</script>'
+    return _page('行政制度', body, scripts)
+
+
+def _regulation(text, pdf_only=False):
+    title = text.title()
+    content = '' if pdf_only else f'<div class="v_news_content">{_article_body(text, 30, images=0)}</div>'
+    body = (
+        _nav(text) + f'<h1>{title}</h1><div class="info"><span class="date">{text.date(9)}</span>'
+        f'<span>发布单位：{text.department()}</span></div>{content}'
+        f'<div class="article-enclosure"><a href="/attach/{text.random.randint(1, 999)}.docx">附件1</a></div>'
+        + _footer(text)
+    )
+    scripts = '<script>showPdf("/pdf/2024/regulation.pdf");</script>' if pdf_only else ''
+    return _page(title, body, scripts)
+
+
+# --- youth.whut.edu.cn (whut_youth) ---
+
+def _youth_homepage(text):
+    nav = ''.join(
+        f'<a href="/{code}/">{text.words(2)}</a>' for code in ('tzgg', 'txdt', 'qnxx', 'zyfw', 'shsj', 'cxcy')
+    )
+    news = ''.join(
+        f'<li><a href="/txdt/202501/t20250116_{8000 + i}.shtml" title="{text.title()}">{text.words(4)}</a>'
+        f'<span class="date">{text.date(i)}</span></li>' for i in range(15)
+    )
+    body = f'<div class="nav">{nav}</div><div class="news-list"><ul>{news}</ul></div>' + _footer(text)
+    return _page('共青团武汉理工大学委员会', body)
+
+
+def _youth_article(text):
+    title = text.title()
+    body = (
+        _nav(text) + f'<div class="title">{title}</div><div class="info"><span class="date">{text.date(11)}</span>'
+        f'<span>撰稿：{text.words(1)}</span><span>来源：{text.department()}</span></div>'
+        f'<div class="article-content">{_article_body(text, 15)}</div>' + _footer(text)
+    )
+    return _page(title, body)
+
+
+# --- oapub.whut.edu.cn (whut_oa_documents) ---
+
+def _oa_list(text, page=1):
+    rows = ''.join(
+        f'<tr><td class="t_icon"><img src="/seeyon-pub/icon.gif"></td>'
+        f'<td nowrap><a href="JavaScript:OpenNewWindow(\'-{900000 + page * 100 + i}\')">'
+        f'{text.title()}（校办字〔2025〕{i + 1}号）</a></td><td>{text.department()}</td><td>{i + 1}</td>'
+        f'<td>{text.date(i)}</td></tr>' for i in range(20)
+    )
+    pager = ''.join(f'<a href="xzwj_list?page={n}">{n}</a>' for n in range(1, 8))
+    body = (
+        f'<table class="list"><tr class="Head"><td></td><td>标题</td><td>拟文单位</td><td>序号</td><td>发布时间</td></tr>'
+        f'{rows}</table><div class="page">{pager}</div>'
+    )
+    return _page('行政文件', body)
+
+
+def _oa_document(text):
+    title = text.title()
+    body = (
+        '<table class="detail">'
+        f'<tr class="bgcolor"><td>标　题</td><td>{title}</td></tr>'
+        f'<tr class="bgcolor"><td>分类</td><td>行政文件</td><td>拟文人</td><td>{text.words(1)}</td></tr>'
+        f'<tr class="bgcolor"><td>发布时间</td><td>{text.date(13)}</td><td>拟文单位</td><td>{text.department()}</td></tr>'
+        f'<tr class="bgcolor"><td>附件</td><td><a href="/seeyon-pub/file/file?id=-{text.random.randint(1, 99999)}">正文.pdf</a>'
+        f'<a href="/seeyon-pub/upload/{text.random.randint(1, 999)}.docx" download="附件.docx">附件.docx</a></td></tr>'
+        '</table>'
+    )
+    return _page(f'学校文件:{title}', body)
+
+
+def _cases():
+    """(file, spider, callback, url, meta, page builder) for the synthetic corpus"""
+    news_meta = {'title': '【研究生院】关于开展研究生学术交流活动的通知', 'date_str': '2025-01-14', 'category': '学校通知公告'}
+    portal_meta = {'title': '学校召开2025年工作会议', 'date_str': '2025-01-15', 'category': '综合新闻'}
+    regulation_meta = {'title': '武汉理工大学研究生管理规定（校办字〔2024〕3号）', 'date_str': '2024-01-10', 'category': '行政制度'}
+    youth_meta = {'title': '校团委开展青年志愿服务活动', 'date_str': None, 'category': '团学动态'}
+    oa_meta = {'title': '关于做好2025年寒假工作的通知', 'doc_id': '-900001', 'date_str': None,
+               'department': None, 'category': '行政文件'}
+
+    return [
+        ('whut_news/homepage.html', 'whut_news', 'parse', 'http://i.whut.edu.cn/', {}, _news_homepage),
+        ('whut_news/category.html', 'whut_news', 'parse_category', 'http://i.whut.edu.cn/xxtg/', {},
+         _news_category),
+        ('whut_news/category_3.html', 'whut_news', 'parse_category', 'http://i.whut.edu.cn/xxtg/index_3.shtml', {},
+         lambda text: _news_category(text, page=3)),
+        ('whut_news/article.html', 'whut_news', 'parse_article',
+         'http://i.whut.edu.cn/xxtg/202501/t20250114_5001.shtml', news_meta, _news_article),
+        ('whut_news/article_trs.html', 'whut_news', 'parse_article',
+         'http://i.whut.edu.cn/bmxw/202501/t20250114_5002.shtml', news_meta,
+         lambda text: _news_article(text, 'div.TRS_Editor')),
+        ('whut_news/article_image.html', 'whut_news', 'parse_article',
+         'http://i.whut.edu.cn/xxtg/202501/t20250114_5003.shtml', news_meta, _news_image_article),
+
+        ('whut_news_portal/homepage.html', 'whut_news_portal', 'parse', 'https://news.whut.edu.cn/', {},
+         _portal_homepage),
+        ('whut_news_portal/category.html', 'whut_news_portal', 'parse_category_page', 'https://news.whut.edu.cn/zhxw/',
+         {'category': '综合新闻', 'cat_code': 'zhxw', 'page': 1},
+         lambda text: _list_page(text, './202501/t20250115_{i}.shtml', 20)),
+        ('whut_news_portal/article.html', 'whut_news_portal', 'parse_article',
+         'https://news.whut.edu.cn/zhxw/202501/t20250115_6001.shtml', portal_meta, _portal_article),
+
+        ('whut_regulations/homepage.html', 'whut_regulations', 'parse', 'https://zd.whut.edu.cn/', {},
+         _regulations_homepage),
+        ('whut_regulations/category.html', 'whut_regulations', 'parse_category_page', 'https://zd.whut.edu.cn/xzzd/',
+         {'category': '行政制度', 'cat_code': 'xzzd', 'page': 0}, _regulations_category),
+        ('whut_regulations/regulation.html', 'whut_regulations', 'parse_regulation',
+         'https://zd.whut.edu.cn/xzzd/202401/t20240110_7001.shtml', regulation_meta, _regulation),
+        ('whut_regulations/regulation_pdf.html', 'whut_regulations', 'parse_regulation',
+         'https://zd.whut.edu.cn/xzzd/202401/t20240110_7002.shtml', regulation_meta,
+         lambda text: _regulation(text, pdf_only=True)),
+
+        ('whut_youth/homepage.html', 'whut_youth', 'parse', 'http://youth.whut.edu.cn/', {}, _youth_homepage),
+        ('whut_youth/category.html', 'whut_youth', 'parse_category_page', 'http://youth.whut.edu.cn/txdt/',
+         {'category': '团学动态', 'cat_code': 'txdt', 'page': 0},
+         lambda text: _list_page(text, './202501/t20250116_{i}.shtml', 20, list_class='normal_list')),
+        ('whut_youth/article.html', 'whut_youth', 'parse_article',
+         'http://youth.whut.edu.cn/txdt/202501/t20250116_8001.shtml', youth_meta, _youth_article),
+
+        ('whut_oa_documents/list.html', 'whut_oa_documents', 'parse',
+         'http://oapub.whut.edu.cn:8080/seeyon-pub/article/xzwj_list', {}, _oa_list),
+        ('whut_oa_documents/document.html', 'whut_oa_documents', 'parse_document',
+         'http://oapub.whut.edu.cn:8080/seeyon-pub/article/xzwj_detail?id=-900001', oa_meta, _oa_document),
+    ]
+
+
+def load_manifest(corpus_dir=DEFAULT_CORPUS_DIR):
+    path = os.path.join(corpus_dir, MANIFEST)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(cases, corpus_dir=DEFAULT_CORPUS_DIR):
+    with open(os.path.join(corpus_dir, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(cases, f, ensure_ascii=False, indent=2)
+
+
+def _add_case(cases, case):
+    """Replace the manifest entry for the same file, else append"""
+    cases[:] = [existing for existing in cases if existing['file'] != case['file']]
+    cases.append(case)
+
+
+def _write(corpus_dir, file, body):
+    path = os.path.join(corpus_dir, file)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(body)
+
+
+def generate(corpus_dir=DEFAULT_CORPUS_DIR, seed=2025):
+    """
+    Write the synthetic pages and their manifest entries
+
+    Pages are the same for the same seed, so timings and extraction output
+    stay comparable across runs. Recorded entries already in the manifest
+    are kept.
+
+    Returns:
+        Number of pages written
+    """
+    cases = load_manifest(corpus_dir)
+    generated = _cases()
+    for index, (file, spider, callback, url, meta, build) in enumerate(generated):
+        _write(corpus_dir, file, build(_Text(seed + index)).encode('utf-8'))
+        _add_case(cases, {
+            'file': file,
+            'spider': spider,
+            'callback': callback,
+            'url': url,
+            'meta': meta,
+            'source': 'generated',
+        })
+    save_manifest(cases, corpus_dir)
+    return len(generated)
+
+
+def record(spider, callback, url, meta=None, corpus_dir=DEFAULT_CORPUS_DIR, timeout=30):
+    """
+    Fetch a live page into the corpus
+
+    Returns:
+        The manifest entry
+    """
+    import httpx
+
+    response = httpx.get(url, timeout=timeout, follow_redirects=True, verify=False)
+    response.raise_for_status()
+
+    path = urlparse(url)
+    name = (path.path.strip('/').replace('/', '_') or 'index') + (f'_{path.query}' if path.query else '')
+    file = f'{spider}/recorded/{name}'
+    if not file.endswith(('.html', '.shtml', '.htm')):
+        file += '.html'
+
+    _write(corpus_dir, file, response.content)
+    case = {
+        'file': file,
+        'spider': spider,
+        'callback': callback,
+        'url': url,
+        'meta': meta or {},
+        'source': 'recorded',
+        'encoding': response.encoding,
+    }
+    cases = load_manifest(corpus_dir)
+    _add_case(cases, case)
+    save_manifest(cases, corpus_dir)
+    return case
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build the parse benchmark corpus')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS_DIR, help='Corpus directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate_parser = commands.add_parser('generate', help='Write the synthetic pages')
+    generate_parser.add_argument('--seed', type=int, default=2025)
+
+    record_parser = commands.add_parser('record', help='Save a live page')
+    record_parser.add_argument('spider', help='Spider name, e.g. whut_news')
+    record_parser.add_argument('callback', help='Spider callback the page is replayed through, e.g. parse_article')
+    record_parser.add_argument('url')
+    record_parser.add_argument('--meta', default='{}', help='Request meta as JSON, e.g. \'{"category": "行政文件"}\'')
+
+    args = parser.parse_args()
+    os.makedirs(args.corpus, exist_ok=True)
+    if args.command == 'generate':
+        count = generate(args.corpus, args.seed)
+        print(f'Wrote {count} pages to {args.corpus}')
+    else:
+        case = record(args.spider, args.callback, args.url, json.loads(args.meta), args.corpus)
+        print(f'Recorded {args.url} as {case["file"]}')
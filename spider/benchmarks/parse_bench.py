@@ -0,0 +1,295 @@
+"""
+Offline parse benchmark for the WHUT spiders
+
+Replays every page of the corpus (see benchmarks.corpus) through the spider
+callback named in its manifest entry, with no network, scheduler or
+pipelines involved, and reports per spider callback:
+
+- pages/s and items/s (best of --rounds, each replaying --repeat times)
+- requests yielded per page
+- peak traced memory per page (tracemalloc, on a separate untimed pass)
+
+Callbacks of spiders with an ARTICLE_EXTRACTOR are run once per extraction
+engine, and the lxml output is diffed against the selector output.
+--save writes timings and the extracted items/requests to a JSON file;
+--baseline compares a later run with it, so parser changes show up both
+as a speed ratio and as field-level extraction diffs. The exit status is 1
+when there are diffs.
+
+Run from the spider directory:
+
+    python -m benchmarks.corpus generate
+    python -m benchmarks.parse_bench --save before.json
+    python -m benchmarks.parse_bench --baseline before.json
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict
+
+from benchmarks.corpus import DEFAULT_CORPUS_DIR, load_manifest
+
+SPIDER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_responses(cases, corpus_dir):
+    """HtmlResponse per manifest entry, with the entry's meta on its request"""
+    from scrapy.http import HtmlResponse, Request
+
+    responses = []
+    for case in cases:
+        with open(os.path.join(corpus_dir, case['file']), 'rb') as f:
+            body = f.read()
+        request = Request(case['url'], meta=dict(case.get('meta') or {}))
+        responses.append(HtmlResponse(
+            url=case['url'],
+            body=body,
+            encoding=case.get('encoding') or 'utf-8',
+            request=request,
+        ))
+    return responses
+
+
+def load_spiders(names):
+    """Spider instance per name, created like 'scrapy crawl' would (minus the crawler)"""
+    from scrapy.spiderloader import SpiderLoader
+    from scrapy.utils.project import get_project_settings
+
+    loader = SpiderLoader.from_settings(get_project_settings())
+    return {name: loader.load(name)() for name in names}
+
+
+def replay(spider, callback, response):
+    """
+    Run one callback on one response
+
+    Returns:
+        (items as dicts, (url, callback name) of the requests yielded)
+    """
+    from scrapy import Request
+
+    # visited_urls is class-level; a fresh set keeps every replay identical
+    spider.visited_urls = set()
+    items, requests = [], []
+    for result in getattr(spider, callback)(response) or ():
+        if isinstance(result, Request):
+            requests.append((result.url, getattr(result.callback, '__name__', None)))
+        else:
+            items.append(dict(result))
+    return items, requests
+
+
+def _variants(spider, callback):
+    """Extraction engines to run a callback with (None when it has no choice)"""
+    from whut_spider.extraction import ENGINES
+
+    if callback == 'parse_article' and getattr(spider, 'ARTICLE_EXTRACTOR', None) is not None:
+        return ENGINES
+    return (None,)
+
+
+def _label(spider_name, callback, engine):
+    label = f'{spider_name}.{callback}'
+    return f'{label}[{engine}]' if engine else label
+
+
+def run(cases, corpus_dir, repeat=20, rounds=3, measure_memory=True):
+    """
+    Benchmark every spider callback in the corpus
+
+    Returns:
+        (rows, outputs): one row dict per spider callback (and engine) with
+        pages, items, requests, seconds_per_page, pages_per_second,
+        items_per_second and peak_kib_per_page; outputs maps
+        '<label> <file>' to that page's items and requests
+    """
+    spiders = load_spiders(sorted({case['spider'] for case in cases}))
+    responses = load_responses(cases, corpus_dir)
+
+    groups = OrderedDict()
+    for case, response in zip(cases, responses):
+        spider = spiders[case['spider']]
+        for engine in _variants(spider, case['callback']):
+            key = (case['spider'], case['callback'], engine)
+            groups.setdefault(key, []).append((case, response))
+
+    rows = []
+    outputs = {}
+    for (spider_name, callback, engine), pages in groups.items():
+        spider = spiders[spider_name]
+        default_engine = spider.extraction_engine
+        if engine:
+            spider.extraction_engine = engine
+        label = _label(spider_name, callback, engine)
+
+        try:
+            item_count = request_count = 0
+            for case, response in pages:
+                items, requests = replay(spider, callback, response)
+                outputs[f'{label} {case["file"]}'] = {'items': items, 'requests': requests}
+                item_count += len(items)
+                request_count += len(requests)
+
+            best = None
+            for _ in range(rounds):
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    for case, response in pages:
+                        replay(spider, callback, response)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            seconds_per_page = best / (repeat * len(pages))
+
+            peak_kib = None
+            if measure_memory:
+                peaks = []
+                tracemalloc.start()
+                try:
+                    for case, response in pages:
+                        tracemalloc.reset_peak()
+                        baseline, _ = tracemalloc.get_traced_memory()
+                        replay(spider, callback, response)
+                        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+                finally:
+                    tracemalloc.stop()
+                peak_kib = sum(peaks) / len(peaks) / 1024
+        finally:
+            spider.extraction_engine = default_engine
+
+        rows.append({
+            'label': label,
+            'spider': spider_name,
+            'callback': callback,
+            'engine': engine,
+            'pages': len(pages),
+            'items': item_count,
+            'requests': request_count,
+            'seconds_per_page': seconds_per_page,
+            'pages_per_second': 1 / seconds_per_page if seconds_per_page else None,
+            'items_per_second': item_count / len(pages) / seconds_per_page if seconds_per_page else None,
+            'peak_kib_per_page': peak_kib,
+        })
+
+    return rows, outputs
+
+
+def diff_outputs(expected, actual):
+    """
+    Field-level differences between two outputs dicts from run()
+
+    Returns:
+        List of (key, what, expected value, actual value)
+    """
+    diffs = []
+    for key in sorted(set(expected) | set(actual)):
+        if key not in expected or key not in actual:
+            diffs.append((key, 'page', key in expected, key in actual))
+            continue
+        old, new = expected[key], actual[key]
+        if len(old['items']) != len(new['items']):
+            diffs.append((key, 'item count', len(old['items']), len(new['items'])))
+        for index, (old_item, new_item) in enumerate(zip(old['items'], new['items'])):
+            for field in sorted(set(old_item) | set(new_item)):
+                if old_item.get(field) != new_item.get(field):
+                    diffs.append((key, f'items[{index}].{field}', old_item.get(field), new_item.get(field)))
+        old_requests = [list(r) for r in old['requests']]
+        new_requests = [list(r) for r in new['requests']]
+        if old_requests != new_requests:
+            diffs.append((key, 'requests', len(old_requests), len(new_requests)))
+    return diffs
+
+
+def engine_diffs(outputs):
+    """Differences of the lxml engine against the selector engine on the same pages"""
+    reference = {}
+    candidate = {}
+    for key, output in outputs.items():
+        label, file = key.split(' ', 1)
+        if label.endswith('[selectors]'):
+            reference[f'{label[:-len("[selectors]")]} {file}'] = output
+        elif label.endswith('[lxml]'):
+            candidate[f'{label[:-len("[lxml]")]} {file}'] = output
+    return diff_outputs(reference, candidate)
+
+
+def _json_ready(outputs):
+    # Round-trip so tuples compare equal to a loaded baseline's lists
+    return json.loads(json.dumps(outputs, ensure_ascii=False))
+
+
+def _print_rows(rows, baseline_rows=None):
+    baseline_rows = {row['label']: row for row in baseline_rows or []}
+    print(f'{"callback":<44} {"pages":>5} {"ms/page":>8} {"pages/s":>8} {"items/s":>8} '
+          f'{"req/page":>8} {"KiB/page":>9} {"vs base":>8}')
+    for row in rows:
+        base = baseline_rows.get(row['label'])
+        ratio = f'{base["seconds_per_page"] / row["seconds_per_page"]:.2f}x' if base else ''
+        peak = f'{row["peak_kib_per_page"]:.0f}' if row['peak_kib_per_page'] is not None else '-'
+        print(f'{row["label"]:<44} {row["pages"]:>5} {row["seconds_per_page"] * 1000:>8.2f} '
+              f'{row["pages_per_second"]:>8.0f} {row["items_per_second"]:>8.0f} '
+              f'{row["requests"] / row["pages"]:>8.1f} {peak:>9} {ratio:>8}')
+
+
+def _print_diffs(title, diffs, limit=50):
+    if not diffs:
+        return
+    print(f'\n{title}: {len(diffs)}')
+    for key, what, old, new in diffs[:limit]:
+        print(f'  {key} {what}: {old!r} != {new!r}')
+    if len(diffs) > limit:
+        print(f'  ... {len(diffs) - limit} more')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay recorded pages through the spider callbacks offline')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS_DIR, help='Corpus directory')
+    parser.add_argument('--spider', action='append', help='Only this spider (repeatable)')
+    parser.add_argument('--repeat', type=int, default=20, help='Replays of every page per round')
+    parser.add_argument('--rounds', type=int, default=3, help='Timing rounds; the best one is reported')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc pass')
+    parser.add_argument('--save', help='Write timings and extraction output to this JSON file')
+    parser.add_argument('--baseline', help='Compare with a file written by --save')
+    args = parser.parse_args(argv)
+
+    os.chdir(SPIDER_DIR)
+    os.environ.setdefault('SCRAPY_SETTINGS_MODULE', 'whut_spider.settings')
+    logging.basicConfig(level=logging.ERROR)
+
+    cases = load_manifest(args.corpus)
+    if args.spider:
+        cases = [case for case in cases if case['spider'] in args.spider]
+    if not cases:
+        parser.error(f'No pages in {args.corpus}; run "python -m benchmarks.corpus generate" first')
+
+    rows, outputs = run(cases, args.corpus, args.repeat, args.rounds, not args.no_memory)
+    outputs = _json_ready(outputs)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    _print_rows(rows, baseline['rows'] if baseline else None)
+
+    diffs = engine_diffs(outputs)
+    _print_diffs('Extraction engine diffs (selectors != lxml)', diffs)
+    if baseline:
+        spiders = {case['spider'] for case in cases}
+        expected = {key: output for key, output in baseline['outputs'].items() if key.split('.', 1)[0] in spiders}
+        baseline_diffs = diff_outputs(expected, outputs)
+        _print_diffs('Diffs against baseline', baseline_diffs)
+        diffs += baseline_diffs
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'rows': rows, 'outputs': outputs}, f, ensure_ascii=False, indent=2)
+
+    return 1 if diffs else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+In-process spider execution for Celery tasks
+
+Each crawl runs in a child process forked from the Celery worker (billiard,
+so it also works inside daemonic pool processes). The child starts a fresh
+Twisted reactor, runs one or more spiders concurrently in a single
+CrawlerProcess and sends their stats back over a pipe, so a run costs a
+fork instead of a new interpreter plus Scrapy import, and the results come
+from crawler.stats instead of scraped log output.
+
+A reactor cannot be restarted once stopped, which is why it lives in the
+child: the worker process itself never imports or installs one.
+"""
+import logging
+import os
+import traceback
+from datetime import datetime
+from billiard import Pipe, Process
+
+logger = logging.getLogger(__name__)
+
+SPIDER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Extra seconds granted after CLOSESPIDER_TIMEOUT for spiders to close
+# (pipeline flush) before the child is killed
+SHUTDOWN_GRACE_SECONDS = 60
+
+
+class CrawlTimeout(Exception):
+    """The crawl process did not finish in time and was killed"""
+
+
+class CrawlFailed(Exception):
+    """The crawl process raised or exited without reporting results"""
+
+
+def _json_safe(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (int, float, str, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def _crawl_result(name, crawler):
+    stats = crawler.stats.get_stats()
+    return {
+        'spider': name,
+        'finish_reason': stats.get('finish_reason'),
+        'items_scraped': stats.get('item_scraped_count', 0),
+        'items_dropped': stats.get('item_dropped_count', 0),
+        'requests': stats.get('downloader/request_count', 0),
+        'errors': stats.get('log_count/ERROR', 0),
+        'duration_seconds': stats.get('elapsed_time_seconds'),
+        'stats': {key: _json_safe(value) for key, value in stats.items()},
+    }
+
+
+def _run_in_child(jobs, settings_overrides, conn):
+    """Child process body: run every job in one reactor and report the stats"""
+    try:
+        os.chdir(SPIDER_DIR)
+        os.environ.setdefault('SCRAPY_SETTINGS_MODULE', 'whut_spider.settings')
+
+        from scrapy.crawler import CrawlerProcess
+        from scrapy.utils.project import get_project_settings
+
+        settings = get_project_settings()
+        settings.setdict(settings_overrides, priority='cmdline')
+
+        process = CrawlerProcess(settings)
+        crawlers = []
+        for name, spider_kwargs in jobs:
+            crawler = process.create_crawler(name)
+            process.crawl(crawler, **spider_kwargs)
+            crawlers.append((name, crawler))
+
+        process.start()
+        conn.send({'results': [_crawl_result(name, crawler) for name, crawler in crawlers]})
+    except Exception:
+        conn.send({'error': traceback.format_exc()})
+    finally:
+        conn.close()
+
+
+def run_spiders(jobs, timeout=600, settings=None):
+    """
+    Run spiders concurrently in a forked crawl process
+
+    Args:
+        jobs: Iterable of spider names or (spider name, spider kwargs) pairs
+        timeout: Seconds after which the spiders are closed
+            (CLOSESPIDER_TIMEOUT); the process is killed if it has not
+            exited SHUTDOWN_GRACE_SECONDS later
+        settings: Extra Scrapy settings for this run
+
+    Returns:
+        One result dict per job: spider, finish_reason, items_scraped,
+        items_dropped, requests, errors, duration_seconds and the full stats
+    """
+    jobs = [(job, {}) if isinstance(job, str) else (job[0], dict(job[1])) for job in jobs]
+    overrides = {'CLOSESPIDER_TIMEOUT': timeout}
+    overrides.update(settings or {})
+
+    parent_conn, child_conn = Pipe(duplex=False)
+    process = Process(target=_run_in_child, args=(jobs, overrides, child_conn))
+    process.start()
+    child_conn.close()
+
+    try:
+        if not parent_conn.poll(timeout + SHUTDOWN_GRACE_SECONDS):
+            raise CrawlTimeout(f"Crawl of {[name for name, _ in jobs]} did not finish in {timeout}s")
+        message = parent_conn.recv()
+    except EOFError:
+        message = {'error': f'Crawl process exited with code {process.exitcode} without results'}
+    finally:
+        parent_conn.close()
+        process.join(10)
+        if process.is_alive():
+            logger.warning(f"Killing crawl process {process.pid}")
+            process.terminate()
+            process.join(10)
+
+    if 'error' in message:
+        raise CrawlFailed(message['error'])
+    return message['results']
@@ -6,14 +6,18 @@ source venv/bin/activate
 
 echo "Starting Celery services..."
 
-# Start Celery worker
-celery -A tasks worker --loglevel=info --detach --logfile=/tmp/celery_worker.log --pidfile=/tmp/celery_worker.pid
+# Start Celery worker (crawls, matching, digests: the default queue)
+celery -A tasks worker -n default@%h --loglevel=info --detach --logfile=/tmp/celery_worker.log --pidfile=/tmp/celery_worker.pid
+
+# Start Celery worker for the notification email queue (see task_routes in tasks.py)
+celery -A tasks worker -Q email -n email@%h --concurrency=2 --loglevel=info --detach --logfile=/tmp/celery_email_worker.log --pidfile=/tmp/celery_email_worker.pid
 
 # Start Celery beat scheduler
 celery -A tasks beat --loglevel=info --detach --logfile=/tmp/celery_beat.log --pidfile=/tmp/celery_beat.pid
 
 echo "Celery services started!"
 echo "Worker log: /tmp/celery_worker.log"
+echo "Email worker log: /tmp/celery_email_worker.log"
 echo "Beat log: /tmp/celery_beat.log"
 echo ""
 echo "Check status with: ./status_celery.sh"
@@ -5,13 +5,21 @@ echo "=== Celery Services Status ==="
 echo ""
 
 # Check worker
-if pgrep -f "celery.*worker" > /dev/null; then
-    worker_count=$(pgrep -f "celery.*worker" | wc -l)
+if pgrep -f "celery.*worker.*-n default@" > /dev/null; then
+    worker_count=$(pgrep -f "celery.*worker.*-n default@" | wc -l)
     echo "✓ Celery Worker: RUNNING ($worker_count processes)"
 else
     echo "✗ Celery Worker: STOPPED"
 fi
 
+# Check email worker (sends queued notifications)
+if pgrep -f "celery.*worker.*-Q email" > /dev/null; then
+    worker_count=$(pgrep -f "celery.*worker.*-Q email" | wc -l)
+    echo "✓ Celery Email Worker: RUNNING ($worker_count processes)"
+else
+    echo "✗ Celery Email Worker: STOPPED (notification emails stay pending)"
+fi
+
 # Check beat
 if pgrep -f "celery.*beat" > /dev/null; then
     echo "✓ Celery Beat: RUNNING"
@@ -34,6 +42,14 @@ else
     echo "Log file not found"
 fi
 
+echo ""
+echo "=== Recent Email Worker Log (last 10 lines) ==="
+if [ -f /tmp/celery_email_worker.log ]; then
+    tail -10 /tmp/celery_email_worker.log
+else
+    echo "Log file not found"
+fi
+
 echo ""
 echo "=== Recent Beat Log (last 10 lines) ==="
 if [ -f /tmp/celery_beat.log ]; then
@@ -14,6 +14,17 @@ else
     echo "Celery worker stopped (fallback method)"
 fi
 
+# Stop email worker
+if [ -f /tmp/celery_email_worker.pid ]; then
+    kill $(cat /tmp/celery_email_worker.pid) 2>/dev/null
+    rm /tmp/celery_email_worker.pid
+    echo "Celery email worker stopped"
+else
+    # Fallback: kill by name
+    pkill -f "celery.*worker.*-Q email"
+    echo "Celery email worker stopped (fallback method)"
+fi
+
 # Stop beat
 if [ -f /tmp/celery_beat.pid ]; then
     kill $(cat /tmp/celery_beat.pid) 2>/dev/null
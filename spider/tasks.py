@@ -3,10 +3,13 @@ Celery tasks for periodic spider execution
 """
 from celery import Celery
 from celery.schedules import crontab
-import subprocess
+from celery.signals import worker_process_init
 import os
 import logging
-from datetime import datetime
+import time
+import uuid
+from datetime import datetime, timezone
+import redis
 import requests
 
 logger = logging.getLogger(__name__)
@@ -24,73 +27,186 @@ app.conf.update(
     enable_utc=True,
     task_track_started=True,
     result_expires=3600,
+    # Email sending runs on its own queue so SMTP latency never delays matching
+    task_routes={
+        'tasks.send_pending_notifications': {'queue': 'email'},
+        'tasks.send_daily_digest': {'queue': 'email'},
+        'tasks.send_weekly_digest': {'queue': 'email'},
+    },
 )
 
+# Minutes between crawls of each spider. crawl_due_spiders runs every
+# spider that is due in one crawl process: spiders on different hosts
+# download in parallel and HOST_BUDGETS (settings.py) keeps spiders sharing
+# a host within its rate, so a cycle takes about as long as its slowest host
+SPIDER_INTERVALS = {
+    'whut_news': 60,
+    'whut_news_portal': 120,
+    'whut_youth': 180,
+    'whut_oa_documents': 360,
+    'whut_regulations': 1440,
+    'whut_weekly_meeting': 1440,
+}
+CRAWL_CHECK_MINUTES = 10  # How often crawl_due_spiders looks for due spiders
+CRAWL_TIMEOUT = 600  # Seconds before a crawl cycle's spiders are closed
+FULL_CRAWL_TIMEOUT = 1800
+
 # Periodic task schedule
 app.conf.beat_schedule = {
-    'crawl-whut-news-every-hour': {
-        'task': 'tasks.crawl_whut_news',
-        'schedule': crontab(minute=0),  # Run every hour at minute 0
-        # 'schedule': 300.0,  # Uncomment for testing: every 5 minutes
+    'crawl-due-spiders': {
+        'task': 'tasks.crawl_due_spiders',
+        'schedule': crontab(minute=f'*/{CRAWL_CHECK_MINUTES}'),
+    },
+    # Regular runs stop paginating at known articles; backfill everything daily
+    'crawl-all-spiders-full-daily': {
+        'task': 'tasks.crawl_spiders',
+        'schedule': crontab(hour=3, minute=30),
+        'kwargs': {
+            'spider_names': list(SPIDER_INTERVALS),
+            'full_crawl': True,
+            'timeout': FULL_CRAWL_TIMEOUT,
+        },
+    },
+    'flush-view-counts-every-minute': {
+        'task': 'tasks.flush_view_counts',
+        'schedule': 60.0,
+    },
+    'send-daily-digest': {
+        'task': 'tasks.send_daily_digest',
+        'schedule': crontab(hour=8, minute=0),  # Every day at 8 AM
+    },
+    'send-weekly-digest': {
+        'task': 'tasks.send_weekly_digest',
+        'schedule': crontab(hour=8, minute=0, day_of_week=1),  # Mondays at 8 AM
+    },
+    # Picks up notification retries whose backoff has elapsed
+    'send-pending-notifications-every-30s': {
+        'task': 'tasks.send_pending_notifications',
+        'schedule': 30.0,
     },
 }
 
-@app.task(bind=True, name='tasks.crawl_whut_news')
-def crawl_whut_news(self):
-    """
-    Run the WHUT news spider
-    """
+# Spider name -> unix time of its last crawl start, for crawl_due_spiders
+CRAWL_LAST_STARTED_KEY = 'crawl:last_started'
+# Held while a crawl runs, so cycles never overlap
+CRAWL_LOCK_KEY = 'crawl:lock'
+# A full crawl that finds the lock held waits for it instead of being skipped
+CRAWL_LOCK_RETRY_SECONDS = 60
+
+
+def _crawl(task, spider_names, full_crawl, timeout=CRAWL_TIMEOUT):
+    """Run spiders concurrently through crawl_runner and summarize their stats"""
+    from crawl_runner import SHUTDOWN_GRACE_SECONDS, CrawlTimeout, run_spiders
+
+    mode = 'full' if full_crawl else 'incremental'
+    lock_token = str(uuid.uuid4())
+    if not redis_client.set(CRAWL_LOCK_KEY, lock_token, nx=True, ex=timeout + SHUTDOWN_GRACE_SECONDS + 60):
+        if full_crawl:
+            # The backfill only runs once a day; retry until the running
+            # cycle releases the lock (at most a full crawl's lock expiry)
+            logger.info(f"Another crawl is running, retrying full crawl in {CRAWL_LOCK_RETRY_SECONDS}s")
+            max_wait = FULL_CRAWL_TIMEOUT + SHUTDOWN_GRACE_SECONDS + 60
+            raise task.retry(countdown=CRAWL_LOCK_RETRY_SECONDS, max_retries=max_wait // CRAWL_LOCK_RETRY_SECONDS + 1)
+
+        logger.info(f"Another crawl is running, skipping {mode} crawl of {', '.join(spider_names)}")
+        return {
+            'status': 'skipped',
+            'reason': 'crawl already running',
+            'timestamp': datetime.now().isoformat()
+        }
+
     try:
-        logger.info(f"Starting news scraping task at {datetime.now()}")
+        logger.info(f"Starting {mode} crawl of {', '.join(spider_names)} at {datetime.now()}")
         start_time = datetime.now()
+        redis_client.hset(CRAWL_LAST_STARTED_KEY, mapping={name: time.time() for name in spider_names})
 
-        # Determine working directory
-        spider_dir = os.path.dirname(os.path.abspath(__file__))
-
-        result = subprocess.run(
-            ['scrapy', 'crawl', 'whut_news', '-L', 'INFO'],
-            cwd=spider_dir,
-            capture_output=True,
-            text=True,
-            timeout=600  # 10 minutes timeout
+        spider_kwargs = {'full_crawl': '1'} if full_crawl else {}
+        results = run_spiders(
+            [(name, spider_kwargs) for name in spider_names],
+            timeout=timeout
         )
 
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
 
-        # Parse output for statistics
-        stdout = result.stdout
-        scraped_count = 0
-        if 'item_scraped_count' in stdout:
-            import re
-            match = re.search(r"'item_scraped_count': (\d+)", stdout)
-            if match:
-                scraped_count = int(match.group(1))
-
-        success = result.returncode == 0
-        logger.info(f"Scraping {'completed' if success else 'failed'}: {scraped_count} items in {duration:.1f}s")
+        scraped_count = sum(result['items_scraped'] for result in results)
+        spider_seconds = sum(result['duration_seconds'] or 0 for result in results)
+        success = all(result['finish_reason'] == 'finished' for result in results)
+        logger.info(
+            f"Scraping {'completed' if success else 'ended early'}: {scraped_count} items in {duration:.1f}s "
+            f"({spider_seconds:.1f}s of spider time)"
+        )
 
         return {
-            'status': 'success' if success else 'failed',
+            'status': 'success' if success else 'partial',
             'timestamp': end_time.isoformat(),
             'duration_seconds': duration,
+            'spider_seconds': spider_seconds,
             'items_scraped': scraped_count,
-            'returncode': result.returncode,
-            'stdout_tail': result.stdout[-500:],  # Last 500 chars
-            'stderr': result.stderr[-500:] if result.stderr else None
+            'spiders': results,
         }
 
-    except subprocess.TimeoutExpired:
-        logger.error("Spider execution timed out")
+    except CrawlTimeout as e:
+        logger.error(f"Spider execution timed out: {str(e)}")
         return {
             'status': 'timeout',
-            'error': 'Spider execution timed out after 10 minutes',
+            'error': str(e),
             'timestamp': datetime.now().isoformat()
         }
     except Exception as e:
         logger.error(f"Error during scraping: {str(e)}")
         # Retry with exponential backoff
-        raise self.retry(exc=e, countdown=300, max_retries=3)
+        raise task.retry(exc=e, countdown=300, max_retries=3)
+    finally:
+        if redis_client.get(CRAWL_LOCK_KEY) == lock_token:
+            redis_client.delete(CRAWL_LOCK_KEY)
+
+
+@app.task(bind=True, name='tasks.crawl_whut_news')
+def crawl_whut_news(self, full_crawl=False):
+    """
+    Run the WHUT news spider
+
+    Args:
+        full_crawl: Ignore the seen-URL store and walk every list page up to
+            the page limit (periodic backfill) instead of stopping early
+    """
+    return _crawl(self, ['whut_news'], full_crawl)
+
+
+@app.task(bind=True, name='tasks.crawl_spiders')
+def crawl_spiders(self, spider_names, full_crawl=False, timeout=CRAWL_TIMEOUT):
+    """
+    Run several spiders concurrently in one crawl process
+
+    Args:
+        spider_names: Names of the spiders to run
+        full_crawl: Same as for crawl_whut_news, applied to every spider
+        timeout: Seconds before the spiders are closed
+    """
+    return _crawl(self, list(spider_names), full_crawl, timeout)
+
+
+@app.task(bind=True, name='tasks.crawl_due_spiders')
+def crawl_due_spiders(self):
+    """
+    Run every spider whose SPIDER_INTERVALS interval has elapsed since its
+    last crawl, all in one crawl process
+    """
+    now = time.time()
+    last_started = redis_client.hgetall(CRAWL_LAST_STARTED_KEY)
+
+    # Half a check period of slack, so a spider started a few seconds
+    # after its slot does not slip to the next check
+    slack = CRAWL_CHECK_MINUTES * 30
+    due = [
+        name for name, minutes in SPIDER_INTERVALS.items()
+        if now - float(last_started.get(name, 0)) >= minutes * 60 - slack
+    ]
+    if not due:
+        return {'status': 'idle', 'timestamp': datetime.now().isoformat()}
+
+    return _crawl(self, due, full_crawl=False)
 
 
 @app.task(name='tasks.get_news_stats')
@@ -116,6 +232,74 @@ def get_news_stats():
         return {'status': 'error', 'message': str(e)}
 
 
+@worker_process_init.connect
+def precompile_email_templates(**kwargs):
+    """
+    Compile the notification email templates once per worker process
+    """
+    try:
+        import sys
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+        from app.core.templates import precompile
+        precompile()
+
+    except Exception as e:
+        logger.error(f"Error precompiling email templates: {str(e)}")
+
+
+# Keyword matching debounce: created ids accumulate in a Redis set and one
+# batch task runs KEYWORD_MATCH_DEBOUNCE seconds after the first of them
+KEYWORD_MATCH_PENDING_KEY = 'keyword_matches:pending'
+KEYWORD_MATCH_SCHEDULED_KEY = 'keyword_matches:scheduled'
+KEYWORD_MATCH_DEBOUNCE = 30
+
+redis_client = redis.from_url(redis_url, decode_responses=True)
+
+
+def queue_keyword_matches(news_ids):
+    """
+    Add newly created news ids to the pending keyword matching set and
+    schedule a batch run unless one is already scheduled
+
+    Args:
+        news_ids: IDs of the news items to check
+    """
+    if not news_ids:
+        return
+
+    redis_client.sadd(KEYWORD_MATCH_PENDING_KEY, *news_ids)
+
+    # The marker expires on its own in case the scheduled task is lost
+    if redis_client.set(KEYWORD_MATCH_SCHEDULED_KEY, 1, nx=True, ex=KEYWORD_MATCH_DEBOUNCE * 4):
+        flush_keyword_matches.apply_async(countdown=KEYWORD_MATCH_DEBOUNCE)
+
+
+@app.task(name='tasks.flush_keyword_matches')
+def flush_keyword_matches():
+    """
+    Run one keyword matching batch over all pending news ids
+    (scheduled by queue_keyword_matches, or called when a crawl finishes)
+    """
+    try:
+        # Clear the marker first: ids queued from now on schedule a new run
+        redis_client.delete(KEYWORD_MATCH_SCHEDULED_KEY)
+
+        pipe = redis_client.pipeline()
+        pipe.smembers(KEYWORD_MATCH_PENDING_KEY)
+        pipe.delete(KEYWORD_MATCH_PENDING_KEY)
+        news_ids, _ = pipe.execute()
+
+    except redis.RedisError as e:
+        logger.error(f"Error reading pending keyword matches: {str(e)}")
+        return {'status': 'error', 'message': str(e)}
+
+    if not news_ids:
+        return {'status': 'success', 'news_checked': 0, 'timestamp': datetime.now().isoformat()}
+
+    return check_keyword_matches_batch(sorted(int(news_id) for news_id in news_ids))
+
+
 @app.task(name='tasks.check_keyword_matches')
 def check_keyword_matches(news_id: int):
     """
@@ -125,108 +309,71 @@ def check_keyword_matches(news_id: int):
     Args:
         news_id: ID of the news item to check
     """
+    return check_keyword_matches_batch([news_id])
+
+
+@app.task(name='tasks.check_keyword_matches_batch')
+def check_keyword_matches_batch(news_ids):
+    """
+    Check newly scraped news items against all instant keyword subscriptions
+    and queue email notifications
+
+    Subscriptions and users are loaded once for the whole batch, and each
+    user's matched articles are queued as PENDING notification history in a
+    single bulk insert; send_pending_notifications then mails one message
+    per user.
+
+    Args:
+        news_ids: IDs of the news items to check
+    """
     try:
         import sys
         sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
         from app.core.database import SessionLocal
         from app.models.news import News
-        from app.models.subscription import KeywordSubscription, NotificationHistory, EmailStatus
-        from app.core.email import email_service
+        from app.models.subscription import NotificationFrequency
+        from app.core.keyword_matcher import get_matcher
+        from app.core.notifications import plan_notifications, record_notifications
 
         db = SessionLocal()
 
         try:
-            # Get the news item
-            news = db.query(News).filter(News.id == news_id).first()
-            if not news:
-                logger.warning(f"News {news_id} not found")
+            news_items = db.query(News).filter(News.id.in_(news_ids)).all()
+            if not news_items:
+                logger.warning(f"News {news_ids} not found")
                 return {'status': 'error', 'message': 'News not found'}
 
-            # Get all active subscriptions with instant frequency
-            subscriptions = db.query(KeywordSubscription).filter(
-                KeywordSubscription.is_active == True,
-                KeywordSubscription.frequency == 'instant'
-            ).all()
-
-            matched_users = {}
-
-            # Check each subscription for keyword matches
-            for sub in subscriptions:
-                keyword = sub.keyword.lower()
-                title_lower = news.title.lower() if news.title else ''
-                content_lower = news.content.lower() if news.content else ''
-                summary_lower = news.summary.lower() if news.summary else ''
-
-                # Check if keyword appears in title, content, or summary
-                if (keyword in title_lower or
-                    keyword in content_lower or
-                    keyword in summary_lower):
-
-                    if sub.user_id not in matched_users:
-                        matched_users[sub.user_id] = []
-
-                    matched_users[sub.user_id].append({
-                        'subscription': sub,
-                        'news': news
-                    })
-
-            # Send emails to matched users
-            sent_count = 0
-            for user_id, matches in matched_users.items():
-                from app.models.user import User
-                user = db.query(User).filter(User.id == user_id).first()
-
-                if not user or not user.email:
-                    continue
-
-                for match in matches:
-                    subscription = match['subscription']
-                    news_item = match['news']
-
-                    # Prepare news data for email
-                    news_data = [{
-                        'id': news_item.id,
-                        'title': news_item.title,
-                        'summary': news_item.summary or news_item.content[:200],
-                        'category': news_item.category,
-                        'published_at': news_item.published_at.strftime('%Y-%m-%d') if news_item.published_at else '',
-                    }]
-
-                    # Send email
-                    success, message = email_service.send_keyword_match_notification(
-                        to_email=user.email,
-                        user_name=user.full_name or user.username,
-                        keyword=subscription.keyword,
-                        news_items=news_data,
-                        subscription_id=subscription.id
-                    )
-
-                    # Record notification history
-                    notification = NotificationHistory(
-                        user_id=user.id,
-                        subscription_id=subscription.id,
-                        news_id=news_item.id,
-                        email_status=EmailStatus.SENT if success else EmailStatus.FAILED,
-                        error_message=None if success else message,
-                        sent_at=datetime.now() if success else None
-                    )
-                    db.add(notification)
-
-                    if success:
-                        sent_count += 1
-                    else:
-                        logger.error(f"Failed to send email to {user.email}: {message}")
-
+            # Scan each article once against all instant subscriptions
+            matcher = get_matcher(db)
+            matched = []  # (subscription id, news item)
+            for news in news_items:
+                keyword_matches = matcher.match(
+                    news.title, news.summary, news.content,
+                    frequency=NotificationFrequency.INSTANT
+                )
+                matched.extend(
+                    (sub_id, news) for ids in keyword_matches.values() for sub_id in ids
+                )
+
+            # One message per user, skipping articles they were already sent
+            plans = plan_notifications(db, matched)
+
+            # Queue one PENDING message per user; the email queue sends them
+            notifications = [row for plan in plans for row in plan.history_rows()]
+            record_notifications(db, notifications)
             db.commit()
 
-            logger.info(f"Checked news {news_id}, sent {sent_count} notifications")
+            if plans:
+                send_pending_notifications.delay()
+
+            logger.info(f"Checked {len(news_items)} news items, queued {len(plans)} notifications")
 
             return {
                 'status': 'success',
-                'news_id': news_id,
-                'matched_users': len(matched_users),
-                'emails_sent': sent_count,
+                'news_checked': len(news_items),
+                'matched_users': len(plans),
+                'emails_queued': len(plans),
                 'timestamp': datetime.now().isoformat()
             }
 
@@ -238,36 +385,134 @@ def check_keyword_matches(news_id: int):
         return {'status': 'error', 'message': str(e)}
 
 
-@app.task(name='tasks.send_daily_digest')
-def send_daily_digest():
+@app.task(name='tasks.send_pending_notifications')
+def send_pending_notifications():
+    """
+    Drain due PENDING notification emails (rate limited, retried with backoff)
+    """
+    try:
+        import sys
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+        from app.core.database import SessionLocal
+        from app.core.email_queue import dispatch_pending_notifications
+
+        db = SessionLocal()
+
+        try:
+            counts = dispatch_pending_notifications(db)
+            logger.info(
+                f"Notification queue: {counts['sent']} sent, {counts['retrying']} retrying, "
+                f"{counts['failed']} failed"
+            )
+
+            # Keep draining while full batches are being claimed
+            if counts['more']:
+                send_pending_notifications.delay()
+
+            return dict(counts, status='success', timestamp=datetime.now().isoformat())
+
+        finally:
+            db.close()
+
+    except Exception as e:
+        logger.error(f"Error sending pending notifications: {str(e)}")
+        return {'status': 'error', 'message': str(e)}
+
+
+# Seconds before a digest run with failed sends is retried
+DIGEST_RETRY_SECONDS = 600
+DIGEST_MAX_RETRIES = 3
+
+
+def _send_digests(task, frequency_name, end=None):
+    """
+    Send the digests of one frequency, retrying the same window when sends fail
+
+    Args:
+        end: ISO window end; a retry passes the first attempt's, so it
+            resumes that run (send_digests tracks progress per end date)
+    """
+    import sys
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+    from app.core.database import SessionLocal
+    from app.core.digest import send_digests
+    from app.models.subscription import NotificationFrequency
+
+    end_time = datetime.fromisoformat(end) if end else datetime.now(timezone.utc)
+    retry_kwargs = {'end': end_time.isoformat()}
+
+    db = SessionLocal()
+    try:
+        counts = send_digests(db, NotificationFrequency(frequency_name), end_time)
+    except Exception as e:
+        logger.error(f"Error sending {frequency_name} digest: {str(e)}")
+        raise task.retry(exc=e, kwargs=retry_kwargs, countdown=DIGEST_RETRY_SECONDS, max_retries=DIGEST_MAX_RETRIES)
+    finally:
+        db.close()
+
+    logger.info(
+        f"{frequency_name.capitalize()} digest: {counts['sent']} sent, "
+        f"{counts['failed']} failed ({counts['users']} users)"
+    )
+
+    if counts['failed']:
+        # Only the users not reached yet are mailed again
+        if task.request.retries < DIGEST_MAX_RETRIES:
+            raise task.retry(kwargs=retry_kwargs, countdown=DIGEST_RETRY_SECONDS, max_retries=DIGEST_MAX_RETRIES)
+        logger.error(f"Giving up on {counts['failed']} {frequency_name} digests after {DIGEST_MAX_RETRIES} retries")
+        return dict(counts, status='partial', timestamp=datetime.now().isoformat())
+
+    return dict(counts, status='success', timestamp=datetime.now().isoformat())
+
+
+@app.task(bind=True, name='tasks.send_daily_digest')
+def send_daily_digest(self, end=None):
     """
     Send daily digest emails to users with daily notification frequency
     Should be scheduled to run once per day
     """
+    return _send_digests(self, 'daily', end)
+
+
+@app.task(bind=True, name='tasks.send_weekly_digest')
+def send_weekly_digest(self, end=None):
+    """
+    Send weekly digest emails to users with weekly notification frequency
+    Should be scheduled to run once per week
+    """
+    return _send_digests(self, 'weekly', end)
+
+
+@app.task(name='tasks.flush_view_counts')
+def flush_view_counts():
+    """
+    Flush article views buffered in Redis to news.view_count
+    """
     try:
         import sys
         sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
         from app.core.database import SessionLocal
-        from app.models.subscription import KeywordSubscription
-        from app.models.user import User
-        from app.core.email import email_service
+        from app.core.view_counter import flush_view_counts as flush
 
         db = SessionLocal()
 
         try:
-            # Get all users with daily subscriptions
-            # Implementation would aggregate news from last 24 hours
-            # For brevity, returning placeholder
-
-            logger.info("Daily digest task completed")
-            return {'status': 'success', 'timestamp': datetime.now().isoformat()}
+            updated = flush(db)
+            logger.info(f"Flushed view counts for {updated} articles")
+            return {
+                'status': 'success',
+                'articles_updated': updated,
+                'timestamp': datetime.now().isoformat()
+            }
 
         finally:
             db.close()
 
     except Exception as e:
-        logger.error(f"Error sending daily digest: {str(e)}")
+        logger.error(f"Error flushing view counts: {str(e)}")
         return {'status': 'error', 'message': str(e)}
 
 
@@ -0,0 +1,48 @@
+"""HttpxDownloadHandler response conversion, against an httpx mock transport"""
+import asyncio
+import logging
+
+import httpx
+from scrapy import Spider
+from scrapy.http import Request
+from scrapy.settings import Settings
+
+from whut_spider.httpx_handler import HttpxDownloadHandler
+
+
+def _download(status, headers, body, url='http://i.whut.edu.cn/'):
+    def respond(request):
+        # A stream, like a real network response (content= would count as already read)
+        return httpx.Response(status, headers=headers, stream=httpx.ByteStream(body))
+
+    handler = HttpxDownloadHandler(Settings())
+    handler.clients[None] = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+    spider = Spider(name='test')
+    spider.logger.setLevel(logging.CRITICAL)
+
+    async def run():
+        try:
+            return await handler._download(Request(url), spider)
+        finally:
+            await handler._close()
+
+    return asyncio.run(run())
+
+
+def test_repeated_headers_are_kept():
+    response = _download(200, [
+        ('Content-Type', 'text/html; charset=utf-8'),
+        ('Set-Cookie', 'session=1; Path=/'),
+        ('Set-Cookie', 'lang=zh; Path=/'),
+    ], b'<html></html>')
+
+    assert response.headers.getlist('Set-Cookie') == [b'session=1; Path=/', b'lang=zh; Path=/']
+    assert response.headers.get('Content-Type') == b'text/html; charset=utf-8'
+
+
+def test_response_status_and_body():
+    response = _download(404, {'Content-Type': 'text/html'}, b'<p>gone</p>')
+
+    assert response.status == 404
+    assert response.body == b'<p>gone</p>'
+    assert response.url == 'http://i.whut.edu.cn/'
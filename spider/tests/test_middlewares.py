@@ -0,0 +1,88 @@
+"""spider_closed of the SeenStore-backed middlewares"""
+import logging
+import sqlite3
+
+import pytest
+from scrapy import Spider
+from scrapy.http import HtmlResponse, Request
+
+from whut_spider.middlewares import ConditionalRequestMiddleware, SeenURLMiddleware
+from whut_spider.seen_store import SeenStore
+
+LIST_URL = 'http://i.whut.edu.cn/xxtg/'
+
+
+class Stats:
+    def __init__(self):
+        self.values = {}
+
+    def inc_value(self, key, count=1, spider=None):
+        self.values[key] = self.values.get(key, 0) + count
+
+    def set_value(self, key, value, spider=None):
+        self.values[key] = value
+
+
+class ListSpider(Spider):
+    name = 'list_spider'
+
+    def parse_list(self, response):
+        pass
+
+
+def _is_closed(store):
+    try:
+        store._conn.execute('SELECT 1')
+    except sqlite3.ProgrammingError:
+        return True
+    return False
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / 'seen.db')
+
+
+@pytest.fixture
+def spider():
+    spider = ListSpider()
+    spider.logger.setLevel(logging.CRITICAL)
+    return spider
+
+
+def _conditional(store_path):
+    return ConditionalRequestMiddleware(SeenStore(store_path), ['i.whut.edu.cn'], ['parse_list'], Stats())
+
+
+def _fetch_list_page(middleware, spider):
+    request = Request(LIST_URL, callback=spider.parse_list)
+    response = HtmlResponse(LIST_URL, body=b'<html></html>', request=request, headers={'ETag': '"v1"'})
+    middleware.process_response(request, response, spider)
+
+
+@pytest.mark.parametrize('reason', ['finished', 'closespider_timeout'])
+def test_seen_url_middleware_closes_store(store_path, spider, reason):
+    middleware = SeenURLMiddleware(SeenStore(store_path), ['parse_article'], Stats())
+    middleware.spider_closed(spider, reason)
+
+    assert _is_closed(middleware.store)
+
+
+def test_conditional_validators_saved_when_finished(store_path, spider):
+    middleware = _conditional(store_path)
+    _fetch_list_page(middleware, spider)
+    middleware.spider_closed(spider, 'finished')
+
+    assert _is_closed(middleware.store)
+    assert SeenStore(store_path).get_validators(LIST_URL) == ('"v1"', None)
+    assert 'conditional/discarded' not in middleware.stats.values
+
+
+def test_conditional_validators_discarded_when_cut_short(store_path, spider):
+    middleware = _conditional(store_path)
+    _fetch_list_page(middleware, spider)
+    middleware.spider_closed(spider, 'closespider_timeout')
+
+    assert _is_closed(middleware.store)
+    assert SeenStore(store_path).get_validators(LIST_URL) == (None, None)
+    assert middleware.stats.values['conditional/discarded'] == 1
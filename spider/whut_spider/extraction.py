@@ -0,0 +1,243 @@
+"""
+Single-pass lxml article extraction
+
+The selector path of an article callback queries the document once per
+field: a CSS query per content container, a text() union fallback, one
+query each for images, attachments and metadata spans, and regex scans of
+response.text. ArticleExtractor instead walks the parsed lxml tree once,
+tracking which containers are open, and collects paragraphs (per content
+selector, so the priority order is kept), images, attachment links,
+metadata fields and raw elements on the way.
+
+Selectors are limited to simple forms ('tag', 'tag.class', 'tag#id',
+'.class', '#id') with at most one ancestor ('div.xl-tie p').
+
+benchmarks.parse_bench runs spiders with both engines on the page corpus
+and reports any difference between them.
+"""
+import re
+from lxml import etree
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+ENGINES = ('selectors', 'lxml')
+
+ATTACHMENT_SUFFIXES = ('.pdf', '.doc', '.docx', '.xls', '.xlsx')
+
+_SIMPLE_SELECTOR_RE = re.compile(r'^([a-z][a-z0-9]*)?(?:([.#])([\w-]+))?$')
+_TEXT_XPATH = etree.XPath('.//text()', smart_strings=False)
+
+
+def node_text(node):
+    """All descendant text of an lxml node, whitespace-collapsed"""
+    return WHITESPACE_RE.sub(' ', ' '.join(_TEXT_XPATH(node))).strip()
+
+
+def direct_text(node):
+    """First text node directly under node (like '::text' + .get())"""
+    if node.text is not None:
+        return node.text
+    for child in node:
+        if child.tail is not None:
+            return child.tail
+    return None
+
+
+class SimpleSelector:
+    """A single compound selector: 'tag', 'tag.class', 'tag#id', '.class' or '#id'"""
+
+    def __init__(self, selector):
+        match = _SIMPLE_SELECTOR_RE.match(selector)
+        if not selector or not match:
+            raise ValueError(f'Unsupported selector: {selector}')
+        self.selector = selector
+        self.tag, kind, value = match.groups()
+        self.cls = value if kind == '.' else None
+        self.id = value if kind == '#' else None
+
+    def matches(self, node):
+        if self.tag and node.tag != self.tag:
+            return False
+        if self.cls:
+            return self.cls in (node.get('class') or '').split()
+        if self.id:
+            return node.get('id') == self.id
+        return True
+
+    @property
+    def xpath(self):
+        path = f'//{self.tag or "*"}'
+        if self.cls:
+            return f'{path}[contains(concat(" ", normalize-space(@class), " "), " {self.cls} ")]'
+        if self.id:
+            return f'{path}[@id="{self.id}"]'
+        return path
+
+
+class Selector:
+    """A simple selector, optionally below one ancestor selector"""
+
+    def __init__(self, selector):
+        parts = selector.split()
+        if not 1 <= len(parts) <= 2:
+            raise ValueError(f'Unsupported selector: {selector}')
+        self.selector = selector
+        self.target = SimpleSelector(parts[-1])
+        self.ancestor = SimpleSelector(parts[0]) if len(parts) == 2 else None
+
+
+class ArticleExtractor:
+    """
+    Collects everything an article callback needs in one walk of the tree
+
+    Args:
+        content: Content container selectors, most specific first
+        images: Containers whose <img src> are article images
+        image_alts: Containers whose <img alt> describe image-only posts
+        attachment_containers: Containers whose links are all attachments
+        attachment_limit: Maximum attachment links returned
+        fields: name -> selectors; the first direct text of the first match
+        elements: name -> selectors; every matching element in document order
+        min_paragraph_length: Paragraphs this short or shorter are dropped
+    """
+
+    def __init__(self, content=(), images=(), image_alts=(), attachment_containers=(),
+                 attachment_limit=10, fields=None, elements=None, min_paragraph_length=0):
+        self.content = [SimpleSelector(s) for s in content]
+        self.images = [SimpleSelector(s) for s in images]
+        self.image_alts = [SimpleSelector(s) for s in image_alts]
+        self.attachment_containers = [SimpleSelector(s) for s in attachment_containers]
+        self.attachment_limit = attachment_limit
+        self.fields = {name: [Selector(s) for s in selectors] for name, selectors in (fields or {}).items()}
+        self.elements = {name: [Selector(s) for s in selectors] for name, selectors in (elements or {}).items()}
+        self.min_paragraph_length = min_paragraph_length
+
+        # Every simple selector whose open/closed state the walk tracks
+        tracked = {}
+        for selector in self.content + self.images + self.image_alts + self.attachment_containers:
+            tracked[selector.selector] = selector
+        for selectors in list(self.fields.values()) + list(self.elements.values()):
+            for selector in selectors:
+                if selector.ancestor:
+                    tracked[selector.ancestor.selector] = selector.ancestor
+        self.tracked = set(tracked)
+
+        # Fields and elements by the simple selector their target must match
+        self.targets = {}
+        for kind, specs in (('field', self.fields), ('element', self.elements)):
+            for name, selectors in specs.items():
+                for selector in selectors:
+                    self.targets.setdefault(selector.target.selector, []).append((kind, name, selector))
+
+        # Index every simple selector by id, class or bare tag, so a node
+        # is only tested against the selectors that can match it
+        self._by_id, self._by_class, self._by_tag = {}, {}, {}
+        simple = dict(tracked)
+        for selectors in list(self.fields.values()) + list(self.elements.values()):
+            for selector in selectors:
+                simple[selector.target.selector] = selector.target
+        for selector in simple.values():
+            if selector.id:
+                self._by_id.setdefault(selector.id, []).append(selector)
+            elif selector.cls:
+                self._by_class.setdefault(selector.cls, []).append(selector)
+            else:
+                self._by_tag.setdefault(selector.tag, []).append(selector)
+
+    def _matching(self, node):
+        """Keys of the simple selectors node matches"""
+        tag = node.tag
+        candidates = list(self._by_tag.get(tag, ()))
+        node_id = node.get('id')
+        if node_id:
+            candidates.extend(self._by_id.get(node_id, ()))
+        classes = node.get('class')
+        if classes:
+            for cls in classes.split():
+                candidates.extend(self._by_class.get(cls, ()))
+        return [s.selector for s in candidates if not s.tag or s.tag == tag]
+
+    def _any_open(self, selectors, open_selectors):
+        return any(open_selectors.get(selector.selector) for selector in selectors)
+
+    def extract(self, root):
+        """
+        Walk the tree under root once
+
+        Returns:
+            Dict with 'paragraphs' (texts from the first content selector
+            that has any), 'images' (src), 'image_alts', 'attachments'
+            ((href, link text) pairs), 'fields' and 'elements'
+        """
+        open_selectors = {}
+        opened = []  # Per open element: tracked selectors it matched
+        groups = [[] for _ in self.content]
+        paragraph_depth = 0
+
+        images, image_alts, attachments = [], [], []
+        fields = {name: None for name in self.fields}
+        elements = {name: [] for name in self.elements}
+
+        for event, node in etree.iterwalk(root, events=('start', 'end')):
+            if event == 'end':
+                for key in opened.pop():
+                    open_selectors[key] -= 1
+                if node.tag == 'p':
+                    paragraph_depth -= 1
+                continue
+
+            matched = self._matching(node)
+
+            # Ancestor conditions see the ancestors only, not node itself
+            for key in matched:
+                for kind, name, selector in self.targets.get(key, ()):
+                    if selector.ancestor and not open_selectors.get(selector.ancestor.selector):
+                        continue
+                    if kind == 'element':
+                        if not elements[name] or elements[name][-1] is not node:
+                            elements[name].append(node)
+                    elif fields[name] is None:
+                        fields[name] = direct_text(node)
+
+            tag = node.tag
+            if tag == 'p':
+                # Text of nested paragraphs is already part of the outer one
+                if not paragraph_depth:
+                    text = None
+                    for index, selector in enumerate(self.content):
+                        if open_selectors.get(selector.selector):
+                            if text is None:
+                                text = node_text(node)
+                            if text and len(text) > self.min_paragraph_length:
+                                groups[index].append(text)
+                paragraph_depth += 1
+            elif tag == 'img':
+                if self._any_open(self.images, open_selectors):
+                    src = node.get('src')
+                    if src:
+                        images.append(src)
+                if self._any_open(self.image_alts, open_selectors):
+                    alt = node.get('alt')
+                    if alt is not None:
+                        image_alts.append(alt)
+            elif tag == 'a' and len(attachments) < self.attachment_limit:
+                href = node.get('href')
+                if href and (href.endswith(ATTACHMENT_SUFFIXES)
+                             or self._any_open(self.attachment_containers, open_selectors)):
+                    attachments.append((href, direct_text(node)))
+
+            opened_keys = [key for key in matched if key in self.tracked]
+            for key in opened_keys:
+                open_selectors[key] = open_selectors.get(key, 0) + 1
+            opened.append(opened_keys)
+
+        paragraphs = next((group for group in groups if group), [])
+        return {
+            'paragraphs': paragraphs,
+            'images': images,
+            'image_alts': image_alts,
+            'attachments': attachments,
+            'fields': fields,
+            'elements': elements,
+        }
+
@@ -0,0 +1,104 @@
+"""
+Per-host request budgets shared by every crawl process
+
+Scrapy's DOWNLOAD_DELAY and CONCURRENT_REQUESTS_PER_DOMAIN only apply
+within one crawler. When several spiders run at the same time (in one
+crawl process or in parallel Celery tasks) and two of them hit the same
+host, each would get the full allowance. HostBudgetMiddleware instead
+takes a token from a Redis token bucket keyed by host before every
+download, so the HOST_BUDGETS rate holds for the host as a whole while
+spiders on different hosts never wait for each other.
+"""
+import logging
+import time
+import redis
+
+logger = logging.getLogger(__name__)
+
+# Same algorithm as the backend's rate_limit.TokenBucket: refill for the
+# elapsed time, then take the tokens or report how long to wait for them
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(wait)
+"""
+
+
+class HostTokenBucket:
+    """
+    Token bucket for one host, stored in Redis
+
+    Args:
+        host: Hostname the bucket limits (every process shares it by name)
+        rate: Requests per second
+        capacity: Maximum burst size
+    """
+
+    def __init__(self, client, host, rate, capacity):
+        self.key = f'crawl_budget:{host}'
+        self.rate = rate
+        self.capacity = capacity
+        self._script = client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    def try_acquire(self, tokens=1):
+        """
+        Take tokens if available (a blocking Redis round trip)
+
+        Returns:
+            0 if the tokens were taken, otherwise the seconds to wait before retrying
+        """
+        try:
+            return float(self._script(
+                keys=[self.key], args=[self.rate, self.capacity, time.time(), tokens]
+            ))
+        except redis.RedisError as e:
+            # Fail open: DOWNLOAD_DELAY still applies within each crawler
+            logger.warning(f'Crawl budget {self.key} unavailable: {e}')
+            return 0.0
+
+
+class HostBudgets:
+    """HostTokenBucket per configured host"""
+
+    def __init__(self, client, budgets, capacity):
+        self.buckets = {
+            host: HostTokenBucket(client, host, rate, capacity)
+            for host, rate in budgets.items() if rate
+        }
+
+    @classmethod
+    def from_settings(cls, settings):
+        # try_acquire runs in HostBudgetMiddleware's small thread pool;
+        # short timeouts keep a stalled Redis from holding its threads
+        timeout = settings.getfloat('HOST_BUDGET_REDIS_TIMEOUT', 0.5)
+        return cls(
+            redis.from_url(
+                settings.get('HOST_BUDGET_REDIS_URL'),
+                socket_timeout=timeout,
+                socket_connect_timeout=timeout,
+            ),
+            settings.getdict('HOST_BUDGETS'),
+            settings.getint('HOST_BUDGET_BURST', 2),
+        )
+
+    def get(self, host):
+        """Bucket for host, or None if the host has no budget"""
+        return self.buckets.get(host)
@@ -1,66 +1,143 @@
 """
 Custom HTTPX download handler with SOCKS5 proxy support for Scrapy
+
+Requests run on httpx.AsyncClient inside the asyncio reactor, so concurrency
+is bounded by CONCURRENT_REQUESTS and the connection limits below rather
+than by Twisted's thread pool. Requires
+TWISTED_REACTOR = 'twisted.internet.asyncioreactor.AsyncioSelectorReactor'.
 """
+import time
 import httpx
-from scrapy.http import HtmlResponse, Request
-from twisted.internet import defer, threads
+from scrapy.exceptions import IgnoreRequest, NotConfigured
+from scrapy.http import Headers, Request
+from scrapy.responsetypes import responsetypes
+from scrapy.utils.defer import deferred_from_coro
+from scrapy.utils.reactor import is_asyncio_reactor_installed
+from twisted.internet.error import ConnectError, TimeoutError
 
 
 class HttpxDownloadHandler:
     """
     Custom Scrapy download handler using HTTPX with SOCKS5 proxy support
+
+    One AsyncClient (connection pool) is kept per proxy, capped at
+    HTTPX_MAX_CONNECTIONS_PER_PROXY connections with keep-alive per host.
+    Bodies are streamed and the download is abandoned once it exceeds
+    DOWNLOAD_MAXSIZE (or the download_maxsize meta key).
     """
 
+    lazy = False
+
     def __init__(self, settings):
         self.proxy = settings.get('PROXY')
         self.timeout = settings.getfloat('DOWNLOAD_TIMEOUT', 180)
-
-        # Create a shared httpx client with proxy
-        proxy_config = {self.proxy: None} if self.proxy else None
-        self.client = httpx.Client(
-            proxies=proxy_config,
-            timeout=self.timeout,
-            follow_redirects=True,
-            verify=False  # Disable SSL verification for development
+        self.maxsize = settings.getint('DOWNLOAD_MAXSIZE')
+        self.warnsize = settings.getint('DOWNLOAD_WARNSIZE')
+        self.http2 = settings.getbool('HTTPX_HTTP2', True)
+        self.limits = httpx.Limits(
+            max_connections=settings.getint('HTTPX_MAX_CONNECTIONS_PER_PROXY', 16),
+            max_keepalive_connections=settings.getint('HTTPX_MAX_CONNECTIONS_PER_PROXY', 16),
+            keepalive_expiry=settings.getfloat('HTTPX_KEEPALIVE_EXPIRY', 30),
         )
 
+        # Proxy URL (None for direct connections) -> shared client
+        self.clients = {}
+
     @classmethod
     def from_crawler(cls, crawler):
+        if not is_asyncio_reactor_installed():
+            raise NotConfigured('HttpxDownloadHandler requires the asyncio reactor (TWISTED_REACTOR)')
         return cls(crawler.settings)
 
+    def _client(self, proxy):
+        client = self.clients.get(proxy)
+        if client is None:
+            client = httpx.AsyncClient(
+                proxies=proxy,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                follow_redirects=False,  # Left to RedirectMiddleware
+                verify=False  # Disable SSL verification for development
+            )
+            self.clients[proxy] = client
+        return client
+
     def download_request(self, request: Request, spider):
         """Download a request using HTTPX"""
-        return threads.deferToThread(self._download, request, spider)
+        return deferred_from_coro(self._download(request, spider))
+
+    async def _download(self, request: Request, spider):
+        client = self._client(request.meta.get('proxy') or self.proxy)
+        maxsize = request.meta.get('download_maxsize', self.maxsize)
+        warnsize = request.meta.get('download_warnsize', self.warnsize)
 
-    def _download(self, request: Request, spider):
-        """Synchronous download method"""
+        httpx_request = client.build_request(
+            method=request.method,
+            url=request.url,
+            headers=[(name, value) for name, values in request.headers.items() for value in values],
+            content=request.body or None,
+            timeout=request.meta.get('download_timeout', self.timeout),
+        )
+
+        start_time = time.monotonic()
         try:
-            # Prepare headers
-            headers = dict(request.headers.to_unicode_dict())
-
-            # Make the request
-            response = self.client.request(
-                method=request.method,
-                url=request.url,
-                headers=headers,
-                content=request.body if request.method != 'GET' else None,
-            )
+            response = await client.send(httpx_request, stream=True)
+        except httpx.TimeoutException as e:
+            raise TimeoutError(f'Timed out downloading {request.url}: {e}')
+        except httpx.TransportError as e:
+            raise ConnectError(string=f'Error downloading {request.url}: {e!r}')
+        request.meta['download_latency'] = time.monotonic() - start_time
 
-            # Convert httpx response to Scrapy response
-            return HtmlResponse(
-                url=str(response.url),
-                status=response.status_code,
-                headers=response.headers,
-                body=response.content,
-                encoding=response.encoding or 'utf-8',
-                request=request,
-            )
+        try:
+            expected_size = int(response.headers.get('Content-Length') or -1)
+            if maxsize and expected_size > maxsize:
+                spider.logger.error(f'Cancelling download of {request.url}: expected response size '
+                                    f'({expected_size}) larger than download max size ({maxsize})')
+                raise IgnoreRequest(f'Response too large: {request.url}')
+
+            # Raw (still content-encoded) body: HttpCompressionMiddleware decodes it
+            chunks = []
+            received = 0
+            warned = False
+            async for chunk in response.aiter_raw():
+                received += len(chunk)
+                if maxsize and received > maxsize:
+                    spider.logger.error(f'Cancelling download of {request.url}: received response size '
+                                        f'({received}) larger than download max size ({maxsize})')
+                    raise IgnoreRequest(f'Response too large: {request.url}')
+                if warnsize and received > warnsize and not warned:
+                    warned = True
+                    spider.logger.warning(f'Received more bytes than download warn size ({warnsize}) '
+                                          f'in request {request.url}')
+                chunks.append(chunk)
+        except httpx.TimeoutException as e:
+            raise TimeoutError(f'Timed out reading {request.url}: {e}')
+        except httpx.TransportError as e:
+            raise ConnectError(string=f'Error reading {request.url}: {e!r}')
+        finally:
+            await response.aclose()
+
+        body = b''.join(chunks)
+        # Appended pair by pair so repeated headers (Set-Cookie) keep every value
+        headers = Headers()
+        for name, value in response.headers.raw:
+            headers.appendlist(name, value)
+        respcls = responsetypes.from_args(headers=headers, url=request.url, body=body)
+        return respcls(
+            url=request.url,
+            status=response.status_code,
+            headers=headers,
+            body=body,
+            request=request,
+            protocol=response.http_version,
+        )
 
-        except Exception as e:
-            spider.logger.error(f'Error downloading {request.url}: {e}')
-            raise
+    async def _close(self):
+        for client in self.clients.values():
+            await client.aclose()
+        self.clients.clear()
 
     def close(self):
-        """Close the HTTPX client"""
-        if hasattr(self, 'client'):
-            self.client.close()
+        """Close the HTTPX clients"""
+        return deferred_from_coro(self._close())
@@ -1,6 +1,13 @@
 import random
 from scrapy import signals
+from scrapy.exceptions import IgnoreRequest, NotConfigured
+from scrapy.http import Request
+from scrapy.utils.defer import maybe_deferred_to_future
+from scrapy.utils.httpobj import urlparse_cached
+from twisted.python.threadpool import ThreadPool
 import os
+from whut_spider.host_budget import HostBudgets
+from whut_spider.seen_store import SeenStore, is_full_crawl
 
 class RandomUserAgentMiddleware:
     """Rotate user agents to avoid detection"""
@@ -59,3 +66,210 @@ class DuplicateFilterMiddleware:
                     spider.logger.debug(f'Duplicate URL filtered: {url}')
             else:
                 yield item
+
+
+class SeenURLMiddleware:
+    """
+    Skip article detail requests already fetched in a previous run
+
+    Consults the persistent SeenStore before a detail request (one whose
+    callback is listed in SEEN_STORE_DETAIL_CALLBACKS) is scheduled, and
+    records every detail page downloaded. BackendAPIPipeline marks the URLs
+    the backend accepted as stored. Start a spider with -a full_crawl=1 to
+    bypass the store.
+    """
+
+    def __init__(self, store, detail_callbacks, stats):
+        self.store = store
+        self.detail_callbacks = set(detail_callbacks)
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('SEEN_STORE_ENABLED'):
+            raise NotConfigured
+        middleware = cls(
+            SeenStore.from_settings(crawler.settings),
+            crawler.settings.getlist('SEEN_STORE_DETAIL_CALLBACKS'),
+            crawler.stats,
+        )
+        crawler.signals.connect(middleware.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def spider_opened(self, spider):
+        # Lets list parsers stop paginating early (see has_unseen_articles)
+        spider.seen_store = self.store
+
+    def spider_closed(self, spider, reason):
+        self.store.close()
+
+    def _is_detail(self, request):
+        return getattr(request.callback, '__name__', None) in self.detail_callbacks
+
+    def process_spider_output(self, response, result, spider):
+        if self._is_detail(response.request):
+            self.store.mark_fetched(response.url, spider.name)
+
+        full_crawl = is_full_crawl(spider)
+
+        for entry in result:
+            if (isinstance(entry, Request) and not full_crawl and self._is_detail(entry)
+                    and not self.store.should_fetch(entry.url)):
+                self.stats.inc_value('seen_store/skipped', spider=spider)
+                spider.logger.debug(f'Already fetched, skipping: {entry.url}')
+                continue
+            yield entry
+
+
+class ConditionalRequestMiddleware:
+    """
+    Revalidate list pages with If-None-Match / If-Modified-Since
+
+    Stores the ETag and Last-Modified of pages on CONDITIONAL_REQUEST_HOSTS
+    whose callback is listed in CONDITIONAL_REQUEST_CALLBACKS, and sends
+    them back on the next run. A 304 means the page (and, lists being
+    newest-first, everything after it) is unchanged, so the request is
+    dropped before reaching the spider.
+
+    Only pure list pages are revalidated: homepages and other pages that
+    fan out into categories are always fetched in full, since their
+    children can change while they do not. full_crawl runs still record
+    validators but never send them.
+
+    Validators are buffered and only saved when the spider closes with
+    finish_reason 'finished': a 304 skips every article of the page, so
+    saving them from a crawl that was cut short (timeout, shutdown, error)
+    would hide articles it never got to.
+    """
+
+    def __init__(self, store, hosts, callbacks, stats):
+        self.store = store
+        self.hosts = set(hosts)
+        self.callbacks = set(callbacks)
+        self.stats = stats
+        self.pending = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('CONDITIONAL_REQUESTS_ENABLED'):
+            raise NotConfigured
+        middleware = cls(
+            SeenStore.from_settings(crawler.settings),
+            crawler.settings.getlist('CONDITIONAL_REQUEST_HOSTS'),
+            crawler.settings.getlist('CONDITIONAL_REQUEST_CALLBACKS'),
+            crawler.stats,
+        )
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def spider_closed(self, spider, reason):
+        try:
+            if reason == 'finished':
+                for url, (etag, last_modified) in self.pending.items():
+                    self.store.set_validators(url, etag, last_modified)
+            elif self.pending:
+                spider.logger.info(
+                    f'Crawl ended with {reason!r}, not saving validators of {len(self.pending)} pages'
+                )
+                self.stats.set_value('conditional/discarded', len(self.pending), spider=spider)
+        finally:
+            self.pending.clear()
+            self.store.close()
+
+    def _applies(self, request):
+        return (
+            request.method == 'GET'
+            and urlparse_cached(request).hostname in self.hosts
+            and getattr(request.callback, '__name__', None) in self.callbacks
+        )
+
+    def process_request(self, request, spider):
+        if not self._applies(request) or is_full_crawl(spider):
+            return None
+        if b'If-None-Match' in request.headers or b'If-Modified-Since' in request.headers:
+            return None
+
+        etag, last_modified = self.store.get_validators(request.url)
+        if etag:
+            request.headers['If-None-Match'] = etag
+        if last_modified:
+            request.headers['If-Modified-Since'] = last_modified
+        if etag or last_modified:
+            request.meta['conditional_request'] = True
+        return None
+
+    def process_response(self, request, response, spider):
+        if not self._applies(request):
+            return response
+
+        if response.status == 304 and request.meta.get('conditional_request'):
+            self.stats.inc_value('conditional/not_modified', spider=spider)
+            raise IgnoreRequest(f'Not modified: {request.url}')
+
+        if response.status == 200:
+            self.pending[request.url] = (
+                response.headers.get('ETag', b'').decode('latin-1') or None,
+                response.headers.get('Last-Modified', b'').decode('latin-1') or None,
+            )
+            if request.meta.get('conditional_request'):
+                self.stats.inc_value('conditional/modified', spider=spider)
+        return response
+
+
+class HostBudgetMiddleware:
+    """
+    Hold requests until their host's shared budget allows them
+
+    Each download takes a token from the Redis bucket of its host (see
+    whut_spider.host_budget), so concurrent spiders and crawl processes
+    together stay within HOST_BUDGETS requests per second per host. The
+    Redis call runs in a small thread pool of its own (HOST_BUDGET_THREADS;
+    the reactor pool is left to DNS lookups), and a request without a token
+    waits with a reactor timer before trying again, so neither blocks the
+    reactor; hosts without a budget pass straight through.
+    """
+
+    def __init__(self, budgets, stats, threads=2):
+        self.budgets = budgets
+        self.stats = stats
+        self.threadpool = ThreadPool(minthreads=1, maxthreads=threads, name='host-budget')
+        self.threadpool.start()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('HOST_BUDGET_ENABLED'):
+            raise NotConfigured
+        middleware = cls(
+            HostBudgets.from_settings(crawler.settings),
+            crawler.stats,
+            crawler.settings.getint('HOST_BUDGET_THREADS', 2),
+        )
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def spider_closed(self, spider, reason):
+        self.threadpool.stop()
+
+    async def process_request(self, request, spider):
+        bucket = self.budgets.get(urlparse_cached(request).hostname)
+        if bucket is None:
+            return None
+
+        # Imported here so that importing this module never installs a reactor
+        from twisted.internet import reactor
+        from twisted.internet.task import deferLater
+        from twisted.internet.threads import deferToThreadPool
+
+        waited = 0.0
+        while True:
+            wait = await maybe_deferred_to_future(deferToThreadPool(reactor, self.threadpool, bucket.try_acquire))
+            if wait <= 0:
+                break
+            waited += wait
+            await maybe_deferred_to_future(deferLater(reactor, wait, lambda: None))
+
+        if waited:
+            self.stats.inc_value('host_budget/delayed', spider=spider)
+            self.stats.inc_value('host_budget/wait_seconds', waited, spider=spider)
+        return None
@@ -1,6 +1,16 @@
 import hashlib
+import queue
+import threading
+import time
+from collections import deque
 import httpx
 from itemadapter import ItemAdapter
+from twisted.internet import defer
+from whut_spider.seen_store import SeenStore, is_full_crawl
+
+# Queue sentinel telling the BackendAPIPipeline worker to flush and exit
+_FLUSH_AND_STOP = object()
+
 
 class ContentHashPipeline:
     """Generate content hash for deduplication"""
@@ -17,24 +27,77 @@ class ContentHashPipeline:
 
 
 class BackendAPIPipeline:
-    """Send scraped items to backend API"""
+    """
+    Send scraped items to the backend bulk API
 
-    def __init__(self, api_url):
+    process_item only enqueues the item; a background thread drains the
+    bounded queue and POSTs batches to /api/news/bulk, flushing when a batch
+    is full or its oldest item has waited BACKEND_BATCH_MAX_AGE seconds. The
+    Twisted reactor never waits on the backend: when the queue is full, the
+    item is parked with a Deferred that the worker fires (through
+    reactor.callFromThread) once it has taken items off the queue, so the
+    backpressure while the backend is down or slow costs no reactor pool
+    threads. Shutdown is signalled the same way.
+    """
+
+    def __init__(self, api_url, batch_size=50, batch_max_age=5.0, queue_size=500,
+                 max_retries=5, retry_backoff=1.0, seen_store=None):
         self.api_url = api_url
+        self.seen_store = seen_store
+        self.batch_size = batch_size
+        self.batch_max_age = batch_max_age
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.queue = queue.Queue(maxsize=queue_size)
         self.client = None
+        self.worker = None
+        self.spider = None
+        self.reactor = None
+        # (data, Deferred) waiting for room in the queue; reactor thread only
+        self.waiting = deque()
+        self.stopped = None
 
     @classmethod
     def from_crawler(cls, crawler):
-        api_url = crawler.settings.get('BACKEND_API_URL', 'http://backend:8000')
-        return cls(api_url)
+        settings = crawler.settings
+        return cls(
+            api_url=settings.get('BACKEND_API_URL', 'http://backend:8000'),
+            batch_size=settings.getint('BACKEND_BATCH_SIZE', 50),
+            batch_max_age=settings.getfloat('BACKEND_BATCH_MAX_AGE', 5.0),
+            queue_size=settings.getint('BACKEND_QUEUE_SIZE', 500),
+            max_retries=settings.getint('BACKEND_MAX_RETRIES', 5),
+            retry_backoff=settings.getfloat('BACKEND_RETRY_BACKOFF', 1.0),
+            seen_store=SeenStore.from_settings(settings) if settings.getbool('SEEN_STORE_ENABLED') else None,
+        )
 
     def open_spider(self, spider):
+        # Imported here so that importing this module never installs a reactor
+        from twisted.internet import reactor
+
+        self.reactor = reactor
+        self.spider = spider
         self.client = httpx.Client(timeout=30.0)
+        self.worker = threading.Thread(
+            target=self._run, name=f'backend-api-{spider.name}', daemon=True
+        )
+        self.worker.start()
         spider.logger.info(f'BackendAPIPipeline connected to {self.api_url}')
 
     def close_spider(self, spider):
-        if self.client:
-            self.client.close()
+        # Sentinel: the worker flushes what is left, cleans up and fires stopped
+        self.stopped = defer.Deferred()
+        if self.worker.is_alive():
+            self._put(_FLUSH_AND_STOP)
+        else:
+            self._worker_stopped()
+        return self.stopped
+
+    def _close_resources(self):
+        """Close the HTTP client and seen store (in the worker thread)"""
+        self.client.close()
+        if self.seen_store:
+            self.seen_store.close()
+        self._flush_keyword_matching()
 
     def process_item(self, item, spider):
         adapter = ItemAdapter(item)
@@ -48,42 +111,183 @@ class BackendAPIPipeline:
             'source_name': adapter.get('source_name'),
             'published_at': adapter.get('published_at'),
             'author': adapter.get('author'),
+            'publisher': adapter.get('publisher'),
             'images': adapter.get('images', []),
             'attachments': adapter.get('attachments', []),
             'category': adapter.get('category'),
+            'department': adapter.get('department'),
             'tags': adapter.get('tags', []),
             'content_hash': adapter.get('content_hash'),
         }
 
+        # Same content already stored under some URL: nothing to send
+        if (self.seen_store and not is_full_crawl(spider)
+                and self.seen_store.has_content(data['content_hash'])):
+            self.seen_store.mark_stored([(data['source_url'], data['content_hash'])], spider.name)
+            spider.logger.debug(f'Known content skipped: {(data["title"] or "")[:50]}...')
+            return item
+
+        if not self.waiting:
+            try:
+                self.queue.put_nowait(data)
+                return item
+            except queue.Full:
+                pass
+        return self._put(data).addCallback(lambda queued: self._queued(item, queued))
+
+    def _put(self, data):
+        """
+        Park data until the queue has room (reactor thread)
+
+        Returns:
+            Deferred firing True once data is queued, or False if the worker
+            is gone and will never make room
+        """
+        d = defer.Deferred()
+        if not self.worker.is_alive():
+            d.callback(False)
+            return d
+        self.waiting.append((data, d))
+        # The worker may have made room since the caller's put_nowait failed
+        self._fill_queue()
+        return d
+
+    def _fill_queue(self):
+        """Move parked data into the queue while it has room (reactor thread)"""
+        while self.waiting:
+            data, d = self.waiting[0]
+            try:
+                self.queue.put_nowait(data)
+            except queue.Full:
+                return
+            self.waiting.popleft()
+            d.callback(True)
+
+    def _worker_stopped(self):
+        """Fail whatever is still parked and fire stopped (reactor thread)"""
+        while self.waiting:
+            _, d = self.waiting.popleft()
+            d.callback(False)
+        if self.stopped and not self.stopped.called:
+            self.stopped.callback(None)
+
+    def _queued(self, item, queued):
+        if not queued:
+            self.spider.logger.error(f"Backend worker stopped, item not sent: {ItemAdapter(item).get('source_url')}")
+        return item
+
+    def _run(self):
+        """Worker thread: send batches until told to stop, then clean up"""
         try:
-            response = self.client.post(
-                f'{self.api_url}/api/news/',
-                json=data
-            )
+            self._send_batches()
+        except Exception:
+            self.spider.logger.exception('Backend worker failed')
+        finally:
+            try:
+                self._close_resources()
+            finally:
+                self.reactor.callFromThread(self._worker_stopped)
+
+    def _send_batches(self):
+        """Collect batches by size or age and send them"""
+        batch = []
+        deadline = None
+        stopping = False
 
-            if response.status_code == 201:
-                spider.logger.info(f'Successfully saved: {data["title"][:50]}...')
+        while not stopping:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                data = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                data = None
 
-                # Trigger keyword matching for new items
+            # Room was made: let the reactor move parked items in
+            if data is not None and self.waiting:
+                self.reactor.callFromThread(self._fill_queue)
+
+            if data is _FLUSH_AND_STOP:
+                stopping = True
+            elif data is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.batch_max_age
+                batch.append(data)
+
+            if batch and (stopping or len(batch) >= self.batch_size or time.monotonic() >= deadline):
                 try:
-                    response_data = response.json()
-                    news_id = response_data.get('id')
-                    if news_id:
-                        # Import and trigger celery task asynchronously
-                        from tasks import check_keyword_matches
-                        check_keyword_matches.delay(news_id)
-                        spider.logger.debug(f'Triggered keyword matching for news ID {news_id}')
-                except Exception as task_error:
-                    spider.logger.warning(f'Failed to trigger keyword matching: {str(task_error)}')
-
-            elif response.status_code == 409:
-                spider.logger.debug(f'Duplicate content skipped: {data["title"][:50]}...')
+                    self._send_batch(batch)
+                except Exception:
+                    # Bad response body, seen store error...: drop this batch, keep the worker alive
+                    self.spider.logger.exception(f'Dropping batch of {len(batch)} items')
+                batch = []
+                deadline = None
+
+    def _send_batch(self, batch):
+        """POST one batch, retrying with exponential backoff on 5xx and network errors"""
+        logger = self.spider.logger
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.client.post(f'{self.api_url}/api/news/bulk', json=batch)
+            except httpx.HTTPError as e:
+                error = str(e)
             else:
-                spider.logger.error(
-                    f'Failed to save item: {response.status_code} - {response.text}'
-                )
+                if response.status_code < 500:
+                    break
+                error = f'{response.status_code} - {response.text[:200]}'
 
-        except Exception as e:
-            spider.logger.error(f'Error sending item to API: {str(e)}')
+            if attempt < self.max_retries:
+                delay = self.retry_backoff * 2 ** attempt
+                logger.warning(f'Bulk save failed ({error}), retrying in {delay:g}s')
+                time.sleep(delay)
+        else:
+            logger.error(f'Dropping batch of {len(batch)} items after {self.max_retries} retries: {error}')
+            return
 
-        return item
+        if response.status_code != 200:
+            logger.error(f'Failed to save batch: {response.status_code} - {response.text}')
+            return
+
+        result = response.json()
+        logger.info(
+            f"Saved batch of {len(batch)}: {result['created']} created, {result['updated']} updated, "
+            f"{result['duplicates']} duplicates, {result['invalid']} invalid"
+        )
+
+        created_ids = []
+        stored = []
+        for outcome in result['results']:
+            data = batch[outcome['index']]
+            title = (data['title'] or '')[:50]
+            if outcome['status'] == 'invalid':
+                logger.error(f"Invalid item skipped: {title}... ({outcome['detail']})")
+                continue
+            if outcome['status'] == 'created':
+                created_ids.append(outcome['id'])
+            else:
+                logger.debug(f"{outcome['status'].capitalize()}: {title}...")
+            stored.append((data['source_url'], data['content_hash']))
+
+        # Later runs skip these URLs (see SeenURLMiddleware)
+        if self.seen_store and stored:
+            self.seen_store.mark_stored(stored, self.spider.name)
+
+        self._trigger_keyword_matching(created_ids)
+
+    def _trigger_keyword_matching(self, news_ids):
+        """Queue keyword matching for newly created items (run in debounced batches)"""
+        if not news_ids:
+            return
+        try:
+            from tasks import queue_keyword_matches
+            queue_keyword_matches(news_ids)
+            self.spider.logger.debug(f'Queued keyword matching for {len(news_ids)} news items')
+        except Exception as task_error:
+            self.spider.logger.warning(f'Failed to trigger keyword matching: {str(task_error)}')
+
+    def _flush_keyword_matching(self):
+        """Match everything queued so far now that the crawl is over"""
+        try:
+            from tasks import flush_keyword_matches
+            flush_keyword_matches.delay()
+        except Exception as task_error:
+            self.spider.logger.warning(f'Failed to trigger keyword matching: {str(task_error)}')
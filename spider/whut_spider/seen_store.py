@@ -0,0 +1,175 @@
+"""
+Persistent seen-URL store shared by all spiders
+
+Records every article detail URL that was fetched, when it was last
+fetched and, once the backend accepted it, the content hash it was stored
+with. It lives in a local SQLite database (WAL mode, so spiders running in
+parallel processes can share it) and survives across `scrapy crawl` runs,
+letting a run skip detail pages it already has.
+
+Revisit policy:
+- stored URLs are fetched again after SEEN_REVISIT_DAYS (0 = never)
+- URLs fetched but not stored (parse failure, backend down) are retried
+  after SEEN_RETRY_HOURS
+
+List pages are sorted newest-first, so spiders also stop paginating a
+category at the first page without unseen articles (has_unseen_articles).
+
+The same database keeps the HTTP validators (ETag / Last-Modified) of list
+pages for ConditionalRequestMiddleware.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+STATUS_FETCHED = 'fetched'
+STATUS_STORED = 'stored'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_urls (
+    url TEXT PRIMARY KEY,
+    spider TEXT,
+    status TEXT NOT NULL,
+    content_hash TEXT,
+    first_seen REAL NOT NULL,
+    last_fetched REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_seen_urls_content_hash ON seen_urls (content_hash);
+CREATE TABLE IF NOT EXISTS http_validators (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    updated REAL NOT NULL
+);
+"""
+
+
+def is_full_crawl(spider):
+    """True if the spider was started with -a full_crawl=1 (ignore the store)"""
+    value = getattr(spider, 'full_crawl', False)
+    if isinstance(value, str):
+        return value.lower() in ('1', 'true', 'yes')
+    return bool(value)
+
+
+def has_unseen_articles(spider, urls):
+    """
+    Whether a newest-first list page still links to articles not fetched yet
+
+    Once a page lists only known articles, the following (older) pages will
+    too, so pagination can stop there. Always True in full_crawl mode, when
+    the store is disabled, or if the page yielded no article links at all.
+    """
+    store = getattr(spider, 'seen_store', None)
+    urls = list(urls)
+    if store is None or is_full_crawl(spider) or not urls:
+        return True
+    return any(store.should_fetch(url) for url in urls)
+
+
+class SeenStore:
+    """SQLite-backed record of fetched article URLs"""
+
+    def __init__(self, path, revisit_days=30, retry_hours=6):
+        self.path = path
+        self.revisit_after = revisit_days * 86400 if revisit_days else None
+        self.retry_after = retry_hours * 3600
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Used from the reactor thread and the pipeline worker thread
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(
+            path=settings.get('SEEN_STORE_PATH', '.scrapy/seen_urls.sqlite3'),
+            revisit_days=settings.getint('SEEN_REVISIT_DAYS', 30),
+            retry_hours=settings.getfloat('SEEN_RETRY_HOURS', 6),
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def should_fetch(self, url, now=None):
+        """Whether a detail URL is due for (re)fetching under the revisit policy"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status, last_fetched FROM seen_urls WHERE url = ?', (url,)
+            ).fetchone()
+
+        if row is None:
+            return True
+
+        status, last_fetched = row
+        age = (now or time.time()) - last_fetched
+        if status == STATUS_STORED:
+            return self.revisit_after is not None and age >= self.revisit_after
+        return age >= self.retry_after
+
+    def has_content(self, content_hash):
+        """Whether some URL was already stored with this content"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT 1 FROM seen_urls WHERE content_hash = ? AND status = ? LIMIT 1',
+                (content_hash, STATUS_STORED)
+            ).fetchone()
+        return row is not None
+
+    def mark_fetched(self, url, spider_name=None):
+        """Record that a detail page was downloaded (keeps an existing stored status)"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT INTO seen_urls (url, spider, status, first_seen, last_fetched) '
+                'VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT(url) DO UPDATE SET last_fetched = excluded.last_fetched',
+                (url, spider_name, STATUS_FETCHED, now, now)
+            )
+
+    def mark_stored(self, entries, spider_name=None):
+        """
+        Record URLs the backend accepted (created, updated or duplicate)
+
+        Args:
+            entries: Iterable of (url, content_hash)
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT INTO seen_urls (url, spider, status, content_hash, first_seen, last_fetched) '
+                'VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(url) DO UPDATE SET status = excluded.status, '
+                'content_hash = excluded.content_hash, last_fetched = excluded.last_fetched',
+                [(url, spider_name, STATUS_STORED, content_hash, now, now) for url, content_hash in entries]
+            )
+
+    def get_validators(self, url):
+        """(etag, last_modified) recorded for a page, or (None, None)"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified FROM http_validators WHERE url = ?', (url,)
+            ).fetchone()
+        return row or (None, None)
+
+    def set_validators(self, url, etag, last_modified):
+        """Record the validators of a page (clears them if the server sent none)"""
+        with self._lock, self._conn:
+            if etag or last_modified:
+                self._conn.execute(
+                    'INSERT INTO http_validators (url, etag, last_modified, updated) '
+                    'VALUES (?, ?, ?, ?) '
+                    'ON CONFLICT(url) DO UPDATE SET etag = excluded.etag, '
+                    'last_modified = excluded.last_modified, updated = excluded.updated',
+                    (url, etag, last_modified, time.time())
+                )
+            else:
+                self._conn.execute('DELETE FROM http_validators WHERE url = ?', (url,))
@@ -1,4 +1,5 @@
 # Scrapy settings for whut_spider project
+import os
 
 BOT_NAME = 'whut_spider'
 
@@ -33,12 +34,15 @@ DEFAULT_REQUEST_HEADERS = {
 # Enable or disable spider middlewares
 SPIDER_MIDDLEWARES = {
     'whut_spider.middlewares.DuplicateFilterMiddleware': 100,
+    'whut_spider.middlewares.SeenURLMiddleware': 200,
 }
 
 # Enable or disable downloader middlewares
 DOWNLOADER_MIDDLEWARES = {
     'whut_spider.middlewares.ProxyMiddleware': 350,
     'whut_spider.middlewares.RandomUserAgentMiddleware': 400,
+    'whut_spider.middlewares.ConditionalRequestMiddleware': 500,
+    'whut_spider.middlewares.HostBudgetMiddleware': 800,
 }
 
 # Configure item pipelines
@@ -47,12 +51,48 @@ ITEM_PIPELINES = {
     'whut_spider.pipelines.BackendAPIPipeline': 300,
 }
 
-# Enable and configure HTTP caching
-HTTPCACHE_ENABLED = True
+# HTTP caching is replaced by conditional requests (below): an expiring
+# cache served stale homepages and re-downloaded everything after expiry
+HTTPCACHE_ENABLED = False
 HTTPCACHE_EXPIRATION_SECS = 86400  # 24 hours
 HTTPCACHE_DIR = 'httpcache'
 HTTPCACHE_IGNORE_HTTP_CODES = [500, 502, 503, 504, 400, 403, 404]
 
+# Conditional requests: list pages are revalidated with the ETag /
+# Last-Modified of the previous run (kept in SEEN_STORE_PATH); a 304 skips
+# the page without parsing it
+CONDITIONAL_REQUESTS_ENABLED = True
+CONDITIONAL_REQUEST_HOSTS = [
+    'i.whut.edu.cn',
+    'news.whut.edu.cn',
+    'zd.whut.edu.cn',
+    'youth.whut.edu.cn',
+]
+# Callbacks of pure list pages (no links to other list pages but the next one)
+CONDITIONAL_REQUEST_CALLBACKS = [
+    'parse_category',
+    'parse_category_page',
+    'parse_department',
+]
+
+# Per-host request budgets shared by all spiders and crawl processes (Redis
+# token buckets): requests per second to each host in total, however many
+# spiders are crawling it at the same time. DOWNLOAD_DELAY and AutoThrottle
+# still pace each spider on its own.
+HOST_BUDGET_ENABLED = True
+HOST_BUDGET_REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+HOST_BUDGET_REDIS_TIMEOUT = 0.5  # Seconds; on timeout the request goes ahead without a token
+HOST_BUDGET_THREADS = 2  # Threads per crawler for the Redis calls, kept off the reactor pool
+HOST_BUDGETS = {
+    'i.whut.edu.cn': 1.0,
+    'news.whut.edu.cn': 1.0,  # whut_news follows links here too
+    'zd.whut.edu.cn': 0.5,
+    'youth.whut.edu.cn': 1.0,
+    'oapub.whut.edu.cn': 0.5,
+    'ioa.whut.edu.cn': 0.5,
+}
+HOST_BUDGET_BURST = 2  # Requests a host may get at once after being idle
+
 # AutoThrottle settings
 AUTOTHROTTLE_ENABLED = True
 AUTOTHROTTLE_START_DELAY = 2
@@ -67,6 +107,27 @@ LOG_FORMAT = '%(asctime)s [%(name)s] %(levelname)s: %(message)s'
 # For local development, use localhost; for Docker, use service name 'backend'
 BACKEND_API_URL = 'http://localhost:8000'
 
+# BackendAPIPipeline batching: items are POSTed to /api/news/bulk in batches
+# of up to BACKEND_BATCH_SIZE, or after BACKEND_BATCH_MAX_AGE seconds
+BACKEND_BATCH_SIZE = 50
+BACKEND_BATCH_MAX_AGE = 5.0
+BACKEND_QUEUE_SIZE = 500  # process_item blocks when this many items are waiting
+BACKEND_MAX_RETRIES = 5  # Retries on 5xx / network errors
+BACKEND_RETRY_BACKOFF = 1.0  # Seconds, doubled after each retry
+
+# Persistent seen-URL store (incremental crawling across runs)
+SEEN_STORE_ENABLED = True
+SEEN_STORE_PATH = '.scrapy/seen_urls.sqlite3'  # Shared by all spiders
+SEEN_REVISIT_DAYS = 30  # Re-fetch stored articles after this many days (0 = never)
+SEEN_RETRY_HOURS = 6  # Re-fetch pages that were fetched but never stored
+# Callbacks that parse article detail pages (the requests the store filters)
+SEEN_STORE_DETAIL_CALLBACKS = [
+    'parse_article',
+    'parse_document',
+    'parse_regulation',
+    'parse_meeting_detail',
+]
+
 # SOCKS5 Proxy configuration (for off-campus access to WHUT website)
 # Disabled - using VPN connection instead
 # HTTPPROXY_ENABLED = True
@@ -74,7 +135,12 @@ BACKEND_API_URL = 'http://localhost:8000'
 
 # Custom download handlers (using HTTPX with SOCKS5 support)
 # Disabled - using VPN connection with standard Scrapy handlers
+# The handler runs on asyncio, so enabling it also needs the asyncio reactor
+# TWISTED_REACTOR = 'twisted.internet.asyncioreactor.AsyncioSelectorReactor'
 # DOWNLOAD_HANDLERS = {
 #     'http': 'whut_spider.httpx_handler.HttpxDownloadHandler',
 #     'https': 'whut_spider.httpx_handler.HttpxDownloadHandler',
 # }
+HTTPX_HTTP2 = True
+HTTPX_MAX_CONNECTIONS_PER_PROXY = 16  # Connection pool size per proxy (or direct)
+HTTPX_KEEPALIVE_EXPIRY = 30  # Seconds an idle connection is kept open
@@ -0,0 +1,241 @@
+"""
+Shared base spider for the WHUT sites
+
+All regular expressions and XPath expressions used by more than one spider
+are compiled once at import. Article content is located with a single XPath
+over every candidate container instead of one CSS query per selector; the
+containers are then ranked by CONTENT_SELECTORS order in Python.
+
+Spiders with an ArticleExtractor can switch their article callback to the
+single-pass lxml engine (whut_spider.extraction) with the extraction_engine
+attribute, or per run with -a extraction_engine=lxml.
+"""
+import re
+from datetime import datetime
+from html import unescape
+import scrapy
+from lxml import etree
+from whut_spider.extraction import ENGINES, WHITESPACE_RE, SimpleSelector, node_text
+
+# Text cleanup
+TAG_RE = re.compile(r'<[^>]+>')
+CLASS_ATTR_RE = re.compile(r'\s*class\s*=\s*["\'][^"\']*["\']')
+STYLE_ATTR_RE = re.compile(r'\s*style\s*=\s*["\'][^"\']*["\']')
+CMS_MARKER_RE = re.compile(r'\.?\bTRS_Editor\b|\.(wp_articlecontent|vsb_content|article-content)\b')
+
+# Dates
+ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+SLASH_DATE_RE = re.compile(r'\d{4}/\d{2}/\d{2}')
+CN_DATE_RE = re.compile(r'(\d{4})年(\d{1,2})月(\d{1,2})日')
+MONTH_DAY_RE = re.compile(r'(\d{1,2})-(\d{1,2})')
+ISO_DATE_IN_TEXT_RE = re.compile(r'(\d{4}-\d{2}-\d{2})')
+DATE_IN_TEXT_RE = re.compile(r'(\d{4}[-/]\d{2}[-/]\d{2})')
+
+# TRS list pages: createPageHTML(total_pages, current_index, ...)
+CREATE_PAGE_HTML_RE = re.compile(r'createPageHTML\((\d+),\s*(\d+)')
+
+# Department tag in titles, e.g. 【研究生院】
+DEPARTMENT_BRACKET_RE = re.compile(r'【(.+?)】')
+
+ATTACHMENT_SELECTOR = (
+    'div.attachments a, '
+    'div.attachment a, '
+    'a[href$=".pdf"], '
+    'a[href$=".doc"], '
+    'a[href$=".docx"], '
+    'a[href$=".xls"], '
+    'a[href$=".xlsx"]'
+)
+
+_PARAGRAPHS_XPATH = etree.XPath('.//p')
+
+
+class ContentLocator:
+    """
+    Finds content containers for an ordered list of simple selectors
+
+    Selectors are limited to the simple forms of SimpleSelector. One
+    compiled XPath union returns every candidate; each is then assigned to
+    the selectors it matches, so callers can walk them in priority order.
+    """
+
+    def __init__(self, selectors):
+        self.rules = [SimpleSelector(selector) for selector in selectors]
+        self.xpath = etree.XPath(' | '.join(rule.xpath for rule in self.rules)) if self.rules else None
+
+    def groups(self, root):
+        """Matched containers per selector, in selector order (empty groups skipped)"""
+        if self.xpath is None:
+            return []
+        groups = [[] for _ in self.rules]
+        for node in self.xpath(root):
+            for index, rule in enumerate(self.rules):
+                if rule.matches(node):
+                    groups[index].append(node)
+        return [group for group in groups if group]
+
+
+class WhutBaseSpider(scrapy.Spider):
+    """
+    Base class with the extraction helpers shared by the WHUT spiders
+
+    Subclasses set CONTENT_SELECTORS (tried in order) and may override
+    MIN_PARAGRAPH_LENGTH, PARSE_MONTH_DAY_DATES and ATTACHMENT_SELECTOR.
+    """
+
+    # 'selectors' (parsel queries) or 'lxml' (single-pass ArticleExtractor)
+    extraction_engine = 'selectors'
+
+    # ArticleExtractor for the lxml engine; spiders without one only support 'selectors'
+    ARTICLE_EXTRACTOR = None
+
+    # Article content containers, most specific first
+    CONTENT_SELECTORS = ()
+
+    # Paragraphs this short or shorter are dropped as fragments
+    MIN_PARAGRAPH_LENGTH = 0
+
+    # Accept "11-28" style dates (current year assumed)
+    PARSE_MONTH_DAY_DATES = False
+
+    ATTACHMENT_SELECTOR = ATTACHMENT_SELECTOR
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.content_locator = ContentLocator(cls.CONTENT_SELECTORS)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.extraction_engine not in ENGINES:
+            raise ValueError(f'Unknown extraction_engine {self.extraction_engine!r}, expected one of {ENGINES}')
+        if self.extraction_engine == 'lxml' and self.ARTICLE_EXTRACTOR is None:
+            raise ValueError(f'Spider {self.name} has no ARTICLE_EXTRACTOR and only supports extraction_engine=selectors')
+
+    def extract_paragraphs(self, response):
+        """
+        Paragraph texts of the first content container that has any
+
+        All containers matched by the same selector contribute, in document
+        order; paragraphs nested in more than one container count once.
+        """
+        for containers in self.content_locator.groups(response.selector.root):
+            seen = set()
+            parts = []
+            for container in containers:
+                for paragraph in _PARAGRAPHS_XPATH(container):
+                    if paragraph in seen:
+                        continue
+                    seen.add(paragraph)
+                    text = node_text(paragraph)
+                    if text and len(text) > self.MIN_PARAGRAPH_LENGTH:
+                        parts.append(text)
+            if parts:
+                return parts
+        return []
+
+    def extract_container_text(self, response, min_length=50):
+        """Whole text of the first content container longer than min_length"""
+        for containers in self.content_locator.groups(response.selector.root):
+            text = node_text(containers[0])
+            if text and len(text) > min_length:
+                return text
+        return None
+
+    def extract_page_date(self, response, pattern=ISO_DATE_IN_TEXT_RE):
+        """Date string from the usual date spans, else the first date in the page"""
+        date_str = response.css('span.date::text, div.info span::text').get()
+        if not date_str:
+            date_match = pattern.search(response.text)
+            if date_match:
+                date_str = date_match.group(1)
+        return date_str
+
+    def extract_labelled(self, response, pattern):
+        """Value of a 'label：value' pair in the page (group 2 of pattern)"""
+        match = pattern.search(response.text)
+        return match.group(2) if match else None
+
+    def extract_attachments(self, response, limit=10):
+        """Downloadable attachment links as {'name', 'url'} dicts"""
+        attachments = []
+        for link in response.css(self.ATTACHMENT_SELECTOR)[:limit]:
+            href = link.css('::attr(href)').get()
+            name = link.css('::text').get()
+            if href:
+                attachments.append({
+                    'name': name.strip() if name else href.split('/')[-1],
+                    'url': response.urljoin(href)
+                })
+        return attachments
+
+    def page_index(self, response):
+        """(total pages, current index) from a TRS createPageHTML call, or None"""
+        page_match = CREATE_PAGE_HTML_RE.search(response.text)
+        if page_match:
+            return int(page_match.group(1)), int(page_match.group(2))
+        return None
+
+    def extract_department_from_title(self, title):
+        """
+        Extract department/college name from title with 【】 brackets
+        """
+        if not title:
+            return None
+
+        dept_match = DEPARTMENT_BRACKET_RE.search(title)
+        if dept_match:
+            return dept_match.group(1)
+
+        return None
+
+    def clean_html(self, text):
+        """
+        Clean HTML tags, CSS class names, and extra whitespace from text
+        """
+        if not text:
+            return text
+
+        text = TAG_RE.sub('', text)
+        text = CLASS_ATTR_RE.sub('', text)
+        text = STYLE_ATTR_RE.sub('', text)
+        text = CMS_MARKER_RE.sub('', text)
+        text = unescape(text)
+        text = WHITESPACE_RE.sub(' ', text)
+
+        return text.strip()
+
+    def parse_date(self, date_str):
+        """
+        Parse the date formats found on the WHUT sites to ISO format
+        """
+        if not date_str:
+            return None
+
+        try:
+            date_str = date_str.strip()
+
+            # Format 1: "2025-11-28"
+            if ISO_DATE_RE.match(date_str):
+                return datetime.strptime(date_str[:10], '%Y-%m-%d').isoformat()
+
+            # Format 2: "2025年11月28日"
+            match = CN_DATE_RE.search(date_str)
+            if match:
+                year, month, day = match.groups()
+                return datetime(int(year), int(month), int(day)).isoformat()
+
+            # Format 3: "2025/11/28"
+            if SLASH_DATE_RE.match(date_str):
+                return datetime.strptime(date_str[:10], '%Y/%m/%d').isoformat()
+
+            # Format 4: "11-28" (current year assumed)
+            if self.PARSE_MONTH_DAY_DATES:
+                match = MONTH_DAY_RE.search(date_str)
+                if match:
+                    month, day = match.groups()
+                    return datetime(datetime.now().year, int(month), int(day)).isoformat()
+
+        except Exception as e:
+            self.logger.warning(f'Failed to parse date: {date_str}, error: {e}')
+
+        return None
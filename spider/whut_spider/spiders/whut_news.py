@@ -1,11 +1,32 @@
 import scrapy
-from datetime import datetime
+from whut_spider.seen_store import has_unseen_articles
+from whut_spider.extraction import ArticleExtractor
 from whut_spider.items import NewsItem
+from whut_spider.spiders.base import WhutBaseSpider, WHITESPACE_RE
 import re
 import hashlib
-from html import unescape
-
-class WhutNewsSpider(scrapy.Spider):
+from lxml import etree
+
+DATE_LABEL_RE = re.compile(r'^发布时间[：:]\s*')
+SOURCE_LABEL_RE = re.compile(r'^信息来源[：:]\s*')
+AUTHOR_RE = re.compile(r'(作者|撰稿|编辑)[：:]\s*([^\s\u3000]+)')
+PUBLISHER_RE = re.compile(r'(来源|发布单位|供稿|单位|发布部门|发布者)[：:]\s*([^\s\u3000\|]+)')
+META_PUBLISHER_RE = re.compile(r'(来源|发布单位|供稿)[：:]([^<\s]+)')
+COUNT_PAGE_RE = re.compile(r'var countPage = (\d+);')
+CURRENT_PAGE_RE = re.compile(r'var currentPage = (\d+);')
+
+# Last resort when no content container has paragraphs
+CONTENT_TEXT_XPATH = etree.XPath(
+    '//div[contains(@class, "article_content")]//text() | '
+    '//div[contains(@class, "content")]//text() | '
+    '//div[contains(@class, "article")]//text() | '
+    '//div[@id="vsb_content"]//text() | '
+    '//div[@class="TRS_Editor"]//text()',
+    smart_strings=False
+)
+
+
+class WhutNewsSpider(WhutBaseSpider):
     """
     Spider for Wuhan University of Technology news website (http://i.whut.edu.cn)
 
@@ -25,6 +46,53 @@ class WhutNewsSpider(scrapy.Spider):
     # Track visited URLs to avoid duplicates
     visited_urls = set()
 
+    CONTENT_SELECTORS = (
+        'div.article_content',    # New redesigned site
+        'div.TRS_Editor',         # TRS CMS (WHUT uses this)
+        'div.article-content',
+        'div.content',
+        'div.article-body',
+        'div.article',
+        'div.wp_articlecontent',
+        'div#vsb_content',
+        'div.text',
+        'article',
+    )
+
+    PARSE_MONTH_DAY_DATES = True
+
+    IMAGE_CONTAINERS = (
+        'div.article_content',
+        'div.TRS_Editor',
+        'div.article-content',
+        'div.content',
+        'div.wp_articlecontent',
+        'div#vsb_content',
+        'article',
+    )
+
+    # Single-pass equivalent of the selector queries in _article_fields
+    ARTICLE_EXTRACTOR = ArticleExtractor(
+        content=CONTENT_SELECTORS,
+        images=IMAGE_CONTAINERS,
+        image_alts=('div.article_content', 'div.TRS_Editor'),
+        attachment_containers=('div.attachments', 'div.attachment'),
+        fields={
+            'page_title': ('#NewsArticleTitle',),
+            'article_title': ('h2.article_title',),
+            'pub_day': ('#NewsArticlePubDay',),
+            'visible_date': ('span.date',),
+            'author': ('#NewsArticleAuthor',),
+            'author_tag': ('span.author', 'div.author'),
+            'source': ('#NewsArticleSource',),
+            'source_tag': ('span.source',),
+            'publisher_tag': ('div.source', 'span.publisher'),
+        },
+        elements={'meta': ('div.xl-tie p', 'div.article-meta')},
+    )
+
+    extraction_engine = 'lxml'
+
     def parse(self, response):
         """
         Route to appropriate parser based on URL
@@ -131,6 +199,60 @@ class WhutNewsSpider(scrapy.Spider):
                     }
                 )
 
+    def _article_fields(self, response):
+        """
+        Raw article fields with one parsel query each
+
+        Fields only consulted when an earlier one is missing are callables,
+        so their queries run only on the pages that need them.
+        """
+        images = response.css(', '.join(f'{c} img::attr(src)' for c in self.IMAGE_CONTAINERS)).getall()
+        return {
+            'page_title': response.css('#NewsArticleTitle::text').get(),
+            'article_title': lambda: response.css('h2.article_title::text').get(),
+            'paragraphs': self.extract_paragraphs(response),
+            'image_alts': lambda: response.css(
+                'div.article_content img::attr(alt), div.TRS_Editor img::attr(alt)'
+            ).getall(),
+            'pub_day': response.css('#NewsArticlePubDay::text').get(),
+            'visible_date': lambda: response.css('span.date::text').get(),
+            'author': response.css('#NewsArticleAuthor::text').get(),
+            'author_tag': lambda: response.css('span.author::text, div.author::text').get(),
+            'source': response.css('#NewsArticleSource::text').get(),
+            'source_tag': lambda: response.css('span.source::text').get(),
+            'publisher_tag': lambda: response.css('div.source::text, span.publisher::text').get(),
+            'meta_blocks': lambda: response.css('div.xl-tie p, div.article-meta').getall(),
+            'images': images,
+            'attachments': self.extract_attachments(response),
+        }
+
+    def _article_fields_lxml(self, response):
+        """The same fields from a single walk of the lxml tree"""
+        extracted = self.ARTICLE_EXTRACTOR.extract(response.selector.root)
+        values = extracted['fields']
+        # The walk already found every field; fallbacks stay callables to match _article_fields
+        return {
+            'page_title': values['page_title'],
+            'article_title': lambda: values['article_title'],
+            'paragraphs': extracted['paragraphs'],
+            'image_alts': lambda: extracted['image_alts'],
+            'pub_day': values['pub_day'],
+            'visible_date': lambda: values['visible_date'],
+            'author': values['author'],
+            'author_tag': lambda: values['author_tag'],
+            'source': values['source'],
+            'source_tag': lambda: values['source_tag'],
+            'publisher_tag': lambda: values['publisher_tag'],
+            'meta_blocks': lambda: [
+                etree.tostring(node, encoding='unicode', with_tail=False) for node in extracted['elements']['meta']
+            ],
+            'images': extracted['images'],
+            'attachments': [
+                {'name': name.strip() if name else href.split('/')[-1], 'url': response.urljoin(href)}
+                for href, name in extracted['attachments']
+            ],
+        }
+
     def parse_article(self, response):
         """
         Parse individual news article page
@@ -145,64 +267,37 @@ class WhutNewsSpider(scrapy.Spider):
         if not department:
             department = self.extract_department_from_title(title)
 
+        if self.extraction_engine == 'lxml':
+            fields = self._article_fields_lxml(response)
+        else:
+            fields = self._article_fields(response)
+
         # --- Title: prefer structured hidden metadata, then h2.article_title ---
-        page_title = response.css('#NewsArticleTitle::text').get()
+        page_title = fields['page_title']
         if page_title:
             page_title = page_title.strip()
         if not page_title:
-            page_title = response.css('h2.article_title::text').get()
+            page_title = fields['article_title']()
             if page_title:
                 page_title = page_title.strip()
         if page_title:
             title = page_title
 
         # --- Content extraction ---
-        content_parts = []
-
-        content_div_selectors = [
-            'div.article_content',    # New redesigned site
-            'div.TRS_Editor',         # TRS CMS (WHUT uses this)
-            'div.article-content',
-            'div.content',
-            'div.article-body',
-            'div.article',
-            'div.wp_articlecontent',
-            'div#vsb_content',
-            'div.text',
-            'article',
-        ]
-
-        for div_selector in content_div_selectors:
-            paragraphs = response.css(f'{div_selector} p')
-            if paragraphs:
-                for p in paragraphs:
-                    p_text = ' '.join(p.css('*::text, ::text').getall())
-                    p_text = re.sub(r'\s+', ' ', p_text).strip()
-                    if p_text:
-                        content_parts.append(p_text)
-                if content_parts:
-                    break
-
-        content = '\n\n'.join(content_parts) if content_parts else ''
+        content = '\n\n'.join(fields['paragraphs'])
 
         # Fallback: XPath text extraction
         if not content:
-            content_xpath = response.xpath(
-                '//div[contains(@class, "article_content")]//text() | '
-                '//div[contains(@class, "content")]//text() | '
-                '//div[contains(@class, "article")]//text() | '
-                '//div[@id="vsb_content"]//text() | '
-                '//div[@class="TRS_Editor"]//text()'
-            ).getall()
+            content_xpath = CONTENT_TEXT_XPATH(response.selector.root)
             if content_xpath:
                 content = ' '.join([t.strip() for t in content_xpath if t.strip()])
-                content = re.sub(r'\s+', ' ', content).strip()
+                content = WHITESPACE_RE.sub(' ', content).strip()
 
         content = self.clean_html(content)
 
         # Fallback for image-only posts
         if not content and title:
-            img_alts = response.css('div.article_content img::attr(alt), div.TRS_Editor img::attr(alt)').getall()
+            img_alts = fields['image_alts']()
             if img_alts:
                 img_text = '; '.join([alt.strip() for alt in img_alts if alt.strip()])
                 content = f"[图片公告] {img_text}" if img_text else f"[图片公告] {title}"
@@ -210,63 +305,49 @@ class WhutNewsSpider(scrapy.Spider):
                 content = f"[图片公告] 详见附图"
 
         # --- Date: prefer structured hidden metadata ---
-        pub_day = response.css('#NewsArticlePubDay::text').get()
+        pub_day = fields['pub_day']
         if pub_day:
             pub_day = pub_day.strip()
         published_at = self.parse_date(pub_day) if pub_day else None
         if not published_at:
             # Try visible date span (strip label prefix)
-            visible_date = response.css('span.date::text').get()
+            visible_date = fields['visible_date']()
             if visible_date:
-                visible_date = re.sub(r'^发布时间[：:]\s*', '', visible_date.strip())
+                visible_date = DATE_LABEL_RE.sub('', visible_date.strip())
             published_at = self.parse_date(visible_date) if visible_date else None
         if not published_at and date_str:
             published_at = self.parse_date(date_str)
 
         # --- Author: prefer structured hidden metadata ---
-        author = response.css('#NewsArticleAuthor::text').get()
+        author = fields['author']
         if author:
             author = author.strip() or None
         if not author:
-            author = response.css('span.author::text, div.author::text').get()
+            author = fields['author_tag']()
         if not author:
-            author_match = re.search(r'(作者|撰稿|编辑)[：:]\s*([^\s\u3000]+)', response.text)
-            if author_match:
-                author = author_match.group(2)
+            author = self.extract_labelled(response, AUTHOR_RE)
 
         # --- Publisher: prefer structured hidden metadata ---
-        publisher = response.css('#NewsArticleSource::text').get()
+        publisher = fields['source']
         if publisher:
             publisher = publisher.strip() or None
         if not publisher:
-            source_text = response.css('span.source::text').get()
+            source_text = fields['source_tag']()
             if source_text:
-                publisher = re.sub(r'^信息来源[：:]\s*', '', source_text.strip()) or None
+                publisher = SOURCE_LABEL_RE.sub('', source_text.strip()) or None
         if not publisher:
-            publisher_match = re.search(r'(来源|发布单位|供稿|单位|发布部门|发布者)[：:]\s*([^\s\u3000\|]+)', response.text)
-            if publisher_match:
-                publisher = publisher_match.group(2).strip()
+            publisher = self.extract_labelled(response, PUBLISHER_RE)
         if not publisher:
-            publisher = response.css('div.source::text, span.publisher::text').get()
+            publisher = fields['publisher_tag']()
         if not publisher:
-            meta_section = response.css('div.xl-tie p, div.article-meta').getall()
-            for meta_html in meta_section:
-                pub_match = re.search(r'(来源|发布单位|供稿)[：:]([^<\s]+)', meta_html)
+            for meta_html in fields['meta_blocks']():
+                pub_match = META_PUBLISHER_RE.search(meta_html)
                 if pub_match:
                     publisher = pub_match.group(2).strip()
                     break
 
         # --- Images ---
-        images = response.css(
-            'div.article_content img::attr(src), '
-            'div.TRS_Editor img::attr(src), '
-            'div.article-content img::attr(src), '
-            'div.content img::attr(src), '
-            'div.wp_articlecontent img::attr(src), '
-            'div#vsb_content img::attr(src), '
-            'article img::attr(src)'
-        ).getall()
-        images = [response.urljoin(img) for img in images if img and not img.endswith('.gif')]
+        images = [response.urljoin(img) for img in fields['images'] if img and not img.endswith('.gif')]
 
         # Clean title
         title = self.clean_html(title) if title else title
@@ -278,24 +359,7 @@ class WhutNewsSpider(scrapy.Spider):
             summary = self.clean_html(summary)
 
         # Extract attachments if any
-        attachments = []
-        attachment_links = response.css(
-            'div.attachments a, '
-            'div.attachment a, '
-            'a[href$=".pdf"], '
-            'a[href$=".doc"], '
-            'a[href$=".docx"], '
-            'a[href$=".xls"], '
-            'a[href$=".xlsx"]'
-        )
-        for link in attachment_links[:10]:
-            href = link.css('::attr(href)').get()
-            name = link.css('::text').get()
-            if href:
-                attachments.append({
-                    'name': name.strip() if name else href.split('/')[-1],
-                    'url': response.urljoin(href)
-                })
+        attachments = fields['attachments']
 
         # Generate content hash for deduplication
         content_hash = hashlib.sha256(f"{title}{content}".encode()).hexdigest()
@@ -322,41 +386,6 @@ class WhutNewsSpider(scrapy.Spider):
         else:
             self.logger.warning(f'Incomplete data for URL: {response.url} (title: {bool(title)}, content: {bool(content)})')
 
-    def clean_html(self, text):
-        """
-        Clean HTML tags, CSS class names, and extra whitespace from text
-        """
-        if not text:
-            return text
-
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
-
-        # Remove CSS class attributes like class="TRS_Editor"
-        text = re.sub(r'\s*class\s*=\s*["\'][^"\']*["\']', '', text)
-        text = re.sub(r'\s*style\s*=\s*["\'][^"\']*["\']', '', text)
-
-        # Remove common CMS markers and class names
-        text = re.sub(r'\.TRS_Editor\b', '', text)
-        text = re.sub(r'\bTRS_Editor\b', '', text)
-        text = re.sub(r'\.(wp_articlecontent|vsb_content|article-content)\b', '', text)
-
-        # Remove JavaScript and CSS remnants
-        text = re.sub(r'<script[^>]*>.*?</script>', '', text, flags=re.DOTALL | re.IGNORECASE)
-        text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.DOTALL | re.IGNORECASE)
-
-        # Remove HTML entities
-        text = unescape(text)
-
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\n\s*\n+', '\n\n', text)
-
-        # Remove leading/trailing whitespace
-        text = text.strip()
-
-        return text
-
     def parse_category(self, response):
         """
         Parse category page with sidebar navigation and article list
@@ -443,8 +472,18 @@ class WhutNewsSpider(scrapy.Spider):
         """
         Extract pagination info and follow next page
         """
-        count_match = re.search(r'var countPage = (\d+);', response.text)
-        current_match = re.search(r'var currentPage = (\d+);', response.text)
+        # Stop descending once a page lists only already-fetched articles
+        article_urls = [
+            response.urljoin(link)
+            for link in response.css('ul.list_t li a.list_text::attr(href)').getall()
+        ]
+        if not has_unseen_articles(self, article_urls):
+            self.logger.info(f'No new articles on {response.url}, stopping pagination')
+            self.crawler.stats.inc_value('seen_store/pagination_stopped', spider=self)
+            return
+
+        count_match = COUNT_PAGE_RE.search(response.text)
+        current_match = CURRENT_PAGE_RE.search(response.text)
 
         if count_match and current_match:
             total_pages = int(count_match.group(1))
@@ -485,52 +524,3 @@ class WhutNewsSpider(scrapy.Spider):
             return '综合新闻'
         else:
             return '综合新闻'
-
-    def extract_department_from_title(self, title):
-        """
-        Extract department/college name from title with 【】 brackets
-        """
-        if not title:
-            return None
-
-        dept_match = re.search(r'【(.+?)】', title)
-        if dept_match:
-            return dept_match.group(1)
-
-        return None
-
-    def parse_date(self, date_str):
-        """
-        Parse various date formats found on WHUT website
-        """
-        if not date_str:
-            return None
-
-        try:
-            date_str = date_str.strip()
-
-            # Format 1: "2025-11-28"
-            if re.match(r'\d{4}-\d{2}-\d{2}', date_str):
-                return datetime.strptime(date_str[:10], '%Y-%m-%d').isoformat()
-
-            # Format 2: "2025年11月28日"
-            match = re.search(r'(\d{4})年(\d{1,2})月(\d{1,2})日', date_str)
-            if match:
-                year, month, day = match.groups()
-                return datetime(int(year), int(month), int(day)).isoformat()
-
-            # Format 3: "2025/11/28"
-            if re.match(r'\d{4}/\d{2}/\d{2}', date_str):
-                return datetime.strptime(date_str[:10], '%Y/%m/%d').isoformat()
-
-            # Format 4: "11-28" or "02-14" (assume current year)
-            match = re.search(r'(\d{1,2})-(\d{1,2})', date_str)
-            if match:
-                month, day = match.groups()
-                year = datetime.now().year
-                return datetime(year, int(month), int(day)).isoformat()
-
-        except Exception as e:
-            self.logger.warning(f'Failed to parse date: {date_str}, error: {e}')
-
-        return None
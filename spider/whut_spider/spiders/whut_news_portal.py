@@ -1,12 +1,17 @@
 import scrapy
-from datetime import datetime
+from whut_spider.seen_store import has_unseen_articles
 from whut_spider.items import NewsItem
+from whut_spider.spiders.base import WhutBaseSpider, ISO_DATE_IN_TEXT_RE
 import re
 import hashlib
-from html import unescape
 
+ARTICLE_LINK_RE = re.compile(r't\d+_\d+\.shtml')
+TITLE_SUFFIX_RE = re.compile(r'-[^-]+$')
+AUTHOR_RE = re.compile(r'(作者|记者|撰稿|编辑)[：:]\s*([^\s\u3000<]+)')
+PUBLISHER_RE = re.compile(r'(来源|供稿|发布)[：:]\s*([^\s\u3000<|]+)')
 
-class WhutNewsPortalSpider(scrapy.Spider):
+
+class WhutNewsPortalSpider(WhutBaseSpider):
     """
     Spider for Wuhan University of Technology Official News Portal (https://news.whut.edu.cn)
 
@@ -47,6 +52,18 @@ class WhutNewsPortalSpider(scrapy.Spider):
     # Maximum pages to crawl per category
     max_pages_per_category = 5
 
+    # Common content selectors for news.whut.edu.cn
+    CONTENT_SELECTORS = (
+        'div.v_news_content',
+        'div.article-content',
+        'div.content',
+        'div.TRS_Editor',
+        'div.news_content',
+        'article',
+    )
+
+    MIN_PARAGRAPH_LENGTH = 10  # Skip very short fragments
+
     def parse(self, response):
         """
         Parse homepage and follow category links
@@ -112,6 +129,7 @@ class WhutNewsPortalSpider(scrapy.Spider):
             news_items = response.css('table tr')
 
         item_count = 0
+        page_urls = []
         for item in news_items:
             link = item.css('a::attr(href)').get()
             if not link:
@@ -122,7 +140,7 @@ class WhutNewsPortalSpider(scrapy.Spider):
                 continue
             if 'javascript:' in link.lower():
                 continue
-            if not re.search(r't\d+_\d+\.shtml', link) and not link.endswith('.shtml'):
+            if not ARTICLE_LINK_RE.search(link) and not link.endswith('.shtml'):
                 continue
 
             title = item.css('a::attr(title)').get()
@@ -136,12 +154,13 @@ class WhutNewsPortalSpider(scrapy.Spider):
             if not date_str:
                 # Try to find date pattern in text
                 item_text = item.get()
-                date_match = re.search(r'(\d{4}-\d{2}-\d{2})', item_text)
+                date_match = ISO_DATE_IN_TEXT_RE.search(item_text)
                 if date_match:
                     date_str = date_match.group(1)
 
             if link and title:
                 full_url = response.urljoin(link)
+                page_urls.append(full_url)
                 if full_url not in self.visited_urls:
                     self.visited_urls.add(full_url)
                     item_count += 1
@@ -157,8 +176,12 @@ class WhutNewsPortalSpider(scrapy.Spider):
 
         self.logger.info(f'Found {item_count} articles on {category} page {current_page}')
 
-        # Follow pagination if within limits
-        if current_page < self.max_pages_per_category:
+        # Follow pagination if within limits, stopping once a page lists
+        # only already-fetched articles
+        if not has_unseen_articles(self, page_urls):
+            self.logger.info(f'No new articles on {category} page {current_page}, stopping pagination')
+            self.crawler.stats.inc_value('seen_store/pagination_stopped', spider=self)
+        elif current_page < self.max_pages_per_category:
             # Try to find next page link
             next_page = self.get_next_page_url(response, cat_code, current_page)
             if next_page and next_page not in self.visited_urls:
@@ -182,10 +205,9 @@ class WhutNewsPortalSpider(scrapy.Spider):
 
         # Pattern 1: index_N.shtml where N decrements
         # Try to find pagination info in page
-        page_match = re.search(r'createPageHTML\((\d+),\s*(\d+)', response.text)
-        if page_match:
-            total_pages = int(page_match.group(1))
-            current_idx = int(page_match.group(2))
+        page_index = self.page_index(response)
+        if page_index:
+            total_pages, current_idx = page_index
             if current_idx + 1 < total_pages:
                 next_idx = current_idx + 1
                 return f'https://news.whut.edu.cn/{cat_code}/index_{next_idx}.shtml'
@@ -220,45 +242,16 @@ class WhutNewsPortalSpider(scrapy.Spider):
                 page_title = response.css('title::text').get()
                 if page_title:
                     # Remove common suffixes like "-武汉理工大学新闻经纬"
-                    page_title = re.sub(r'-[^-]+$', '', page_title).strip()
+                    page_title = TITLE_SUFFIX_RE.sub('', page_title).strip()
                     if len(page_title) >= 5:
                         title = page_title
 
-        # Extract content
-        content_parts = []
-
-        # Common content selectors for news.whut.edu.cn
-        content_selectors = [
-            'div.v_news_content',
-            'div.article-content',
-            'div.content',
-            'div.TRS_Editor',
-            'div.news_content',
-            'article',
-        ]
-
-        for selector in content_selectors:
-            paragraphs = response.css(f'{selector} p')
-            if paragraphs:
-                for p in paragraphs:
-                    p_text = ' '.join(p.css('*::text, ::text').getall())
-                    p_text = re.sub(r'\s+', ' ', p_text).strip()
-                    if p_text and len(p_text) > 10:  # Skip very short fragments
-                        content_parts.append(p_text)
-                if content_parts:
-                    break
-
-        # If no paragraphs, try getting all text from content div
+        # Extract content, else all text of the content div
+        content_parts = self.extract_paragraphs(response)
         if not content_parts:
-            for selector in content_selectors:
-                content_div = response.css(f'{selector}').get()
-                if content_div:
-                    # Extract text, removing tags
-                    text = re.sub(r'<[^>]+>', ' ', content_div)
-                    text = re.sub(r'\s+', ' ', text).strip()
-                    if text and len(text) > 50:
-                        content_parts = [text]
-                        break
+            text = self.extract_container_text(response)
+            if text:
+                content_parts = [text]
 
         content = '\n\n'.join(content_parts) if content_parts else ''
         content = self.clean_html(content)
@@ -270,25 +263,15 @@ class WhutNewsPortalSpider(scrapy.Spider):
 
         # Extract date from page if not provided
         if not date_str:
-            date_str = response.css('span.date::text, div.info span::text').get()
-            if not date_str:
-                date_match = re.search(r'(\d{4}-\d{2}-\d{2})', response.text)
-                if date_match:
-                    date_str = date_match.group(1)
+            date_str = self.extract_page_date(response)
 
         published_at = self.parse_date(date_str) if date_str else None
 
         # Extract author
-        author = None
-        author_match = re.search(r'(作者|记者|撰稿|编辑)[：:]\s*([^\s\u3000<]+)', response.text)
-        if author_match:
-            author = author_match.group(2)
+        author = self.extract_labelled(response, AUTHOR_RE)
 
         # Extract source/publisher
-        publisher = None
-        source_match = re.search(r'(来源|供稿|发布)[：:]\s*([^\s\u3000<|]+)', response.text)
-        if source_match:
-            publisher = source_match.group(2)
+        publisher = self.extract_labelled(response, PUBLISHER_RE)
 
         # Extract images
         images = response.css(
@@ -332,48 +315,3 @@ class WhutNewsPortalSpider(scrapy.Spider):
             if f'/{code}/' in url:
                 return name
         return '综合新闻'
-
-    def clean_html(self, text):
-        """
-        Clean HTML tags and extra whitespace from text
-        """
-        if not text:
-            return text
-
-        text = re.sub(r'<[^>]+>', '', text)
-        text = re.sub(r'\s*class\s*=\s*["\'][^"\']*["\']', '', text)
-        text = re.sub(r'\s*style\s*=\s*["\'][^"\']*["\']', '', text)
-        text = unescape(text)
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
-
-        return text
-
-    def parse_date(self, date_str):
-        """
-        Parse various date formats
-        """
-        if not date_str:
-            return None
-
-        try:
-            date_str = date_str.strip()
-
-            # Format: "2025-12-22"
-            if re.match(r'\d{4}-\d{2}-\d{2}', date_str):
-                return datetime.strptime(date_str[:10], '%Y-%m-%d').isoformat()
-
-            # Format: "2025年12月22日"
-            match = re.search(r'(\d{4})年(\d{1,2})月(\d{1,2})日', date_str)
-            if match:
-                year, month, day = match.groups()
-                return datetime(int(year), int(month), int(day)).isoformat()
-
-            # Format: "2025/12/22"
-            if re.match(r'\d{4}/\d{2}/\d{2}', date_str):
-                return datetime.strptime(date_str[:10], '%Y/%m/%d').isoformat()
-
-        except Exception as e:
-            self.logger.warning(f'Failed to parse date: {date_str}, error: {e}')
-
-        return None
@@ -1,13 +1,19 @@
 import scrapy
-from datetime import datetime
 from whut_spider.items import NewsItem
+from whut_spider.spiders.base import WhutBaseSpider, ISO_DATE_RE, DATE_IN_TEXT_RE
 import re
 import hashlib
-from html import unescape
 import json
 
+OPEN_WINDOW_ID_RE = re.compile(r"OpenNewWindow\(['\"](-?\d+)['\"]\)")
+PAGE_PARAM_RE = re.compile(r'page=(\d+)')
+# Document numbers like 校党字〔2024〕1号
+DOC_NUMBER_RE = re.compile(r'([校党政办纪教研学团工委]+[〔\[]\d{4}[〕\]]\d+号)')
+# Title prefixes like "学校文件:"
+TITLE_PREFIX_RE = re.compile(r'^[^:：]+[:：]\s*')
 
-class WhutOADocumentsSpider(scrapy.Spider):
+
+class WhutOADocumentsSpider(WhutBaseSpider):
     """
     Spider for Wuhan University of Technology OA Public Documents
     (http://oapub.whut.edu.cn:8080/seeyon-pub/article/)
@@ -131,7 +137,7 @@ class WhutOADocumentsSpider(scrapy.Spider):
                 continue
 
             # Extract ID from JavaScript:OpenNewWindow('id') - ID can be negative
-            id_match = re.search(r"OpenNewWindow\(['\"](-?\d+)['\"]\)", href)
+            id_match = OPEN_WINDOW_ID_RE.search(href)
             if not id_match:
                 continue
 
@@ -161,7 +167,7 @@ class WhutOADocumentsSpider(scrapy.Spider):
                 cell_text = cell.css('::text').get()
                 if cell_text:
                     cell_text = cell_text.strip()
-                    if re.match(r'\d{4}-\d{2}-\d{2}', cell_text):
+                    if ISO_DATE_RE.match(cell_text):
                         date_str = cell_text
                         break
 
@@ -191,7 +197,7 @@ class WhutOADocumentsSpider(scrapy.Spider):
             full_url = response.urljoin(page_link)
             if full_url not in self.visited_urls:
                 # Check if this is within page limit
-                page_match = re.search(r'page=(\d+)', page_link)
+                page_match = PAGE_PARAM_RE.search(page_link)
                 if page_match:
                     page_num = int(page_match.group(1))
                     if page_num <= self.max_pages_per_category:
@@ -249,10 +255,7 @@ class WhutOADocumentsSpider(scrapy.Spider):
                 cell_text = cell.css('::text').get()
                 if cell_text:
                     # Look for patterns like 校党字〔2024〕1号
-                    doc_match = re.search(
-                        r'([校党政办纪教研学团工委]+[〔\[]\d{4}[〕\]]\d+号)',
-                        cell_text
-                    )
+                    doc_match = DOC_NUMBER_RE.search(cell_text)
                     if doc_match:
                         doc_number = doc_match.group(1)
                         break
@@ -262,7 +265,7 @@ class WhutOADocumentsSpider(scrapy.Spider):
             for cell in cells:
                 cell_text = cell.css('::text').get()
                 if cell_text:
-                    date_match = re.search(r'(\d{4}[-/]\d{2}[-/]\d{2})', cell_text)
+                    date_match = DATE_IN_TEXT_RE.search(cell_text)
                     if date_match:
                         date_str = date_match.group(1)
                         break
@@ -322,7 +325,7 @@ class WhutOADocumentsSpider(scrapy.Spider):
             date_str = item.css('span.date::text, span.time::text').get()
             if not date_str:
                 item_text = item.get()
-                date_match = re.search(r'(\d{4}[-/]\d{2}[-/]\d{2})', item_text)
+                date_match = DATE_IN_TEXT_RE.search(item_text)
                 if date_match:
                     date_str = date_match.group(1)
 
@@ -434,10 +437,9 @@ class WhutOADocumentsSpider(scrapy.Spider):
         Handle pagination for document lists
         """
         # Look for createPageHTML pattern (common in Chinese CMS)
-        page_match = re.search(r'createPageHTML\((\d+),\s*(\d+)', response.text)
-        if page_match:
-            total_pages = int(page_match.group(1))
-            current_idx = int(page_match.group(2))
+        page_index = self.page_index(response)
+        if page_index:
+            total_pages, current_idx = page_index
             if current_idx + 1 < total_pages and current_idx < self.max_pages_per_category:
                 next_idx = current_idx + 1
                 if next_idx == 0:
@@ -521,7 +523,7 @@ class WhutOADocumentsSpider(scrapy.Spider):
             title = response.css('title::text').get()
             if title:
                 # Remove prefix like "学校文件:"
-                title = re.sub(r'^[^:：]+[:：]\s*', '', title)
+                title = TITLE_PREFIX_RE.sub('', title)
                 title = title.strip()
 
         # Extract attachments - Seeyon uses file download links
@@ -621,45 +623,3 @@ class WhutOADocumentsSpider(scrapy.Spider):
             if code in url:
                 return code
         return 'xzwj_list'
-
-    def clean_html(self, text):
-        """
-        Clean HTML tags and extra whitespace
-        """
-        if not text:
-            return text
-
-        text = re.sub(r'<[^>]+>', '', text)
-        text = re.sub(r'\s*class\s*=\s*["\'][^"\']*["\']', '', text)
-        text = re.sub(r'\s*style\s*=\s*["\'][^"\']*["\']', '', text)
-        text = unescape(text)
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
-
-        return text
-
-    def parse_date(self, date_str):
-        """
-        Parse date string to ISO format
-        """
-        if not date_str:
-            return None
-
-        try:
-            date_str = date_str.strip()
-
-            if re.match(r'\d{4}-\d{2}-\d{2}', date_str):
-                return datetime.strptime(date_str[:10], '%Y-%m-%d').isoformat()
-
-            if re.match(r'\d{4}/\d{2}/\d{2}', date_str):
-                return datetime.strptime(date_str[:10], '%Y/%m/%d').isoformat()
-
-            match = re.search(r'(\d{4})年(\d{1,2})月(\d{1,2})日', date_str)
-            if match:
-                year, month, day = match.groups()
-                return datetime(int(year), int(month), int(day)).isoformat()
-
-        except Exception as e:
-            self.logger.warning(f'Failed to parse date: {date_str}, error: {e}')
-
-        return None
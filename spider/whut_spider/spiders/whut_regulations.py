@@ -1,12 +1,16 @@
 import scrapy
-from datetime import datetime
+from whut_spider.seen_store import has_unseen_articles
 from whut_spider.items import NewsItem
+from whut_spider.spiders.base import WhutBaseSpider, ISO_DATE_IN_TEXT_RE
 import re
 import hashlib
-from html import unescape
 
+DOC_NUMBER_RE = re.compile(r'([（(]\s*[\u4e00-\u9fa5]+\s*[〔\[]\s*\d{4}\s*[〕\]]\s*\d+\s*号\s*[）)])')
+ISSUER_RE = re.compile(r'(发布单位|发文单位|制定部门)[：:]\s*([^\s\u3000<|]+)')
+PDF_VIEWER_RE = re.compile(r'showPdf\(["\']([^"\']+\.pdf)["\']')
 
-class WhutRegulationsSpider(scrapy.Spider):
+
+class WhutRegulationsSpider(WhutBaseSpider):
     """
     Spider for Wuhan University of Technology Regulations Database (https://zd.whut.edu.cn)
 
@@ -39,6 +43,24 @@ class WhutRegulationsSpider(scrapy.Spider):
     # Maximum pages per category
     max_pages_per_category = 3
 
+    CONTENT_SELECTORS = (
+        'div.v_news_content',
+        'div.article-content',
+        'div.content',
+        'div.TRS_Editor',
+        'div.wp_articlecontent',
+        'article',
+    )
+
+    MIN_PARAGRAPH_LENGTH = 5
+
+    # Regulations often have PDF/DOC attachments
+    ATTACHMENT_SELECTOR = (
+        'a[href$=".pdf"], a[href$=".doc"], a[href$=".docx"], '
+        'a[href$=".xls"], a[href$=".xlsx"], div.attachment a, '
+        'div.article-enclosure a'
+    )
+
     def parse(self, response):
         """
         Parse homepage and follow category links
@@ -71,6 +93,7 @@ class WhutRegulationsSpider(scrapy.Spider):
         rows = response.css('table tr, ul.list li, div.list li')
 
         item_count = 0
+        page_urls = []
         for row in rows:
             # Skip header rows
             if row.css('th'):
@@ -94,12 +117,13 @@ class WhutRegulationsSpider(scrapy.Spider):
             date_str = row.css('td:last-child::text, span.date::text').get()
             if not date_str:
                 row_text = row.get()
-                date_match = re.search(r'(\d{4}-\d{2}-\d{2})', row_text)
+                date_match = ISO_DATE_IN_TEXT_RE.search(row_text)
                 if date_match:
                     date_str = date_match.group(1)
 
             if link and title:
                 full_url = response.urljoin(link)
+                page_urls.append(full_url)
                 if full_url not in self.visited_urls:
                     self.visited_urls.add(full_url)
                     item_count += 1
@@ -116,7 +140,11 @@ class WhutRegulationsSpider(scrapy.Spider):
         self.logger.info(f'Found {item_count} regulations on {category} page {current_page}')
 
         # Handle pagination
-        if current_page < self.max_pages_per_category:
+        # Stop descending once a page lists only already-fetched articles
+        if not has_unseen_articles(self, page_urls):
+            self.logger.info(f'No new articles on {category} page {current_page}, stopping pagination')
+            self.crawler.stats.inc_value('seen_store/pagination_stopped', spider=self)
+        elif current_page < self.max_pages_per_category:
             next_page_url = self.get_next_page_url(response, cat_code, current_page)
             if next_page_url and next_page_url not in self.visited_urls:
                 self.visited_urls.add(next_page_url)
@@ -135,10 +163,9 @@ class WhutRegulationsSpider(scrapy.Spider):
         Construct next page URL
         """
         # Look for createPageHTML pattern
-        page_match = re.search(r'createPageHTML\((\d+),\s*(\d+)', response.text)
-        if page_match:
-            total_pages = int(page_match.group(1))
-            current_idx = int(page_match.group(2))
+        page_index = self.page_index(response)
+        if page_index:
+            total_pages, current_idx = page_index
             if current_idx + 1 < total_pages:
                 next_idx = current_idx + 1
                 if next_idx == 0:
@@ -169,81 +196,34 @@ class WhutRegulationsSpider(scrapy.Spider):
 
         # Extract document number if present
         doc_number = None
-        doc_match = re.search(r'([（(]\s*[\u4e00-\u9fa5]+\s*[〔\[]\s*\d{4}\s*[〕\]]\s*\d+\s*号\s*[）)])', title or '')
+        doc_match = DOC_NUMBER_RE.search(title or '')
         if doc_match:
             doc_number = doc_match.group(1)
 
-        # Extract content
-        content_parts = []
-
-        content_selectors = [
-            'div.v_news_content',
-            'div.article-content',
-            'div.content',
-            'div.TRS_Editor',
-            'div.wp_articlecontent',
-            'article',
-        ]
-
-        for selector in content_selectors:
-            paragraphs = response.css(f'{selector} p')
-            if paragraphs:
-                for p in paragraphs:
-                    p_text = ' '.join(p.css('*::text, ::text').getall())
-                    p_text = re.sub(r'\s+', ' ', p_text).strip()
-                    if p_text and len(p_text) > 5:
-                        content_parts.append(p_text)
-                if content_parts:
-                    break
-
-        # Fallback: get all text from content div
+        # Extract content, else all text of the content div
+        content_parts = self.extract_paragraphs(response)
         if not content_parts:
-            for selector in content_selectors:
-                content_div = response.css(f'{selector}').get()
-                if content_div:
-                    text = re.sub(r'<[^>]+>', ' ', content_div)
-                    text = re.sub(r'\s+', ' ', text).strip()
-                    if text and len(text) > 50:
-                        content_parts = [text]
-                        break
+            text = self.extract_container_text(response)
+            if text:
+                content_parts = [text]
 
         content = '\n\n'.join(content_parts) if content_parts else ''
         content = self.clean_html(content)
 
         # Extract date from page
         if not date_str:
-            date_str = response.css('span.date::text, div.info span::text').get()
-            if not date_str:
-                date_match = re.search(r'(\d{4}-\d{2}-\d{2})', response.text)
-                if date_match:
-                    date_str = date_match.group(1)
+            date_str = self.extract_page_date(response)
 
         published_at = self.parse_date(date_str) if date_str else None
 
         # Extract issuing department
-        publisher = None
-        issuer_match = re.search(r'(发布单位|发文单位|制定部门)[：:]\s*([^\s\u3000<|]+)', response.text)
-        if issuer_match:
-            publisher = issuer_match.group(2)
-
-        # Extract attachments (regulations often have PDF/DOC attachments)
-        attachments = []
-        attachment_links = response.css(
-            'a[href$=".pdf"], a[href$=".doc"], a[href$=".docx"], '
-            'a[href$=".xls"], a[href$=".xlsx"], div.attachment a, '
-            'div.article-enclosure a'
-        )
-        for link in attachment_links[:10]:
-            href = link.css('::attr(href)').get()
-            name = link.css('::text').get()
-            if href:
-                attachments.append({
-                    'name': name.strip() if name else href.split('/')[-1],
-                    'url': response.urljoin(href)
-                })
+        publisher = self.extract_labelled(response, ISSUER_RE)
+
+        # Extract attachments
+        attachments = self.extract_attachments(response)
 
         # Also check for PDF in JavaScript (PDF.js rendering)
-        pdf_match = re.search(r'showPdf\(["\']([^"\']+\.pdf)["\']', response.text)
+        pdf_match = PDF_VIEWER_RE.search(response.text)
         if pdf_match:
             pdf_url = response.urljoin(pdf_match.group(1))
             if not any(a['url'] == pdf_url for a in attachments):
@@ -292,45 +272,3 @@ class WhutRegulationsSpider(scrapy.Spider):
                 content_hash=content_hash,
             )
             self.logger.info(f'Successfully scraped regulation: {title[:50]}...')
-
-    def clean_html(self, text):
-        """
-        Clean HTML tags and extra whitespace
-        """
-        if not text:
-            return text
-
-        text = re.sub(r'<[^>]+>', '', text)
-        text = re.sub(r'\s*class\s*=\s*["\'][^"\']*["\']', '', text)
-        text = re.sub(r'\s*style\s*=\s*["\'][^"\']*["\']', '', text)
-        text = unescape(text)
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
-
-        return text
-
-    def parse_date(self, date_str):
-        """
-        Parse date string to ISO format
-        """
-        if not date_str:
-            return None
-
-        try:
-            date_str = date_str.strip()
-
-            if re.match(r'\d{4}-\d{2}-\d{2}', date_str):
-                return datetime.strptime(date_str[:10], '%Y-%m-%d').isoformat()
-
-            match = re.search(r'(\d{4})年(\d{1,2})月(\d{1,2})日', date_str)
-            if match:
-                year, month, day = match.groups()
-                return datetime(int(year), int(month), int(day)).isoformat()
-
-            if re.match(r'\d{4}/\d{2}/\d{2}', date_str):
-                return datetime.strptime(date_str[:10], '%Y/%m/%d').isoformat()
-
-        except Exception as e:
-            self.logger.warning(f'Failed to parse date: {date_str}, error: {e}')
-
-        return None
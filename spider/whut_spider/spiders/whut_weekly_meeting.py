@@ -1,13 +1,25 @@
 import scrapy
 from datetime import datetime
 from whut_spider.items import NewsItem
+from whut_spider.spiders.base import WhutBaseSpider, TAG_RE
 import re
 import hashlib
 from html import unescape
 import json
 
+CLOCK_TIME_RE = re.compile(r'\d{1,2}[:\：]\d{2}')
+SECTION_SPLIT_RE = re.compile(r'\n\s*\n|\d+[、.]')
+MEETING_TIME_RE = re.compile(r'(\d{1,2}月\d{1,2}日|\d{1,2}[:\：]\d{2}|周[一二三四五六日]|星期[一二三四五六日天])')
+MEETING_LOCATION_RE = re.compile(
+    r'(地点|地址)[：:]\s*([^\n\r]+)|'
+    r'在([^\n\r]*?(?:楼|室|厅|馆|中心)[^\n\r]*)'
+)
+LOCATION_LABEL_RE = re.compile(r'地点[：:][^\n]+')
+MEETING_CN_DATE_RE = re.compile(r'(\d{4})?年?(\d{1,2})月(\d{1,2})日')
+MEETING_ISO_DATE_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
 
-class WhutWeeklyMeetingSpider(scrapy.Spider):
+
+class WhutWeeklyMeetingSpider(WhutBaseSpider):
     """
     Spider for Wuhan University of Technology Weekly Meeting Schedule
     (https://ioa.whut.edu.cn/seeyon/ext/NewWeekMeeting.do?method=pubIndex)
@@ -167,7 +179,7 @@ class WhutWeeklyMeetingSpider(scrapy.Spider):
 
             for text in all_texts:
                 # Time pattern
-                if re.match(r'\d{1,2}[:\：]\d{2}', text) or '时' in text:
+                if CLOCK_TIME_RE.match(text) or '时' in text:
                     meeting_info['time'] = text
                 # Location pattern (contains room/hall/building)
                 elif any(loc in text for loc in ['楼', '室', '厅', '会议', '馆']):
@@ -375,11 +387,11 @@ class WhutWeeklyMeetingSpider(scrapy.Spider):
         meetings = []
 
         # Clean HTML
-        text = re.sub(r'<[^>]+>', '\n', text)
+        text = TAG_RE.sub('\n', text)
         text = unescape(text)
 
         # Split by common meeting separators
-        sections = re.split(r'\n\s*\n|\d+[、.]', text)
+        sections = SECTION_SPLIT_RE.split(text)
 
         for section in sections:
             section = section.strip()
@@ -389,26 +401,19 @@ class WhutWeeklyMeetingSpider(scrapy.Spider):
             meeting = {}
 
             # Extract time
-            time_match = re.search(
-                r'(\d{1,2}月\d{1,2}日|\d{1,2}[:\：]\d{2}|周[一二三四五六日]|星期[一二三四五六日天])',
-                section
-            )
+            time_match = MEETING_TIME_RE.search(section)
             if time_match:
                 meeting['time'] = time_match.group(1)
 
             # Extract location
-            loc_match = re.search(
-                r'(地点|地址)[：:]\s*([^\n\r]+)|'
-                r'在([^\n\r]*?(?:楼|室|厅|馆|中心)[^\n\r]*)',
-                section
-            )
+            loc_match = MEETING_LOCATION_RE.search(section)
             if loc_match:
                 meeting['location'] = loc_match.group(2) or loc_match.group(3)
 
             # The remaining text is likely the topic
             if meeting.get('time') or meeting.get('location'):
-                topic = re.sub(r'地点[：:][^\n]+', '', section)
-                topic = re.sub(r'\d{1,2}[:\：]\d{2}', '', topic)
+                topic = LOCATION_LABEL_RE.sub('', section)
+                topic = CLOCK_TIME_RE.sub('', topic)
                 topic = topic.strip()
                 if len(topic) > 5:
                     meeting['topic'] = topic[:200]
@@ -482,20 +487,6 @@ class WhutWeeklyMeetingSpider(scrapy.Spider):
         )
         self.logger.info(f'Created meeting item: {title[:50]}...')
 
-    def clean_html(self, text):
-        """
-        Clean HTML tags and extra whitespace
-        """
-        if not text:
-            return text
-
-        text = re.sub(r'<[^>]+>', '', text)
-        text = unescape(text)
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
-
-        return text
-
     def parse_meeting_date(self, time_str):
         """
         Parse meeting date from time string
@@ -506,7 +497,7 @@ class WhutWeeklyMeetingSpider(scrapy.Spider):
         try:
             # Try various patterns
             # Pattern: "12月22日" or "2024年12月22日"
-            match = re.search(r'(\d{4})?年?(\d{1,2})月(\d{1,2})日', time_str)
+            match = MEETING_CN_DATE_RE.search(time_str)
             if match:
                 year = int(match.group(1)) if match.group(1) else datetime.now().year
                 month = int(match.group(2))
@@ -514,7 +505,7 @@ class WhutWeeklyMeetingSpider(scrapy.Spider):
                 return datetime(year, month, day).isoformat()
 
             # Pattern: "2024-12-22"
-            match = re.search(r'(\d{4})-(\d{2})-(\d{2})', time_str)
+            match = MEETING_ISO_DATE_RE.search(time_str)
             if match:
                 return datetime.strptime(match.group(0), '%Y-%m-%d').isoformat()
 
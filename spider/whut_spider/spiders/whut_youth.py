@@ -1,12 +1,15 @@
 import scrapy
-from datetime import datetime
+from whut_spider.seen_store import has_unseen_articles
 from whut_spider.items import NewsItem
+from whut_spider.spiders.base import WhutBaseSpider, DATE_IN_TEXT_RE
 import re
 import hashlib
-from html import unescape
 
+AUTHOR_RE = re.compile(r'(作者|撰稿|编辑|供稿)[：:]\s*([^\s\u3000<]+)')
+PUBLISHER_RE = re.compile(r'(来源|发布)[：:]\s*([^\s\u3000<|]+)')
 
-class WhutYouthSpider(scrapy.Spider):
+
+class WhutYouthSpider(WhutBaseSpider):
     """
     Spider for Wuhan University of Technology Youth League Website
     (http://youth.whut.edu.cn/)
@@ -53,6 +56,18 @@ class WhutYouthSpider(scrapy.Spider):
     # Maximum pages per category
     max_pages_per_category = 5
 
+    CONTENT_SELECTORS = (
+        'div.v_news_content',
+        'div.article-content',
+        'div.content',
+        'div.TRS_Editor',
+        'div.wp_articlecontent',
+        'div#content',
+        'article',
+    )
+
+    MIN_PARAGRAPH_LENGTH = 10
+
     custom_settings = {
         'DOWNLOAD_DELAY': 0.5,
         'DEFAULT_REQUEST_HEADERS': {
@@ -175,6 +190,7 @@ class WhutYouthSpider(scrapy.Spider):
 
         # Extract news items
         item_count = 0
+        page_urls = []
 
         # Try multiple selectors
         items = response.css(
@@ -214,11 +230,12 @@ class WhutYouthSpider(scrapy.Spider):
             date_str = item.css('span.date::text, td:last-child::text, span::text').get()
             if not date_str:
                 item_html = item.get()
-                date_match = re.search(r'(\d{4}[-/]\d{2}[-/]\d{2})', item_html)
+                date_match = DATE_IN_TEXT_RE.search(item_html)
                 if date_match:
                     date_str = date_match.group(1)
 
             full_url = response.urljoin(link)
+            page_urls.append(full_url)
             if full_url not in self.visited_urls:
                 self.visited_urls.add(full_url)
                 item_count += 1
@@ -235,7 +252,11 @@ class WhutYouthSpider(scrapy.Spider):
         self.logger.info(f'Found {item_count} articles on {category} page {current_page}')
 
         # Handle pagination
-        if current_page < self.max_pages_per_category:
+        # Stop descending once a page lists only already-fetched articles
+        if not has_unseen_articles(self, page_urls):
+            self.logger.info(f'No new articles on {category} page {current_page}, stopping pagination')
+            self.crawler.stats.inc_value('seen_store/pagination_stopped', spider=self)
+        elif current_page < self.max_pages_per_category:
             next_page_url = self.get_next_page_url(response, cat_code, current_page)
             if next_page_url and next_page_url not in self.visited_urls:
                 self.visited_urls.add(next_page_url)
@@ -254,10 +275,9 @@ class WhutYouthSpider(scrapy.Spider):
         Construct next page URL
         """
         # Look for createPageHTML pattern
-        page_match = re.search(r'createPageHTML\((\d+),\s*(\d+)', response.text)
-        if page_match:
-            total_pages = int(page_match.group(1))
-            current_idx = int(page_match.group(2))
+        page_index = self.page_index(response)
+        if page_index:
+            total_pages, current_idx = page_index
             if current_idx + 1 < total_pages:
                 next_idx = current_idx + 1
                 if next_idx == 0:
@@ -290,39 +310,12 @@ class WhutYouthSpider(scrapy.Spider):
             if title:
                 title = title.strip()
 
-        # Extract content
-        content_parts = []
-        content_selectors = [
-            'div.v_news_content',
-            'div.article-content',
-            'div.content',
-            'div.TRS_Editor',
-            'div.wp_articlecontent',
-            'div#content',
-            'article',
-        ]
-
-        for selector in content_selectors:
-            paragraphs = response.css(f'{selector} p')
-            if paragraphs:
-                for p in paragraphs:
-                    p_text = ' '.join(p.css('*::text, ::text').getall())
-                    p_text = re.sub(r'\s+', ' ', p_text).strip()
-                    if p_text and len(p_text) > 10:
-                        content_parts.append(p_text)
-                if content_parts:
-                    break
-
-        # Fallback
+        # Extract content, else all text of the content div
+        content_parts = self.extract_paragraphs(response)
         if not content_parts:
-            for selector in content_selectors:
-                content_div = response.css(f'{selector}').get()
-                if content_div:
-                    text = re.sub(r'<[^>]+>', ' ', content_div)
-                    text = re.sub(r'\s+', ' ', text).strip()
-                    if text and len(text) > 50:
-                        content_parts = [text]
-                        break
+            text = self.extract_container_text(response)
+            if text:
+                content_parts = [text]
 
         content = '\n\n'.join(content_parts) if content_parts else ''
         content = self.clean_html(content)
@@ -334,25 +327,15 @@ class WhutYouthSpider(scrapy.Spider):
 
         # Extract date from page if not provided
         if not date_str:
-            date_str = response.css('span.date::text, div.info span::text').get()
-            if not date_str:
-                date_match = re.search(r'(\d{4}[-/]\d{2}[-/]\d{2})', response.text)
-                if date_match:
-                    date_str = date_match.group(1)
+            date_str = self.extract_page_date(response, DATE_IN_TEXT_RE)
 
         published_at = self.parse_date(date_str) if date_str else None
 
         # Extract author
-        author = None
-        author_match = re.search(r'(作者|撰稿|编辑|供稿)[：:]\s*([^\s\u3000<]+)', response.text)
-        if author_match:
-            author = author_match.group(2)
+        author = self.extract_labelled(response, AUTHOR_RE)
 
         # Extract publisher
-        publisher = None
-        source_match = re.search(r'(来源|发布)[：:]\s*([^\s\u3000<|]+)', response.text)
-        if source_match:
-            publisher = source_match.group(2)
+        publisher = self.extract_labelled(response, PUBLISHER_RE)
 
         # Extract images
         images = response.css(
@@ -387,45 +370,3 @@ class WhutYouthSpider(scrapy.Spider):
                 content_hash=content_hash,
             )
             self.logger.info(f'Successfully scraped: {title[:50]}...')
-
-    def clean_html(self, text):
-        """
-        Clean HTML tags and extra whitespace
-        """
-        if not text:
-            return text
-
-        text = re.sub(r'<[^>]+>', '', text)
-        text = re.sub(r'\s*class\s*=\s*["\'][^"\']*["\']', '', text)
-        text = re.sub(r'\s*style\s*=\s*["\'][^"\']*["\']', '', text)
-        text = unescape(text)
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
-
-        return text
-
-    def parse_date(self, date_str):
-        """
-        Parse date string to ISO format
-        """
-        if not date_str:
-            return None
-
-        try:
-            date_str = date_str.strip()
-
-            if re.match(r'\d{4}-\d{2}-\d{2}', date_str):
-                return datetime.strptime(date_str[:10], '%Y-%m-%d').isoformat()
-
-            match = re.search(r'(\d{4})年(\d{1,2})月(\d{1,2})日', date_str)
-            if match:
-                year, month, day = match.groups()
-                return datetime(int(year), int(month), int(day)).isoformat()
-
-            if re.match(r'\d{4}/\d{2}/\d{2}', date_str):
-                return datetime.strptime(date_str[:10], '%Y/%m/%d').isoformat()
-
-        except Exception as e:
-            self.logger.warning(f'Failed to parse date: {date_str}, error: {e}')
-
-        return None